@@ -0,0 +1,83 @@
+"""
+Benchmark: CredentialParser.parse.
+
+Compara la versión anterior (USER_REGEX, PASS_REGEX y TOKEN_REGEX,
+tres recorridos completos) con el detector de una sola pasada, sobre
+bundles JS grandes. Comprueba antes que el resultado sea el mismo.
+
+Uso (desde erebus/):
+    python -m benchmarks.bench_credential_parser
+"""
+import time
+from pathlib import Path
+
+from collectors.passive.credential_parser import (
+    CredentialParser, USER_REGEX, PASS_REGEX, TOKEN_REGEX
+)
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "Pages"
+
+
+def legacy_parse(text: str, source: str):
+    results = []
+    seen = set()
+
+    if not text:
+        return results
+
+    for ctype, regex in (("user", USER_REGEX), ("password", PASS_REGEX), ("token", TOKEN_REGEX)):
+        for groups in regex.findall(text):
+            item = (ctype, groups[-1], source)
+            if item not in seen:
+                results.append(item)
+                seen.add(item)
+
+    return results
+
+
+def js_bundle(modules: int = 20000) -> str:
+    """Bundle minificado con alguna credencial dispersa."""
+    parts = []
+    for i in range(modules):
+        parts.append(
+            f"n[{i}]=function(e,t,r){{var o=r({i % 97}),a=o.useState(null),"
+            f"s=a[0],u=a[1];return{{userId:s,setUser:u,passive:!0,tokens:[]}}}}"
+        )
+        if i % 1000 == 0:
+            parts.append(f'var apiKey="AKIA{i:012d}XYZ",username="svc{i}",password="p{i}!x";')
+    return ";".join(parts)
+
+
+def measure(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text, "js")
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 3):
+    parser = CredentialParser()
+
+    corpus = {
+        "bundle minificado": js_bundle(),
+        "Pages/test.js x2000": (PAGES_DIR / "test.js").read_text(encoding="utf-8") * 2000,
+        "Pages/index.html x500": (PAGES_DIR / "index.html").read_text(encoding="utf-8") * 500,
+    }
+
+    print(f"{'corpus':<24} {'MB':>6} {'antes MB/s':>11} {'ahora MB/s':>11} {'x':>6}")
+
+    for name, text in corpus.items():
+        assert parser.parse(text, "js") == legacy_parse(text, "js"), name
+
+        size_mb = len(text.encode()) / (1024 * 1024)
+        before = measure(legacy_parse, text, repeat)
+        after = measure(parser.parse, text, repeat)
+
+        print(
+            f"{name:<24} {size_mb:6.2f} {size_mb / before:11.2f} "
+            f"{size_mb / after:11.2f} {before / after:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
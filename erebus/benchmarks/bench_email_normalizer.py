@@ -0,0 +1,197 @@
+"""
+Benchmark: normalize_obfuscated (extracción de emails).
+
+Compara la versión anterior (patrones recompilados en cada llamada,
+todas las etapas siempre y copias completas del texto) con el motor
+actual (patrones precompilados, prefiltros por etapa, copias bajo
+demanda y decodificación solo en ventanas alrededor de escapes y
+candidatos base64). Muestra también cuántos emails encuentra cada una.
+
+Uso (desde erebus/):
+    python -m benchmarks.bench_email_normalizer
+"""
+import base64
+import html
+import re
+import time
+import warnings
+from pathlib import Path
+
+from normalizers.email_normalizer import normalize_obfuscated
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "Pages"
+
+
+# ---------------------------------------------
+# Versión anterior (referencia)
+# ---------------------------------------------
+
+LEGACY_EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+
+LEGACY_OBFUSCATED_PATTERNS = [
+    (r"\s*\[\s*at\s*\]\s*", "@"),
+    (r"\s*\(\s*at\s*\)\s*", "@"),
+    (r"\s+at\s+", "@"),
+    (r"\s*\[\s*dot\s*\]\s*", "."),
+    (r"\s*\(\s*dot\s*\)\s*", "."),
+    (r"\s+dot\s+", "."),
+]
+
+LEGACY_CONCAT_REGEX = re.compile(
+    r"['\"]([a-zA-Z0-9._%+-]+)['\"]\s*\+\s*['\"]@['\"]\s*\+\s*['\"]([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})['\"]"
+)
+LEGACY_BASE64_CALL_REGEX = re.compile(r"atob\(\s*['\"]([A-Za-z0-9+/=]{20,})['\"]\s*\)")
+LEGACY_BASE64_TOKEN_REGEX = re.compile(r"\b[A-Za-z0-9+/=]{24,}\b")
+
+
+def legacy_normalize_obfuscated(text: str) -> set:
+    found = set()
+    if not text:
+        return found
+
+    lowered = text.lower()
+
+    for e in re.findall(LEGACY_EMAIL_REGEX, lowered):
+        found.add(e)
+
+    candidate = lowered
+    for pattern, repl in LEGACY_OBFUSCATED_PATTERNS:
+        candidate = re.sub(pattern, repl, candidate)
+
+    for e in re.findall(LEGACY_EMAIL_REGEX, candidate):
+        found.add(e)
+
+    for user, domain in LEGACY_CONCAT_REGEX.findall(text):
+        email = f"{user}@{domain}".lower()
+        if re.match(LEGACY_EMAIL_REGEX, email):
+            found.add(email)
+
+    unescaped = html.unescape(text)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            unescaped = unescaped.encode().decode("unicode_escape")
+    except Exception:
+        pass
+
+    for e in re.findall(LEGACY_EMAIL_REGEX, unescaped.lower()):
+        found.add(e)
+
+    for token in LEGACY_BASE64_CALL_REGEX.findall(text):
+        _legacy_decode(token, found)
+
+    compact = re.sub(r"\s+", "", text)
+    for token in LEGACY_BASE64_TOKEN_REGEX.findall(compact):
+        _legacy_decode(token, found)
+
+    return found
+
+
+def _legacy_decode(token, found):
+    try:
+        decoded = base64.b64decode(token).decode("utf-8", errors="ignore")
+        for e in re.findall(LEGACY_EMAIL_REGEX, decoded.lower()):
+            found.add(e)
+    except Exception:
+        pass
+
+
+# ---------------------------------------------
+# Corpus
+# ---------------------------------------------
+
+def prose(paragraphs: int = 3000) -> str:
+    """Texto visible sin ningún disparador (caso más habitual)."""
+    return "\n".join(
+        f"Párrafo {i}: la empresa ofrece servicios de consultoría y formación "
+        f"en toda la región, con oficinas abiertas de lunes a viernes."
+        for i in range(paragraphs)
+    )
+
+
+def html_page(rows: int = 2000) -> str:
+    """HTML con emails en claro, ofuscados, entidades y base64."""
+    parts = ["<html><body>"]
+    for i in range(rows):
+        parts.append(
+            f'<div><p>Equipo {i}: persona{i} [at] ejemplo [dot] com · '
+            f'<a href="mailto:ventas{i}@ejemplo.es">ventas{i}@ejemplo.es</a> '
+            f"&amp; soporte{i}&#64;ejemplo.org</p></div>"
+        )
+        if i % 50 == 0:
+            token = base64.b64encode(f"oculto{i}@ejemplo.net".encode()).decode()
+            parts.append(f"<script>var m = atob('{token}');</script>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def minified_js(functions: int = 3000) -> str:
+    """JS minificado: sin espacios, identificadores largos."""
+    return ";".join(
+        f"function handler{i}(e){{return e.target.value.trim().length>{i % 7}}}"
+        for i in range(functions)
+    )
+
+
+def js_bundle(modules: int = 6000) -> str:
+    """Bundle grande con cadenas escapadas, data URIs y algún email escondido."""
+    parts = []
+    for i in range(modules):
+        parts.append(
+            f'n[{i}]=function(e,t){{var r="\\u00e1rbol {i}\\n",o=/\\d+\\.\\d+/;'
+            f'return e.exports={{id:"mod{i}",label:r,re:o}}}}'
+        )
+        if i % 500 == 0:
+            parts.append(f'var c{i}="admin{i}\\x40ejemplo\\x2ecom";')
+        if i % 200 == 0:
+            parts.append('var img="data:image/png;base64,' + "iVBORw0KGgoAAAANSUhEUgAA" * 40 + '";')
+    return ";".join(parts)
+
+
+def load_corpus() -> dict:
+    corpus = {
+        "texto sin disparadores": prose(),
+        "html con emails": html_page(),
+        "js minificado": minified_js(),
+        "bundle js con escapes": js_bundle(),
+    }
+
+    for path in sorted(PAGES_DIR.glob("*")):
+        corpus[f"Pages/{path.name}"] = path.read_text(encoding="utf-8", errors="ignore") * 200
+
+    return corpus
+
+
+# ---------------------------------------------
+# Medición
+# ---------------------------------------------
+
+def measure(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 5):
+    corpus = load_corpus()
+
+    print(
+        f"{'corpus':<26} {'MB':>6} {'antes MB/s':>11} {'ahora MB/s':>11} {'x':>6} "
+        f"{'emails antes':>13} {'ahora':>6}"
+    )
+
+    for name, text in corpus.items():
+        size_mb = len(text.encode()) / (1024 * 1024)
+        before = measure(legacy_normalize_obfuscated, text, repeat)
+        after = measure(normalize_obfuscated, text, repeat)
+
+        print(
+            f"{name:<26} {size_mb:6.2f} {size_mb / before:11.2f} "
+            f"{size_mb / after:11.2f} {before / after:6.1f} "
+            f"{len(legacy_normalize_obfuscated(text)):13} {len(normalize_obfuscated(text)):6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: detección de secretos por entropía (collectors.passive.entropy).
+
+Compara el cálculo vectorizado con NumPy (todos los candidatos a la vez)
+con el bucle en Python por candidato, sobre bundles con miles de
+literales. Comprueba antes que el resultado sea el mismo.
+
+Uso (desde erebus/):
+    python -m benchmarks.bench_entropy
+"""
+
+import random
+import string
+import time
+
+import collectors.passive.entropy as entropy
+from benchmarks.bench_credential_parser import js_bundle
+
+
+def literals_bundle(count: int = 20000, secrets: int = 50) -> str:
+    """Bundle con muchos literales tipo identificador/ruta y algún secreto."""
+    rnd = random.Random(0)
+    alphabet = string.ascii_letters + string.digits
+
+    parts = [js_bundle(2000)]
+    for i in range(count):
+        parts.append(f'e[{i}]="static/js/chunk-{i:06d}.{rnd.randrange(16 ** 8):08x}.js"')
+        parts.append(f'k[{i}]="component_{i}_render_props_key"')
+
+    for i in range(secrets):
+        parts.append(f'var s{i}="{"".join(rnd.choices(alphabet, k=40))}"')
+
+    return ";".join(parts)
+
+
+def measure(text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = entropy.find_high_entropy(text)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main(repeat: int = 3):
+    numpy = entropy.np
+    corpus = {
+        "bundle 5k literales": literals_bundle(2500),
+        "bundle 40k literales": literals_bundle(20000),
+    }
+
+    print(f"{'corpus':<22} {'MB':>6} {'hallados':>9} {'python ms':>10} {'numpy ms':>9} {'x':>6}")
+
+    for name, text in corpus.items():
+        if numpy is None:
+            print("NumPy no está instalado")
+            return
+
+        entropy.np = None
+        before, expected = measure(text, repeat)
+        entropy.np = numpy
+        after, result = measure(text, repeat)
+
+        assert [v for v, _ in result] == [v for v, _ in expected], name
+
+        size_mb = len(text.encode()) / (1024 * 1024)
+        print(
+            f"{name:<22} {size_mb:6.2f} {len(result):9d} {before * 1000:10.1f} "
+            f"{after * 1000:9.1f} {before / after:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: extracción HTML del crawler.
+
+Compara el método anterior (árbol BeautifulSoup + find_all("a") +
+find_all("script") + get_text()) con el extractor de una sola pasada.
+
+Uso (desde erebus/):
+    python -m benchmarks.bench_html_extractor
+"""
+import time
+
+from bs4 import BeautifulSoup
+
+from collectors.passive.html_extractor import extract, etree
+
+
+def build_page(paragraphs: int = 4000) -> str:
+    parts = ["<html><head><title>Bench</title><style>p{margin:0}</style></head><body>"]
+
+    for i in range(paragraphs):
+        parts.append(
+            f'<div class="row"><p>Texto de relleno {i} para la página de prueba, '
+            f'contacto{i} [at] ejemplo [dot] com</p>'
+            f'<a href="/seccion/{i}">enlace {i}</a> <span>&amp; más</span></div>'
+        )
+        if i % 100 == 0:
+            parts.append(f'<script src="/static/app{i}.js"></script>')
+            parts.append("<script>var cfg = {a: 1, b: 'x'};</script>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def bs4_extract(html: str):
+    soup = BeautifulSoup(html, "html.parser")
+    links = [a["href"] for a in soup.find_all("a", href=True)]
+    scripts = [s["src"] for s in soup.find_all("script", src=True)]
+    return links, scripts, soup.get_text()
+
+
+def measure(fn, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 5):
+    html = build_page()
+    size_mb = len(html.encode()) / (1024 * 1024)
+
+    candidates = [
+        ("bs4 (árbol, 3 recorridos)", bs4_extract),
+        ("extractor stdlib", lambda h: extract(h, "stdlib")),
+    ]
+    if etree is not None:
+        candidates.append(("extractor lxml", lambda h: extract(h, "lxml")))
+
+    print(f"Página de prueba: {size_mb:.2f} MB, {repeat} repeticiones\n")
+
+    baseline = None
+    for name, fn in candidates:
+        seconds = measure(fn, html, repeat)
+        baseline = baseline or seconds
+        print(
+            f"{name:<28} {1 / seconds:8.2f} páginas/s "
+            f"{size_mb / seconds:8.2f} MB/s  x{baseline / seconds:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
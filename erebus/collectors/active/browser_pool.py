@@ -0,0 +1,158 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+
+class BrowserPool:
+    """
+    Un Chromium headless por ejecución y un pool de contextos reutilizables.
+
+    - El navegador se lanza la primera vez que se pide una página
+      (si el scraping no se usa, no hay coste).
+    - Como mucho `concurrency` páginas renderizándose a la vez, cada una
+      en su propio contexto.
+    - Un contexto se reutiliza hasta `context_reuse` páginas; después se
+      cierra y se crea otro. Al devolverlo se borran las cookies y el
+      localStorage / sessionStorage de los frames de la página; IndexedDB,
+      service workers y la caché HTTP sí pasan a la siguiente página del
+      mismo contexto (context_reuse=1: un contexto limpio por página).
+
+    La API de Playwright es asíncrona y sus objetos pertenecen a un bucle
+    de eventos, así que el pool tiene el suyo: run() / iterate() lo usan
+    desde código síncrono (el orquestador). close() libera el navegador.
+    """
+
+    def __init__(self, concurrency: int = 4, user_agent: str = "EREBUS/1.0",
+                 context_reuse: int = 20, headless: bool = True):
+        self.concurrency = max(1, concurrency)
+        self.user_agent = user_agent
+        self.context_reuse = max(1, context_reuse)
+        self.headless = headless
+
+        self.loop = asyncio.new_event_loop()
+
+        self._playwright = None
+        self._browser = None
+        self._semaphore = None
+        self._start_lock = asyncio.Lock()
+        self._idle = []  # [(contexto, páginas servidas)]
+
+        self.launches = 0
+        self.contexts_created = 0
+        self.pages = 0
+
+    # -------------------------------------------------
+    # API asíncrona
+    # -------------------------------------------------
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Página nueva en un contexto del pool:
+
+            async with pool.page() as page:
+                await page.goto(url)
+        """
+        await self._start()
+
+        async with self._semaphore:
+            context, uses = self._idle.pop() if self._idle else (await self._new_context(), 0)
+            page = await context.new_page()
+            self.pages += 1
+
+            try:
+                yield page
+            finally:
+                await self._release(page, context, uses + 1)
+
+    async def _start(self):
+        if self._browser is not None:
+            return
+
+        # Varias páginas pidiendo el navegador a la vez: se lanza uno
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.launches += 1
+
+    async def _new_context(self):
+        self.contexts_created += 1
+        return await self._browser.new_context(user_agent=self.user_agent)
+
+    async def _release(self, page, context, uses):
+        try:
+            if uses >= self.context_reuse:
+                await page.close()
+                await context.close()
+            else:
+                await self._clear_storage(page)
+                await page.close()
+                await context.clear_cookies()
+                self._idle.append((context, uses))
+
+        except Exception:
+            # Contexto en mal estado (página colgada, navegador caído...)
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _clear_storage(page):
+        # Almacenamiento web de la página y sus iframes (por origen)
+        for frame in page.frames:
+            try:
+                await frame.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+            except Exception:
+                pass  # about:blank, frame desconectado, origen opaco...
+
+    async def aclose(self):
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle = []
+
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # -------------------------------------------------
+    # Uso desde código síncrono
+    # -------------------------------------------------
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def iterate(self, agen):
+        """
+        Generador síncrono sobre un generador asíncrono: el bucle solo
+        avanza cuando se pide el siguiente elemento.
+        """
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self.run(agen.aclose())
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+
+        self.run(self.aclose())
+        self.loop.close()
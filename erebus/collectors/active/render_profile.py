@@ -0,0 +1,186 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+# Hosts de analítica / publicidad: nunca aportan DOM ni JSON del objetivo
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "facebook.net",
+    "facebook.com", "hotjar.com", "clarity.ms", "segment.io", "segment.com",
+    "mixpanel.com", "newrelic.com", "nr-data.net", "optimizely.com",
+    "linkedin.com", "ads-twitter.com", "tiktok.com", "criteo.com",
+    "taboola.com", "outbrain.com", "matomo.cloud", "cookielaw.org",
+)
+
+# Espera hasta que el DOM deja de cambiar durante `quiet` ms (tope `cap` ms)
+DOM_QUIET_JS = """
+([quiet, cap]) => new Promise(resolve => {
+    let timer;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quiet);
+    });
+    const done = () => { observer.disconnect(); resolve(); };
+
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    timer = setTimeout(done, quiet);
+    setTimeout(done, cap);
+})
+"""
+
+# Estrategias de espera: las de Playwright más "dom_quiet"
+WAIT_STRATEGIES = ("dom_quiet", "domcontentloaded", "load", "networkidle")
+
+
+class RenderProfile:
+    """
+    Qué descarga Chromium al renderizar y cuándo se da la página por lista.
+
+    - block_types: tipos de recurso que no se piden (imágenes, fuentes,
+      hojas de estilo, media...). Solo hace falta el DOM y el JSON.
+    - block_trackers: hosts de TRACKER_DOMAINS.
+    - block_third_party: peticiones a otros dominios salvo los tipos de
+      third_party_allow (scripts y XHR que pueden montar el DOM).
+    - wait: "dom_quiet" (DOM sin cambios durante quiet_ms y como mucho
+      max_inflight peticiones en vuelo), o una de las de Playwright
+      ("domcontentloaded", "load", "networkidle").
+
+    RenderProfile.full() reproduce el comportamiento anterior: sin
+    bloqueos y esperando a networkidle.
+    """
+
+    BLOCK_TYPES = ("image", "font", "stylesheet", "media", "texttrack", "eventsource", "manifest")
+    THIRD_PARTY_ALLOW = ("document", "script", "xhr", "fetch")
+
+    def __init__(self, block_types=BLOCK_TYPES, block_trackers: bool = True,
+                 block_third_party: bool = True, third_party_allow=THIRD_PARTY_ALLOW,
+                 wait: str = "dom_quiet", quiet_ms: int = 500, max_inflight: int = 2):
+        if wait not in WAIT_STRATEGIES:
+            raise ValueError(f"Estrategia de espera desconocida: {wait} (válidas: {', '.join(WAIT_STRATEGIES)})")
+
+        self.block_types = set(block_types or ())
+        self.block_trackers = block_trackers
+        self.block_third_party = block_third_party
+        self.third_party_allow = set(third_party_allow or ())
+        self.wait = wait
+        self.quiet_ms = quiet_ms
+        self.max_inflight = max_inflight
+
+    @classmethod
+    def full(cls):
+        return cls(block_types=(), block_trackers=False, block_third_party=False, wait="networkidle")
+
+    @property
+    def intercepts(self):
+        return bool(self.block_types or self.block_trackers or self.block_third_party)
+
+    # -------------------------------------------------
+    # Bloqueo
+    # -------------------------------------------------
+
+    @staticmethod
+    def _same_site(host: str, site: str) -> bool:
+        return host == site or host.endswith("." + site)
+
+    def blocks(self, resource_type: str, url: str, site: str) -> bool:
+        if resource_type in self.block_types:
+            return True
+
+        host = (urlparse(url).hostname or "").lower()
+        if not host or self._same_site(host, site):
+            return False
+
+        if self.block_trackers and any(self._same_site(host, t) for t in TRACKER_DOMAINS):
+            return True
+
+        return self.block_third_party and resource_type not in self.third_party_allow
+
+    # -------------------------------------------------
+    # Renderizado
+    # -------------------------------------------------
+
+    async def attach(self, page, page_url: str) -> dict:
+        """
+        Instala el bloqueo y los contadores en la página (antes de goto).
+        Devuelve el dict de estadísticas que se va rellenando.
+        """
+        site = (urlparse(page_url).hostname or "").lower()
+        if site.startswith("www."):
+            site = site[4:]
+
+        stats = {"blocked": 0, "requests": 0, "bytes": 0, "inflight": 0, "render_ms": 0.0}
+        sizes = []
+        stats["_sizes"] = sizes
+
+        if self.intercepts:
+            async def route(route):
+                request = route.request
+                if self.blocks(request.resource_type, request.url, site):
+                    stats["blocked"] += 1
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await page.route("**/*", route)
+
+        async def body_size(request):
+            try:
+                stats["bytes"] += (await request.sizes())["responseBodySize"]
+            except Exception:
+                pass
+
+        def started(request):
+            stats["requests"] += 1
+            stats["inflight"] += 1
+
+        def finished(request):
+            stats["inflight"] -= 1
+            sizes.append(asyncio.ensure_future(body_size(request)))
+
+        def failed(request):
+            stats["inflight"] -= 1
+
+        page.on("request", started)
+        page.on("requestfinished", finished)
+        page.on("requestfailed", failed)
+
+        return stats
+
+    async def load(self, page, url: str, stats: dict, timeout: int):
+        """
+        goto + espera según self.wait. timeout en ms (como Playwright).
+        """
+        start = time.perf_counter()
+
+        if self.wait == "dom_quiet":
+            await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+            await self._wait_quiet(page, stats, start + timeout / 1000)
+        else:
+            await page.goto(url, timeout=timeout, wait_until=self.wait)
+
+        stats["render_ms"] = (time.perf_counter() - start) * 1000
+
+    async def _wait_quiet(self, page, stats, deadline):
+        while True:
+            remaining = (deadline - time.perf_counter()) * 1000
+            if remaining <= 0:
+                return
+
+            try:
+                await page.evaluate(DOM_QUIET_JS, [self.quiet_ms, remaining])
+            except Exception:
+                # Navegación en curso (redirección JS): el documento cambió
+                await asyncio.sleep(self.quiet_ms / 1000)
+
+            if stats["inflight"] <= self.max_inflight:
+                return
+
+    @staticmethod
+    async def finish(stats: dict) -> dict:
+        """
+        Espera a los tamaños pendientes y devuelve las estadísticas limpias.
+        """
+        await asyncio.gather(*stats.pop("_sizes", []), return_exceptions=True)
+        stats.pop("inflight", None)
+        return stats
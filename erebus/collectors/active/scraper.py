@@ -1,87 +1,217 @@
+import asyncio
 import json
-from playwright.sync_api import sync_playwright
+from collections import deque
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
 from normalizers.email_normalizer import normalize_obfuscated
 from collectors.passive.credential_parser import CredentialParser
+from collectors.active.browser_pool import BrowserPool
+from collectors.active.render_profile import RenderProfile
 import core.constants as C
 
 
 class Scraper:
 
-    def __init__(self, timeout=15000):
+    # Respuestas JSON con Content-Length mayor que esto: se vuelven a pedir
+    # con el cliente HTTP y se recorren en streaming (sin el cuerpo entero
+    # en memoria ni el árbol); por debajo json.loads es más rápido
+    JSON_STREAM_BYTES = 1024 * 1024
+
+    # Solape entre bloques al buscar emails en una respuesta en streaming
+    EMAIL_OVERLAP = 256
+
+    # Cabeceras del navegador que no se reenvían al volver a pedir una respuesta
+    SKIP_HEADERS = ("accept-encoding", "content-length", "host", "connection")
+
+    def __init__(self, timeout=15000, user_agent="EREBUS/1.0", json_keys=None,
+                 json_max_depth=None, json_stream_bytes=JSON_STREAM_BYTES, pool=None,
+                 render_profile=None, client=None):
         self.timeout = timeout
-        self.cred_parser = CredentialParser()
+        self.user_agent = user_agent
+
+        # Navegador compartido (collectors.active.browser_pool.BrowserPool);
+        # sin él, uno propio de una sola página a la vez
+        self.owns_pool = pool is None
+        self.pool = pool or BrowserPool(concurrency=1, user_agent=user_agent)
+
+        # Bloqueo de recursos y estrategia de espera (por defecto: todo y networkidle)
+        self.profile = render_profile or RenderProfile.full()
+
+        # core.http_client.HttpClient para las respuestas JSON grandes;
+        # sin él se leen enteras desde el navegador
+        self.client = client
+        self.json_stream_bytes = json_stream_bytes
+        self.cred_parser = CredentialParser(json_keys=json_keys, json_max_depth=json_max_depth)
+
+    def _parse_json_response(self, text: str):
+        try:
+            obj = json.loads(text)
+        except Exception:
+            return []
+
+        return self.cred_parser.parse_json(obj, source=C.TECHNIQUE_SCRAPING_JSON)
+
+    def _parse_json_streamed(self, url: str, headers: dict):
+        """
+        Vuelve a pedir una respuesta JSON grande (GET, mismas cabeceras que
+        el navegador) y la analiza por bloques. Devuelve (emails, credenciales).
+        """
+        emails = set()
+
+        def chunks():
+            tail = ""
+
+            # Mismo límite que la carga de la página (ms), entre bloques
+            timeout = self.timeout / 1000
+
+            with self.client.stream(url, "scraping", timeout=timeout, headers=headers) as response:
+                if response.status_code != 200:
+                    return
+
+                for text in response.iter_chunks():
+                    window = tail + text
+                    emails.update(normalize_obfuscated(window))
+                    tail = window[-self.EMAIL_OVERLAP:]
+                    yield text
+
+        try:
+            creds = self.cred_parser.parse_json_stream(chunks(), source=C.TECHNIQUE_SCRAPING_JSON)
+        except Exception:
+            creds = []
+
+        return emails, creds
+
+    def _stream_json(self, response) -> bool:
+        if not self.client or response.request.method != "GET":
+            return False
+
+        try:
+            size = int(response.headers.get("content-length") or 0)
+        except ValueError:
+            return False
+
+        return size > self.json_stream_bytes
+
+    # -------------------------------------------------
+    # Renderizado (pool de navegador compartido)
+    # -------------------------------------------------
 
     def scrape(self, url: str):
-        json_texts = []
-        json_objects = []
+        return self.pool.run(self.ascrape(url))
+
+    def scrape_many(self, urls):
+        """
+        Renderiza varias URLs a la vez (hasta pool.concurrency) y devuelve
+        los resultados en el orden de entrada (None si falla una).
+        """
+        return self.pool.iterate(self.ascrape_many(urls))
+
+    async def ascrape_many(self, urls):
+        # Como mucho 2 x concurrency tareas lanzadas: las siguientes
+        # esperan a que el consumidor avance
+        window = self.pool.concurrency * 2
+        pending = deque()
+
+        try:
+            for url in urls:
+                pending.append(asyncio.ensure_future(self.ascrape(url)))
+
+                if len(pending) >= window:
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+
+        finally:
+            # Consumidor que abandona el generador a medias
+            for task in pending:
+                task.cancel()
+
+    async def ascrape(self, url: str):
+        # Cada respuesta JSON se analiza al llegar y no se guarda
+        emails_json = set()
+        creds_json = []
+        reads = []
 
-        def handle_response(response):
+        if not url.endswith("/"):
+            url = url + "/"
+
+        page_domain = urlparse(url).netloc
+
+        async def handle_response(response):
             try:
                 ct = response.headers.get("content-type", "").lower()
                 if "json" in ct or response.url.lower().endswith(".json"):
                     resp_domain = urlparse(response.url).netloc
-                    page_domain = urlparse(url).netloc
 
                     if resp_domain == page_domain or resp_domain.endswith("." + page_domain):
-                        text = response.text()
-                        json_texts.append(text)
-
-                        try:
-                            json_objects.append(json.loads(text))
-                        except Exception:
-                            pass
+                        if self._stream_json(response):
+                            headers = {
+                                k: v for k, v in (await response.request.all_headers()).items()
+                                if not k.startswith(":") and k not in self.SKIP_HEADERS
+                            }
+                            emails, creds = await asyncio.get_running_loop().run_in_executor(
+                                None, self._parse_json_streamed, response.url, headers
+                            )
+                        else:
+                            text = await response.text()
+                            emails = normalize_obfuscated(text)
+                            creds = self._parse_json_response(text)
+
+                        emails_json.update(emails)
+                        creds_json.extend(creds)
             except Exception:
                 pass
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(user_agent="EREBUS/1.0")
+            async with self.pool.page() as page:
+                stats = await self.profile.attach(page, url)
 
-                page.on("response", handle_response)
+                page.on("response", lambda response: reads.append(
+                    asyncio.ensure_future(handle_response(response))
+                ))
 
-                if not url.endswith("/"):
-                    url = url + "/"
+                await self.profile.load(page, url, stats, self.timeout)
 
-                page.goto(url, timeout=self.timeout)
-                page.wait_for_load_state("networkidle", timeout=self.timeout)
+                html = await page.content()
 
-                html = page.content()
-                browser.close()
+                # Cuerpos JSON aún leyéndose
+                await asyncio.gather(*reads, return_exceptions=True)
+                render = await self.profile.finish(stats)
 
-            soup = BeautifulSoup(html, "html.parser")
-            visible_text = soup.get_text()
-
-            emails_dom = normalize_obfuscated(visible_text)
-            creds_dom = self.cred_parser.parse(
-                visible_text,
-                source=C.TECHNIQUE_SCRAPING_DOM
+            # Parsing del DOM fuera del bucle: no frena los demás renderizados
+            emails_dom, creds_dom = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse_dom, html
             )
 
-            json_text = "\n".join(json_texts)
-            emails_json = normalize_obfuscated(json_text)
-
-            creds_json = []
-            for obj in json_objects:
-                creds_json.extend(
-                    self.cred_parser.parse_json(
-                        obj,
-                        source=C.TECHNIQUE_SCRAPING_JSON
-                    )
-                )
-
             return {
                 "url": url,
                 "emails_dom": emails_dom,
                 "credentials_dom": creds_dom,
                 "emails_json": emails_json,
                 "credentials_json": creds_json,
+                "render": render,
                 "raw_html": html
             }
 
         except Exception as e:
             print(f"[SCRAPER ERROR] {url} -> {e}")
             return None
+
+    def _parse_dom(self, html: str):
+        soup = BeautifulSoup(html, "html.parser")
+        visible_text = soup.get_text()
+
+        emails_dom = normalize_obfuscated(visible_text)
+        creds_dom = self.cred_parser.parse(
+            visible_text,
+            source=C.TECHNIQUE_SCRAPING_DOM
+        )
+
+        return emails_dom, creds_dom
+
+    def close(self):
+        # Solo el pool propio; uno recibido lo cierra quien lo creó
+        if self.owns_pool:
+            self.pool.close()
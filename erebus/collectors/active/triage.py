@@ -0,0 +1,110 @@
+import random
+import re
+
+# ---------------------------------------------
+# Señales en el HTML estático de que la página necesita JS para mostrarse
+# ---------------------------------------------
+
+# <div id="root"></div> y similares: contenedor vacío que monta un framework
+EMPTY_ROOT_REGEX = re.compile(
+    r"""<div[^>]+id=["'](?:root|app|__next|__nuxt|___gatsby|main-app|application)["'][^>]*>\s*</div>""",
+    re.IGNORECASE
+)
+
+FRAMEWORK_REGEX = re.compile(
+    r"data-reactroot|__NEXT_DATA__|react-dom|ng-version|ng-app|<app-root"
+    r"|data-v-[0-9a-f]{6,}|__NUXT__|data-server-rendered|svelte-[a-z0-9]{5,}|ember-application",
+    re.IGNORECASE
+)
+
+# Contenido cargado después por XHR / fetch
+FETCH_REGEX = re.compile(
+    r"\bfetch\(|XMLHttpRequest|\baxios\b|\$\.(?:ajax|get|post|getJSON)\(|graphql|[\"'`]/api/",
+    re.IGNORECASE
+)
+
+NOSCRIPT_REGEX = re.compile(
+    r"<noscript[^>]*>[^<]*(?:enable|habilita|activa)[^<]*javascript",
+    re.IGNORECASE
+)
+
+INLINE_SCRIPT_REGEX = re.compile(r"<script\b[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+
+# Peso de cada señal (la puntuación se satura en 1)
+WEIGHTS = {
+    "empty_root": 0.4,
+    "little_text": 0.2,
+    "script_heavy": 0.15,
+    "framework": 0.2,
+    "fetch_hints": 0.3,
+    "noscript": 0.2,
+}
+
+LITTLE_TEXT = 200  # caracteres visibles (sin espacios)
+SCRIPT_RATIO = 2.0  # caracteres de script por carácter de texto visible
+EXTERNAL_SCRIPT_WEIGHT = 1000  # un <script src> cuenta como tantos caracteres
+
+
+def render_score(html: str, text: str, scripts) -> dict:
+    """
+    Probabilidad (0..1) de que renderizar la página en un navegador
+    aporte algo que el HTML estático no tiene.
+    Devuelve {"score": float, "signals": [nombres de WEIGHTS]}.
+    """
+    signals = []
+
+    visible = len("".join(text.split()))
+    inline = INLINE_SCRIPT_REGEX.findall(html)
+    script_chars = sum(len(s) for s in inline) + EXTERNAL_SCRIPT_WEIGHT * len(scripts)
+
+    if EMPTY_ROOT_REGEX.search(html):
+        signals.append("empty_root")
+
+    if visible < LITTLE_TEXT:
+        signals.append("little_text")
+
+    if script_chars > SCRIPT_RATIO * max(visible, 1):
+        signals.append("script_heavy")
+
+    if FRAMEWORK_REGEX.search(html):
+        signals.append("framework")
+
+    if any(FETCH_REGEX.search(s) for s in inline):
+        signals.append("fetch_hints")
+
+    if NOSCRIPT_REGEX.search(html):
+        signals.append("noscript")
+
+    score = min(1.0, sum(WEIGHTS[s] for s in signals))
+    return {"score": round(score, 3), "signals": signals}
+
+
+def select_pages(pages, threshold: float, budget: int = None, audit_sample: int = 0, seed=None):
+    """
+    Reparte las páginas del crawler entre:
+
+    - render: puntuación >= threshold (o sin puntuación, p.ej. páginas
+      de una ejecución reanudada), de mayor a menor, hasta budget.
+    - audit: muestra aleatoria de audit_sample páginas descartadas por
+      la puntuación, que se renderizan igualmente para medir si el
+      triaje pierde hallazgos.
+    - skipped: el resto.
+
+    pages: dicts con "url" y, opcionalmente, "render_score".
+    """
+    def score(page):
+        value = page.get("render_score")
+        return 1.0 if value is None else value
+
+    ranked = sorted(pages, key=score, reverse=True)  # estable: empate en orden de crawl
+    candidates = [p for p in ranked if score(p) >= threshold]
+    below = [p for p in pages if score(p) < threshold]
+
+    render = candidates if budget is None else candidates[:budget]
+    over_budget = candidates[len(render):]
+
+    audit = random.Random(seed).sample(below, min(audit_sample, len(below)))
+    audited = {id(p) for p in audit}
+
+    skipped = over_budget + [p for p in below if id(p) not in audited]
+    return render, audit, skipped
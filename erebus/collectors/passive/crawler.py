@@ -1,7 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from urllib.parse import urljoin, urlparse
 from normalizers.email_normalizer import normalize_obfuscated
+from collectors.passive.frontier import Frontier
+from core.extraction import extract_page, extract_page_cached, page_kind
+from core.http_client import HttpClient
 import re
 
 EMAIL_REGEX = re.compile(
@@ -9,24 +13,79 @@ EMAIL_REGEX = re.compile(
 )
 
 
+class CrawlCheckpoint:
+    """
+    Guarda periódicamente en Database el estado de un crawl
+    (frontera, visitadas y resultado de cada página) para poder
+    reanudarlo por execution_id tras un fallo.
+    """
+
+    def __init__(self, database, execution_id: str, crawl: str, every: int = 25):
+        self.database = database
+        self.execution_id = execution_id
+        self.crawl = crawl
+        self.every = max(1, every)
+
+    def load(self):
+        return self.database.load_crawl_checkpoint(self.execution_id, self.crawl)
+
+    def save(self, state, outcomes):
+        self.database.save_crawl_checkpoint(
+            self.execution_id,
+            self.crawl,
+            state["frontier"],
+            state["visited"],
+            outcomes
+        )
+
+
 class Crawler:
 
-    def __init__(self, start_url: str, max_pages : int = 30, timeout: int = 8, allowed_domain = None):
+    name = "crawler"
+
+    def __init__(self, start_url: str, max_pages : int = 30, timeout: int = None, allowed_domain = None,
+                 concurrency: int = 1, per_host: int = 1, priority=None, client=None,
+                 html_parser: str = "stdlib", checkpoint=None, exclude_hosts=None, extraction=None, cache=None,
+                 triage: bool = False):
         self.max_pages = max_pages
+        self.html_parser = html_parser
+        # render_score por página (triaje del scraping)
+        self.triage = triage
+        self.extraction = extraction
+        self.cache = cache
         self.timeout = timeout
+        self.client = client or HttpClient(pool_maxsize=max(10, per_host))
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
         self.visited = set()
-        self.queue = []
+        self.frontier = Frontier(priority)
         self.allowed_domain = allowed_domain
+        self.exclude_hosts = exclude_hosts or set()
 
         if isinstance(start_url, list):
-            self.queue.extend(start_url)
+            start_urls = start_url
             first = start_url[0] if start_url else ""
         else:
-            self.queue.append(start_url)
+            start_urls = [start_url]
             first = start_url
 
+        for url in start_urls:
+            self.frontier.push(self._normalize(url), 0)
+
         self.domain = urlparse(first).netloc if first else ""
 
+        # Checkpoint / reanudación
+        self.checkpoint = checkpoint
+        self.in_flight = {}
+        self.outcomes = []
+        self.resumed = False
+
+        if checkpoint:
+            state = checkpoint.load()
+            if state:
+                self.frontier.restore(state["frontier"])
+                self.visited = set(state["visited"])
+                self.resumed = True
 
     def _is_internal(self, url):
         parsed = urlparse(url)
@@ -38,6 +97,9 @@ class Crawler:
         if ":" in netloc:
             netloc = netloc.split(":")[0]
 
+        if netloc in self.exclude_hosts:
+            return False
+
         # PERMITIR WAYBACK
         if "web.archive.org" in netloc:
             return True
@@ -53,15 +115,146 @@ class Crawler:
     def _normalize(self, url):
         return url.split("#")[0].rstrip("/")
 
-    def run(self):
-        results = []
 
-        while self.queue and len(self.visited) < self.max_pages:
-            url = self._normalize(self.queue.pop(0))
+    def _host(self, url):
+        return urlparse(url).netloc.lower()
+
+    def _fetch(self, url):
+        return self.client.get(url, self.name, timeout=self.timeout, accept=("text/html",))
+
+    # -------------------------------------------------
+    # Checkpoint
+    # -------------------------------------------------
+
+    def _done(self, url, outcome):
+        """
+        Cierra una URL (ya entregada y procesada por el consumidor)
+        y guarda checkpoint cada `checkpoint.every` páginas.
+        """
+        self.in_flight.pop(url, None)
+        self.outcomes.append((url, outcome))
+
+        if self.checkpoint and len(self.outcomes) >= self.checkpoint.every:
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        if not self.checkpoint:
+            return
+
+        # Lo que está en vuelo vuelve a la frontera y no cuenta como visitado
+        state = {
+            "frontier": self.frontier.snapshot(self.in_flight.items()),
+            "visited": self.visited - set(self.in_flight),
+        }
+
+        self.checkpoint.save(state, self.outcomes)
+        self.outcomes = []
+
+    def _url_emails_page(self, url, page_emails):
+        # Página "virtual" para URLs con '@' (no crawlables)
+        return {
+            "url": url,
+            "emails": list(page_emails),
+            "links": [],
+            "scripts": [],
+            "credentials": [],
+            "raw_html": ""
+        }
+
+    def _parse(self, url, response, page_emails, depth=0):
+        """
+        Extrae emails, enlaces, scripts y credenciales de una respuesta
+        HTML y encola los enlaces internos nuevos.
+        """
+        html = response.text
+
+        if self.extraction:
+            extracted = self._submit_extraction(html).result()
+        else:
+            extracted = extract_page_cached(html, self.html_parser, self.cache, self.triage)
+
+        return self._build_page(url, html, page_emails, extracted, depth)
+
+    def _submit_extraction(self, html):
+        """
+        extract_page() en el pool de extracción. Devuelve un Future (ya
+        resuelto si el cuerpo estaba en la caché).
+        """
+        kind = page_kind(self.html_parser, self.triage)
+        key = self.cache.key(kind, html) if self.cache else None
+        extracted = self.cache.get(key) if self.cache else None
+
+        if extracted is not None:
+            future = Future()
+            future.set_result(extracted)
+            return future
+
+        future = self.extraction.submit(extract_page, html, self.html_parser, self.triage)
+
+        if self.cache:
+            def remember(done):
+                if done.exception() is None:
+                    self.cache.put(key, kind, done.result())
 
-            if url in self.visited:
+            future.add_done_callback(remember)
+
+        return future
+
+    def _build_page(self, url, html, page_emails, extracted, depth):
+        """
+        Parte ligera (proceso principal): resolver y filtrar enlaces
+        a partir del resultado de extract_page().
+        """
+        # Emails SOLO de esta página
+        page_emails |= set(extracted["emails"])
+
+        links = set()
+
+        for href in extracted["links"]:
+            # Si contiene @, NO es una URL web válida (mailto, urls rotas...)
+            if "@" in href:
                 continue
 
+            full_url = self._normalize(
+                urljoin(url, href)
+            )
+
+            if self._is_internal(full_url):
+                links.add(full_url)
+                self.frontier.push(full_url, depth + 1)
+
+        scripts = set()
+        for src in extracted["scripts"]:
+            full = self._normalize(
+                urljoin(url, src)
+            )
+            if self._is_internal(full):
+                scripts.add(full)
+
+        return {
+            "url": url,
+            "emails": list(page_emails),
+            "links": list(links),
+            "scripts": list(scripts),
+            "credentials": extracted["credentials"],
+            "render_score": extracted.get("render_score"),
+            "raw_html": html
+        }
+
+    # -------------------------------------------------
+    # Modo secuencial
+    # -------------------------------------------------
+
+    def iter_pages(self):
+        """
+        Generador de páginas: cada resultado se entrega en cuanto se
+        procesa, sin acumular el raw_html de todo el crawl.
+        """
+        while self.frontier and len(self.visited) < self.max_pages:
+            url, depth = self.frontier.pop()
+            self.in_flight[url] = depth
+            page = None
+
             # Detectar emails embebidos en la URL (ANTES del GET)
             page_emails = set()
             page_emails |= normalize_obfuscated(url)
@@ -69,71 +262,172 @@ class Crawler:
             # Si la URL contiene '@', NO es crawlable
             if "@" in url:
                 self.visited.add(url)
+                outcome = "url_emails"
 
                 if page_emails:
-                    results.append({
-                        "url": url,
-                        "emails": list(page_emails),
-                        "links": [],
-                        "scripts": [],
-                        "raw_html": ""
-                    })
+                    page = self._url_emails_page(url, page_emails)
 
-                continue
+            else:
+                try:
+                    response = self._fetch(url)
 
-            try:
-                response = requests.get(
-                    url,
-                    timeout=self.timeout,
-                    headers={"User-Agent": "EREBUS/1.0"}
-                )
+                    if "text/html" not in response.headers.get("Content-Type", ""):
+                        outcome = "skipped"
+                    else:
+                        self.visited.add(url)
+                        page = self._parse(url, response, page_emails, depth)
+                        outcome = "ok"
 
-                if "text/html" not in response.headers.get("Content-Type", ""):
-                    continue
+                except Exception as e:
+                    print(f"[ERROR] {url} -> {e}")
+                    outcome = "error"
 
-                self.visited.add(url)
+            if page:
+                yield page
 
-                soup = BeautifulSoup(response.text, "html.parser")
+            self._done(url, outcome)
 
-                # Emails SOLO de esta página
-                page_emails |= normalize_obfuscated(soup.get_text())
-                page_emails |= normalize_obfuscated(response.text)
+        self.save_checkpoint()
 
-                links = set()
+    def run(self):
+        return list(self.iter_pages())
+
+    # -------------------------------------------------
+    # Modo asyncio (N peticiones en vuelo)
+    # -------------------------------------------------
+
+    async def aiter_pages(self):
+        """
+        Equivalente concurrente de iter_pages(): mismo formato de salida,
+        pero mantiene hasta `concurrency` peticiones en vuelo
+        (y como mucho `per_host` contra un mismo host).
+        """
+        loop = asyncio.get_running_loop()
+
+        global_sem = asyncio.Semaphore(self.concurrency)
+        host_sems = {}
+        pending = set()
+
+        async def fetch(url, depth):
+            host_sem = host_sems.setdefault(
+                self._host(url),
+                asyncio.Semaphore(self.per_host)
+            )
 
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
+            # Primero el cupo del host: una tarea bloqueada por su host
+            # no debe ocupar un hueco del límite global
+            async with host_sem:
+                async with global_sem:
+                    try:
+                        response = await loop.run_in_executor(executor, self._fetch, url)
+                    except Exception as e:
+                        print(f"[ERROR] {url} -> {e}")
+                        return url, depth, None, None
+
+            if "text/html" not in response.headers.get("Content-Type", ""):
+                return url, depth, response, None
+
+            # Extracción (CPU) fuera del bucle de eventos: pool de procesos
+            # si está configurado, si no en los hilos del crawler.
+            # Un cuerpo ya analizado (misma página por otra URL) sale de la caché.
+            try:
+                if self.extraction:
+                    extracted = await asyncio.wrap_future(self._submit_extraction(response.text))
+                else:
+                    extracted = await loop.run_in_executor(
+                        executor, extract_page_cached, response.text, self.html_parser, self.cache, self.triage
+                    )
+            except Exception as e:
+                print(f"[ERROR] {url} -> {e}")
+                extracted = None
 
-                    # Si contiene @, NO es una URL web válida (mailto, urls rotas...)
-                    if "@" in href:
-                        continue
+            return url, depth, response, extracted
 
-                    full_url = self._normalize(
-                        urljoin(url, href)
-                    )
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
 
-                    if self._is_internal(full_url):
-                        links.add(full_url)
-                        if full_url not in self.visited:
-                            self.queue.append(full_url)
+                    # Lanzar peticiones mientras quede presupuesto de páginas
+                    while (
+                        self.frontier
+                        and len(pending) < self.concurrency * 2
+                        and len(self.visited) + len(pending) < self.max_pages
+                    ):
+                        url, depth = self.frontier.pop()
+                        self.in_flight[url] = depth
 
-                scripts = set()
-                for s in soup.find_all("script", src=True):
-                    full = self._normalize(
-                        urljoin(url, s["src"])
-                    )
-                    if self._is_internal(full):
-                        scripts.add(full)
+                        page_emails = normalize_obfuscated(url)
 
-                results.append({
-                    "url": url,
-                    "emails": list(page_emails),
-                    "links": list(links),
-                    "scripts": list(scripts),
-                    "raw_html": response.text
-                })
+                        if "@" in url:
+                            self.visited.add(url)
 
-            except Exception as e:
-                print(f"[ERROR] {url} -> {e}")
+                            if page_emails:
+                                yield self._url_emails_page(url, page_emails)
+
+                            self._done(url, "url_emails")
+                            continue
+
+                        pending.add(asyncio.create_task(fetch(url, depth)))
+
+                    if not pending:
+                        self.save_checkpoint()
+                        break
+
+                    done, pending = await asyncio.wait(
+                        pending,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
 
-        return results
+                    for task in done:
+                        url, depth, response, extracted = task.result()
+                        page = None
+
+                        if response is None:
+                            outcome = "error"
+
+                        elif "text/html" not in response.headers.get("Content-Type", ""):
+                            outcome = "skipped"
+
+                        elif extracted is None:
+                            outcome = "error"
+
+                        elif len(self.visited) >= self.max_pages:
+                            outcome = "over_budget"
+
+                        else:
+                            self.visited.add(url)
+                            page = self._build_page(
+                                url, response.text, normalize_obfuscated(url), extracted, depth
+                            )
+                            outcome = "ok"
+
+                        if page:
+                            yield page
+
+                        self._done(url, outcome)
+
+            finally:
+                # Consumidor que abandona el generador a medias
+                for task in pending:
+                    task.cancel()
+
+    async def run_async(self):
+        return [page async for page in self.aiter_pages()]
+
+    def iter_pages_async(self):
+        """
+        Versión síncrona de aiter_pages() para consumidores no asyncio:
+        el bucle de eventos solo avanza cuando se pide la siguiente página.
+        """
+        loop = asyncio.new_event_loop()
+        pages = self.aiter_pages()
+
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.close()
@@ -1,5 +1,8 @@
 import re
 
+from collectors.passive.json_stream import iter_events, decode_string, KEY, STRING
+from collectors.passive.entropy import find_high_entropy
+
 USER_REGEX = re.compile(
     r"\b(user(name)?|login)[\w\-]*\s*=\s*['\"]([^'\"\s]{3,})['\"]",
     re.IGNORECASE
@@ -15,70 +18,281 @@ TOKEN_REGEX = re.compile(
     re.IGNORECASE
 )
 
+# Los tres patrones en una sola pasada.
+# Las claves de cada tipo empiezan distinto, así que en cada posición
+# como mucho una alternativa coincide; los lookahead hacen el match de
+# ancho cero y el recorrido prueba todas las posiciones, como findall.
+CREDENTIAL_REGEX = re.compile(
+    r"(?=[ulpats])\b(?:"
+    r"(?=(?P<user>(?:user(?:name)?|login)[\w\-]*\s*=\s*['\"](?P<user_value>[^'\"\s]{3,})['\"]))"
+    r"|(?=(?P<password>(?:pass(?:word)?|pwd)[\w\-]*\s*=\s*['\"](?P<password_value>[^'\"\s]{3,})['\"]))"
+    r"|(?=(?P<token>(?:api[_-]?key|token|secret)[\w\-]*\s*=\s*['\"](?P<token_value>[^'\"\s]{8,})['\"]))"
+    r")",
+    re.IGNORECASE
+)
+
+CREDENTIAL_TYPES = ("user", "password", "token")
+
+# Secretos sin nombre de variable (ver collectors.passive.entropy)
+ENTROPY_TYPE = "high_entropy"
+
 class CredentialParser:
 
     JSON_USER_KEYS = {"user", "username", "login"}
     JSON_PASS_KEYS = {"password", "pwd", "pass"}
     JSON_TOKEN_KEYS = {"apikey", "api_key", "token", "secret"}
 
+    # Cuerpos mayores que chunk_size se recorren por bloques con solape
+    CHUNK_SIZE = 4 * 1024 * 1024
+    OVERLAP = 8 * 1024
+
+    # Umbrales de la detección por entropía
+    ENTROPY_MIN_LENGTH = 20
+    ENTROPY_MIN_BITS = 3.5
+    ENTROPY_MIN_CONFIDENCE = 0.5
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, overlap: int = OVERLAP,
+                 json_keys=None, json_max_depth: int = None,
+                 entropy_min_length: int = ENTROPY_MIN_LENGTH,
+                 entropy_min_bits: float = ENTROPY_MIN_BITS,
+                 entropy_min_confidence: float = ENTROPY_MIN_CONFIDENCE):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.json_keys = json_keys or {
+            "user": self.JSON_USER_KEYS,
+            "password": self.JSON_PASS_KEYS,
+            "token": self.JSON_TOKEN_KEYS,
+        }
+        self.json_max_depth = json_max_depth
+        self.entropy_min_length = entropy_min_length
+        self.entropy_min_bits = entropy_min_bits
+        self.entropy_min_confidence = entropy_min_confidence
+
     def parse(self, text: str, source: str):
+        # Toda credencial es una asignación: sin "=" no hay nada que buscar
+        if not text or "=" not in text:
+            return []
+
+        if len(text) > self.chunk_size:
+            chunks = (text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size))
+            return self.parse_stream(chunks, source)
+
+        matches = {ctype: [] for ctype in CREDENTIAL_TYPES}
+        self._scan(text, 0, None, 0, matches, dict.fromkeys(CREDENTIAL_TYPES, 0))
+
+        return self._results(matches, source)
+
+    def parse_entropy(self, text: str, source: str, exclude=()):
+        """
+        Cadenas de alta entropía (claves, tokens) aunque no estén
+        asignadas a un nombre reconocible.
+        Devuelve [(ENTROPY_TYPE, valor, source, confianza)].
+        exclude: valores ya encontrados por parse() (no se duplican).
+        """
+        findings = find_high_entropy(
+            text,
+            min_length=self.entropy_min_length,
+            min_entropy=self.entropy_min_bits,
+            min_confidence=self.entropy_min_confidence,
+            exclude=exclude
+        )
+
+        return [(ENTROPY_TYPE, value, source, confidence) for value, confidence in findings]
+
+    def parse_stream(self, chunks, source: str, overlap: int = None):
+        """
+        Igual que parse() pero sobre un iterable de bloques de texto
+        (p.ej. un cuerpo descargado en streaming), sin juntarlo entero.
+        Los últimos `overlap` caracteres de cada bloque se vuelven a
+        recorrer con el siguiente: un match más largo que el solape que
+        cruce un corte puede perderse.
+        """
+        stream = self.stream(source, overlap)
+
+        for chunk in chunks:
+            stream.feed(chunk)
+
+        return stream.results()
+
+    def stream(self, source: str, overlap: int = None):
+        """
+        Versión incremental de parse_stream(): los bloques se entregan con
+        feed() (p.ej. desde un bucle que también alimenta otros
+        extractores) y results() devuelve lo encontrado.
+        """
+        return CredentialStream(self, source, self.overlap if overlap is None else overlap)
+
+    def _scan(self, text, pos, limit, offset, matches, last_end):
+        """
+        Matches que empiezan en [pos, limit) de text.
+        last_end (posiciones absolutas) reproduce, por tipo, el
+        "sin solapamiento" de findall.
+        """
+        for m in CREDENTIAL_REGEX.finditer(text, pos):
+            if limit is not None and m.start() >= limit:
+                break
+
+            for ctype in CREDENTIAL_TYPES:
+                if m.group(ctype) is None:
+                    continue
+
+                if m.start() + offset >= last_end[ctype]:
+                    matches[ctype].append(m.group(f"{ctype}_value"))
+                    last_end[ctype] = m.end(ctype) + offset
+                break
+
+    def _results(self, matches, source):
+        # Mismo orden que antes: usuarios, contraseñas y tokens
         results = []
         seen = set()
 
-        if not text:
+        for ctype in CREDENTIAL_TYPES:
+            for value in matches[ctype]:
+                item = (ctype, value, source)
+                if item not in seen:
+                    results.append(item)
+                    seen.add(item)
+
+        return results
+
+    def parse_json(self, obj, source: str, keys=None, max_depth=None):
+        """
+        Recorre un objeto JSON ya cargado (dicts / listas) buscando claves
+        de credenciales con valor string.
+
+        Iterativo (pila de iteradores, mismo orden que el recorrido
+        recursivo): un JSON muy anidado no llega al límite de recursión.
+        keys: {"user": [...], "password": [...], "token": [...]}
+        max_depth: niveles de anidamiento que se recorren (None = todos).
+        """
+        key_types = self._json_key_types(keys)
+        max_depth = self.json_max_depth if max_depth is None else max_depth
+
+        results = []
+        seen = set()
+
+        if not isinstance(obj, (dict, list)):
             return results
 
-        for _, _, value in USER_REGEX.findall(text):
-            item = ("user", value, source)
-            if item not in seen:
-                results.append(item)
-                seen.add(item)
+        stack = [self._json_children(obj)]
+
+        while stack:
+            entry = next(stack[-1], None)
+
+            if entry is None:
+                stack.pop()
+                continue
+
+            k, v = entry
+
+            if isinstance(v, str):
+                t = key_types.get(k.lower()) if isinstance(k, str) else None
 
-        for _, _, value in PASS_REGEX.findall(text):
-            item = ("password", value, source)
-            if item not in seen:
-                results.append(item)
-                seen.add(item)
+                if t:
+                    item = (t, v, source)
+                    if item not in seen:
+                        results.append(item)
+                        seen.add(item)
 
-        for _, value in TOKEN_REGEX.findall(text):
-            item = ("token", value, source)
-            if item not in seen:
-                results.append(item)
-                seen.add(item)
+            elif isinstance(v, (dict, list)) and (max_depth is None or len(stack) < max_depth):
+                stack.append(self._json_children(v))
 
         return results
 
-    def parse_json(self, obj, source: str):
+    def parse_json_stream(self, chunks, source: str, keys=None, max_depth=None):
+        """
+        Como parse_json pero directamente sobre el texto / bytes del JSON
+        (iterable de bloques), evento a evento y sin construir el árbol:
+        memoria constante aunque la respuesta sea enorme.
+
+        Diferencia: con claves repetidas en un mismo objeto se informan
+        todos los valores (json.loads se queda solo con el último).
+        """
+        key_types = self._json_key_types(keys)
+        max_depth = self.json_max_depth if max_depth is None else max_depth
+
         results = []
         seen = set()
+        pending = None  # tipo de la última clave, a la espera de su valor
+
+        for event, value, depth in iter_events(chunks):
+            if event == KEY:
+                pending = None
+
+                if max_depth is None or depth <= max_depth:
+                    pending = key_types.get(decode_string(value).lower())
+
+            elif event == STRING and pending:
+                item = (pending, decode_string(value), source)
+                if item not in seen:
+                    results.append(item)
+                    seen.add(item)
+                pending = None
+
+            else:
+                pending = None
 
-        def walk(o):
-            if isinstance(o, dict):
-                for k, v in o.items():
-                    key = k.lower()
-                    if isinstance(v, str):
-                        if key in self.JSON_USER_KEYS:
-                            t = "user"
-                        elif key in self.JSON_PASS_KEYS:
-                            t = "password"
-                        elif key in self.JSON_TOKEN_KEYS:
-                            t = "token"
-                        else:
-                            t = None
-
-                        if t:
-                            item = (t, v, source)
-                            if item not in seen:
-                                results.append(item)
-                                seen.add(item)
-
-                    walk(v)
-
-            elif isinstance(o, list):
-                for i in o:
-                    walk(i)
-
-        walk(obj)
         return results
 
+    def _json_key_types(self, keys=None):
+        """
+        clave (minúsculas) -> tipo. Si una clave aparece en varios tipos
+        gana el primero (user, password, token).
+        """
+        if keys is None:
+            keys = self.json_keys
+
+        key_types = {}
+        for ctype in reversed(CREDENTIAL_TYPES):
+            for key in keys.get(ctype, ()):
+                key_types[key.lower()] = ctype
+
+        return key_types
+
+    @staticmethod
+    def _json_children(o):
+        if isinstance(o, dict):
+            return iter(o.items())
+        return ((None, item) for item in o)
+
+
+class CredentialStream:
+    """
+    Estado de un recorrido por bloques de CredentialParser
+    (ver CredentialParser.stream).
+    """
+
+    def __init__(self, parser: CredentialParser, source: str, overlap: int):
+        self.parser = parser
+        self.source = source
+        self.overlap = overlap
+
+        self.matches = {ctype: [] for ctype in CREDENTIAL_TYPES}
+        self.last_end = dict.fromkeys(CREDENTIAL_TYPES, 0)
+
+        self.buffer = ""
+        self.offset = 0  # posición absoluta de buffer[0]
+        self.pos = 0
+
+    def feed(self, chunk: str):
+        self.buffer += chunk
+        limit = len(self.buffer) - self.overlap
+
+        if limit <= self.pos:
+            return
+
+        if "=" in self.buffer:
+            self.parser._scan(self.buffer, self.pos, limit, self.offset, self.matches, self.last_end)
+
+        # Se conserva un carácter antes del límite para el \b
+        keep = limit - 1
+        self.buffer = self.buffer[keep:]
+        self.offset += keep
+        self.pos = 1
+
+    def results(self):
+        if "=" in self.buffer:
+            self.parser._scan(self.buffer, self.pos, None, self.offset, self.matches, self.last_end)
+            self.buffer = ""
 
+        return self.parser._results(self.matches, self.source)
@@ -1,36 +1,222 @@
+import asyncio
+from collections import Counter
+
+import dns.asyncresolver
+import dns.rdatatype
 import dns.resolver
 from .base import PassiveCollector
 import core.constants as C
 
+# Estados guardados en la caché
+STATUS_OK = "ok"
+STATUS_NXDOMAIN = "nxdomain"
+STATUS_NOANSWER = "noanswer"
+
+# Tipos de registro del perfil DNS de cada dominio
+RECORD_TYPES = ("A", "AAAA", "CNAME", "MX", "TXT")
+
+# Saltos CNAME seguidos como máximo (y corte de bucles)
+MAX_CNAME_DEPTH = 8
+
+
+def record_value(rdata) -> str:
+    """
+    Valor legible de un registro: IP, destino del CNAME,
+    "prioridad servidor" del MX o texto del TXT (sin comillas).
+    """
+    if rdata.rdtype == dns.rdatatype.TXT:
+        return b"".join(rdata.strings).decode("utf-8", errors="replace")
+
+    if rdata.rdtype == dns.rdatatype.MX:
+        return f"{rdata.preference} {rdata.exchange.to_text(omit_final_dot=True)}"
+
+    if rdata.rdtype == dns.rdatatype.CNAME:
+        return rdata.target.to_text(omit_final_dot=True).lower()
+
+    return rdata.to_text()
+
+
+def negative_ttl(response, default: int) -> int:
+    """
+    TTL de una respuesta negativa (RFC 2308): mínimo entre el TTL del SOA
+    de la sección authority y su campo minimum. Sin SOA, default.
+    """
+    if response is None:
+        return default
+
+    for rrset in response.authority:
+        if rrset.rdtype == dns.rdatatype.SOA:
+            return min(rrset.ttl, rrset[0].minimum)
+
+    return default
+
+
 class DNSCollector(PassiveCollector):
+    """
+    Resolución DNS de muchos dominios a la vez (dns.asyncresolver).
+
+    - record_types: tipos pedidos por dominio (subconjunto de RECORD_TYPES).
+      Todas las consultas (dominio x tipo) salen a la vez; los CNAME se
+      siguen salto a salto y cada nombre de la cadena se consulta una sola
+      vez aunque lo compartan muchos dominios (p.ej. un mismo CDN).
+    - concurrency: dominios en vuelo como máximo (cada uno con todas sus
+      consultas a la vez): el tiempo total es el de una sola ronda.
+    - timeout: por servidor y total por consulta (lifetime).
+    - cache (opcional): DnsCache. Las respuestas se guardan según su TTL y
+      los NXDOMAIN / NoAnswer según el SOA; los timeouts no se guardan.
+    """
 
-    def __init__(self, timeout: int = 8):
-        self.resolver = dns.resolver.Resolver()
+    NEGATIVE_TTL = 300
+
+    def __init__(self, timeout: int = 8, concurrency: int = 100, cache=None,
+                 negative_ttl: int = NEGATIVE_TTL, record_types=("A",)):
+        unknown = set(record_types) - set(RECORD_TYPES)
+        if unknown:
+            raise ValueError(f"Tipos de registro no soportados: {', '.join(sorted(unknown))} (válidos: {', '.join(RECORD_TYPES)})")
+
+        self.resolver = dns.asyncresolver.Resolver()
         self.resolver.lifetime = timeout
         self.resolver.timeout = timeout
 
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+        self.record_types = tuple(record_types)
+
+        # Por consulta: resolved / nxdomain / noanswer / errors / cached
+        self.stats = Counter()
+
     def collect(self, target: str):
-        resultados = []
+        return self.collect_many([target])[target]
+
+    def collect_many(self, domains) -> dict:
+        """
+        {dominio: [resultados A]} para todos los dominios (lista vacía si
+        no resuelve), en el orden de entrada.
+        """
+        profiles = self.resolve_many(domains, ("A",))
+
+        return {
+            domain: [
+                {"domain": domain, "ip": ip, "source": C.TECHNIQUE_DNS}
+                for ip in profile["A"]
+            ]
+            for domain, profile in profiles.items()
+        }
+
+    def resolve_many(self, domains, record_types=None) -> dict:
+        """
+        {dominio: {tipo: [valores]}} en el orden de entrada. Para "CNAME"
+        la lista es la cadena de destinos, en orden.
+        """
+        record_types = tuple(record_types or self.record_types)
+        domains = list(dict.fromkeys(domains))
+        if not domains:
+            return {}
 
         try:
-            respuestas = dns.resolver.resolve(target, "A")
-            for dato in sorted(respuestas, key=lambda r: r.to_text()):
+            return asyncio.run(self._resolve_all(domains, record_types))
+        finally:
+            if self.cache:
+                self.cache.flush()
+
+    @staticmethod
+    def records(domain: str, profile: dict):
+        """
+        Filas (nombre, tipo, valor) de un perfil. Cada salto CNAME se guarda
+        con su propio nombre de origen.
+        """
+        rows = []
+
+        for rdtype, values in profile.items():
+            if rdtype == "CNAME":
+                owner = domain
+                for target in values:
+                    rows.append((owner, rdtype, target))
+                    owner = target
+            else:
+                rows.extend((domain, rdtype, value) for value in values)
+
+        return rows
+
+    # -------------------------------------------------
+    # Resolución
+    # -------------------------------------------------
+
+    async def _resolve_all(self, domains, record_types):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        queries = {}  # (nombre, tipo) -> tarea: cada consulta sale una sola vez
+
+        def query(name, rdtype):
+            key = (name, rdtype)
+            if key not in queries:
+                queries[key] = asyncio.ensure_future(self._query(name, rdtype))
+            return queries[key]
+
+        async def cname_chain(name):
+            chain = []
+            seen = {name}
+
+            while len(chain) < MAX_CNAME_DEPTH:
+                targets = await query(name, "CNAME")
+                if not targets or targets[0] in seen:
+                    break
 
-                resultados.append({
-                    "domain": target,
-                    "ip": dato.to_text(),
-                    "source": C.TECHNIQUE_DNS
+                name = targets[0]
+                seen.add(name)
+                chain.append(name)
 
-                })
+            return chain
+
+        async def profile(domain):
+            types = [t for t in record_types if t != "CNAME"]
+            pending = [query(domain, t) for t in types]
+
+            if "CNAME" in record_types:
+                types.append("CNAME")
+                pending.append(cname_chain(domain))
+
+            return dict(zip(types, await asyncio.gather(*pending)))
+
+        async def bounded(domain):
+            async with semaphore:
+                return await profile(domain)
+
+        profiles = await asyncio.gather(*(bounded(d) for d in domains))
+        return dict(zip(domains, profiles))
+
+    async def _query(self, target: str, rdtype: str):
+        if self.cache:
+            cached = self.cache.get(target, rdtype)
+            if cached is not None:
+                self.stats["cached"] += 1
+                return cached[1]
+
+        try:
+            respuestas = await self.resolver.resolve(target, rdtype)
+            values = sorted(record_value(dato) for dato in respuestas)
+
+            self.stats["resolved"] += 1
+            self._store(target, rdtype, STATUS_OK, values, respuestas.rrset.ttl)
+            return values
 
         #SILENCIADO DE ERRORES
-        except dns.resolver.NXDOMAIN:
-            pass  # dominio no existe (esperable)
-        except dns.resolver.NoAnswer:
-            pass  # no hay A record
+        except dns.resolver.NXDOMAIN as e:
+            # dominio no existe (esperable)
+            self.stats["nxdomain"] += 1
+            response = next(iter(e.responses().values()), None)
+            self._store(target, rdtype, STATUS_NXDOMAIN, [], negative_ttl(response, self.negative_ttl))
+        except dns.resolver.NoAnswer as e:
+            # no hay registros de ese tipo
+            self.stats["noanswer"] += 1
+            self._store(target, rdtype, STATUS_NOANSWER, [], negative_ttl(e.response(), self.negative_ttl))
         except dns.resolver.Timeout:
-            pass  # timeout DNS
+            self.stats["errors"] += 1  # timeout DNS (no se guarda: puede ser transitorio)
         except Exception:
-            pass  # cualquier otro error no crítico
+            self.stats["errors"] += 1  # cualquier otro error no crítico
+
+        return []
 
-        return resultados
+    def _store(self, target, rdtype, status, answers, ttl):
+        if self.cache:
+            self.cache.put(target, rdtype, status, answers, ttl)
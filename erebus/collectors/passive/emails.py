@@ -1,16 +1,21 @@
 import re
 import requests
 from collectors.passive.base import PassiveCollector
+from core.http_client import HttpClient
 import core.constants as C
 
 
 class EmailCollector(PassiveCollector):
+
+    name = "emails"
+
     EMAIL_REGEX = re.compile(
         r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
     )
 
-    def __init__(self, timeout: int = 8):
+    def __init__(self, timeout: int = None, client=None):
         self.timeout = timeout
+        self.client = client or HttpClient()
 
     def collect(self, target: str):
         results = []
@@ -24,11 +29,7 @@ class EmailCollector(PassiveCollector):
 
         for url in urls:
             try:
-                response = requests.get(
-                    url,
-                    timeout=self.timeout,
-                    headers={"User-Agent": "EREBUS/1.0"}
-                )
+                response = self.client.get(url, self.name, timeout=self.timeout, accept=("text/",))
 
                 if response.status_code != 200:
                     continue
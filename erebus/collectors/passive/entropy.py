@@ -0,0 +1,169 @@
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional: sin ella se usa el cálculo en Python
+    np = None
+
+
+# Candidatos: literales de cadena sin espacios con juego de caracteres de
+# token (base64, base64url, hex, claves tipo AKIA..., sk_live_...)
+CANDIDATE_REGEX = re.compile(r"""["'`]([A-Za-z0-9+/=_\-.]{20,256})["'`]""")
+
+# Literales que por forma son rutas o nombres de fichero, no secretos
+NOISE_PREFIXES = ("/", "./", "../", "http:", "https:")
+NOISE_SUFFIXES = tuple(
+    "." + ext for ext in (
+        "js", "mjs", "css", "map", "json", "html", "htm", "php", "asp", "aspx",
+        "png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "woff", "woff2", "ttf", "eot",
+    )
+)
+
+
+def _is_noise(value: str) -> bool:
+    return value.startswith(NOISE_PREFIXES) or value[-6:].lower().endswith(NOISE_SUFFIXES)
+
+
+ASCII = 128
+
+# Clase de cada byte: 0 minúscula, 1 mayúscula, 2 dígito, 3 otro
+CLASS_LOWER, CLASS_UPPER, CLASS_DIGIT, CLASS_OTHER = range(4)
+
+
+def _class_lut():
+    lut = np.full(ASCII, CLASS_OTHER, dtype=np.int64)
+    lut[ord("a"):ord("z") + 1] = CLASS_LOWER
+    lut[ord("A"):ord("Z") + 1] = CLASS_UPPER
+    lut[ord("0"):ord("9") + 1] = CLASS_DIGIT
+    return lut
+
+
+def _stats_numpy(candidates):
+    """
+    Estadísticas de todos los candidatos a la vez.
+    Los candidatos se concatenan en un único buffer de bytes; cada byte
+    lleva el índice de su fila, así que histogramas, entropía y clases
+    de caracteres salen de operaciones vectorizadas (sin bucle por token).
+    """
+    n = len(candidates)
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=n)
+    data = np.frombuffer("".join(candidates).encode("ascii"), dtype=np.uint8)
+    rows = np.repeat(np.arange(n), lengths)
+
+    # Histograma por fila (n x 128) y entropía sobre las celdas no vacías:
+    # H = log2(L) - sum(c * log2(c)) / L
+    counts = np.bincount(rows * ASCII + data, minlength=n * ASCII)
+    cells = np.flatnonzero(counts)
+    c = counts[cells].astype(np.float64)
+    weighted = np.bincount(cells // ASCII, weights=c * np.log2(c), minlength=n)
+    entropy = np.log2(lengths) - weighted / lengths
+
+    # Clases de caracteres presentes por fila
+    present = np.bincount(rows * 4 + _class_lut()[data], minlength=n * 4).reshape(n, 4) > 0
+    classes = present.sum(axis=1)
+
+    # Fracción de pares consecutivos ascendentes ("ABCDEF...", alfabetos)
+    same_row = rows[1:] == rows[:-1]
+    ascending = (np.diff(data.astype(np.int16)) == 1) & same_row
+    sequential = np.bincount(rows[:-1][ascending], minlength=n) / np.maximum(lengths - 1, 1)
+
+    return lengths, entropy, classes, sequential
+
+
+def _stats_python(candidates):
+    lengths, entropies, classes, sequential = [], [], [], []
+
+    for c in candidates:
+        size = len(c)
+        counts = Counter(c)
+        lengths.append(size)
+        entropies.append(-sum(k / size * math.log2(k / size) for k in counts.values()))
+        classes.append(
+            any(ch.islower() for ch in c) + any(ch.isupper() for ch in c)
+            + any(ch.isdigit() for ch in c) + any(not ch.isalnum() for ch in c)
+        )
+        sequential.append(
+            sum(1 for a, b in zip(c, c[1:]) if ord(b) - ord(a) == 1) / max(size - 1, 1)
+        )
+
+    return lengths, entropies, classes, sequential
+
+
+def _clip(x):
+    return min(max(x, 0.0), 1.0)
+
+
+def _np_clip(x):
+    return np.clip(x, 0.0, 1.0)
+
+
+def _confidence(size, h, k, min_length, min_entropy, clip):
+    return (
+        0.5 * clip((h - min_entropy) / 1.5)
+        + 0.25 * (k - 1) / 3
+        + 0.25 * clip((size - min_length) / 20)
+    )
+
+
+def confidence_scores(lengths, entropy, classes, min_length, min_entropy):
+    """
+    Puntuación 0..1: entropía por encima del mínimo (50 %), variedad de
+    clases de caracteres (25 %) y longitud (25 %).
+    Con arrays de NumPy se calcula de una vez; con listas, por elemento.
+    """
+    if np is not None and isinstance(entropy, np.ndarray):
+        return _confidence(lengths, entropy, classes, min_length, min_entropy, _np_clip)
+
+    return [
+        _confidence(size, h, k, min_length, min_entropy, _clip)
+        for size, h, k in zip(lengths, entropy, classes)
+    ]
+
+
+def find_high_entropy(text: str, min_length: int = 20, min_entropy: float = 3.5,
+                      min_confidence: float = 0.5, exclude=()):
+    """
+    Cadenas de alta entropía en text (secretos sin nombre de variable).
+    Devuelve [(valor, confianza)] en orden de aparición, sin repetidos.
+    exclude: valores ya detectados por otra vía.
+    """
+    if not text:
+        return []
+
+    exclude = set(exclude)
+    candidates = list(dict.fromkeys(
+        c for c in CANDIDATE_REGEX.findall(text)
+        if len(c) >= min_length and c not in exclude and not _is_noise(c)
+    ))
+
+    if not candidates:
+        return []
+
+    if np is not None:
+        lengths, entropy, classes, sequential = _stats_numpy(candidates)
+        scores = confidence_scores(lengths, entropy, classes, min_length, min_entropy)
+        mask = (entropy >= min_entropy) & (classes >= 2) & (sequential < 0.5)
+        idx = np.flatnonzero(mask)
+
+        scores = scores[idx].tolist()
+        selected = [candidates[i] for i in idx.tolist()]
+
+    else:
+        lengths, entropy, classes, sequential = _stats_python(candidates)
+        idx = [
+            i for i in range(len(candidates))
+            if entropy[i] >= min_entropy and classes[i] >= 2 and sequential[i] < 0.5
+        ]
+        scores = confidence_scores(
+            [lengths[i] for i in idx], [entropy[i] for i in idx], [classes[i] for i in idx],
+            min_length, min_entropy
+        )
+        selected = [candidates[i] for i in idx]
+
+    return [
+        (value, round(score, 3))
+        for value, score in zip(selected, scores)
+        if score >= min_confidence
+    ]
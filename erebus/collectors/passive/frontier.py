@@ -0,0 +1,124 @@
+import heapq
+import itertools
+from collections import deque
+from urllib.parse import urlparse
+
+
+# ---------------------------------------------
+# Funciones de prioridad (menor = antes)
+# ---------------------------------------------
+
+def bfs_priority(url: str, depth: int):
+    """
+    Recorrido en anchura: primero las páginas menos profundas.
+    """
+    return depth
+
+
+# Palabras en la ruta que suelen indicar páginas con emails de contacto
+EMAIL_KEYWORDS = {
+    "contact": 10, "contacto": 10, "contacta": 10,
+    "about": 6, "quienes-somos": 6, "sobre-nosotros": 6, "nosotros": 5,
+    "team": 8, "equipo": 8, "staff": 8, "people": 6, "personal": 6,
+    "directorio": 8, "directory": 8,
+    "press": 4, "prensa": 4, "support": 4, "soporte": 4, "ayuda": 3,
+    "legal": 3, "privacy": 2, "privacidad": 2, "aviso-legal": 3,
+}
+
+
+def keyword_score(url: str) -> int:
+    path = urlparse(url).path.lower()
+    return sum(weight for word, weight in EMAIL_KEYWORDS.items() if word in path)
+
+
+def keyword_priority(url: str, depth: int):
+    """
+    Primero las URLs cuya ruta contiene palabras como /contact, /about
+    o /team; a igual puntuación, las menos profundas.
+    """
+    return -keyword_score(url), depth
+
+
+PRIORITIES = {
+    "bfs": bfs_priority,
+    "keywords": keyword_priority,
+}
+
+
+class Frontier:
+    """
+    Frontera del crawler.
+
+    Sin función de prioridad es una cola FIFO (deque, O(1));
+    con ella, un heap ordenado por priority(url, depth).
+    Cada URL se encola como mucho una vez ("vista o encolada").
+    """
+
+    def __init__(self, priority=None):
+        self.priority = priority
+        self._seen = set()
+        self._deque = deque()
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, url: str, depth: int = 0) -> bool:
+        if url in self._seen:
+            return False
+
+        self._seen.add(url)
+
+        if self.priority is None:
+            self._deque.append((url, depth))
+        else:
+            # El contador desempata en orden de llegada (FIFO estable)
+            heapq.heappush(
+                self._heap,
+                (self.priority(url, depth), next(self._counter), url, depth)
+            )
+
+        return True
+
+    def pop(self):
+        """
+        Devuelve (url, depth) del siguiente elemento.
+        """
+        if self.priority is None:
+            return self._deque.popleft()
+
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    # -------------------------------------------------
+    # Checkpoint
+    # -------------------------------------------------
+
+    def snapshot(self, extra_pending=()):
+        """
+        Estado serializable: URLs pendientes (más las que se indiquen,
+        p.ej. las que están en vuelo) y conjunto de vistas.
+        """
+        if self.priority is None:
+            pending = list(self._deque)
+        else:
+            pending = [(url, depth) for _, _, url, depth in sorted(self._heap)]
+
+        return {
+            "pending": [list(item) for item in extra_pending] + [list(item) for item in pending],
+            "seen": list(self._seen),
+        }
+
+    def restore(self, state):
+        self._seen = set()
+        self._deque.clear()
+        self._heap = []
+
+        for url, depth in state.get("pending", []):
+            self.push(url, depth)
+
+        self._seen.update(state.get("seen", []))
+
+    def __contains__(self, url):
+        return url in self._seen
+
+    def __len__(self):
+        return len(self._deque) + len(self._heap)
@@ -0,0 +1,187 @@
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # backend opcional
+    etree = None
+
+
+# Contenido que no forma parte del texto visible (igual que soup.get_text())
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+# Etiquetas donde BeautifulSoup conserva los bloques de solo espacios
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+
+ASCII_SPACES = " \n\t\f\r"
+
+
+class _Collector:
+    """
+    Acumula, en una sola pasada de eventos, lo que el crawler
+    sacaba del árbol de BeautifulSoup: href de <a>, src de <script>
+    y texto visible.
+    """
+
+    def __init__(self):
+        self.links = []
+        self.scripts = []
+        self.text = []
+        self.hidden = 0
+        self.preserve = 0
+        self.pending = []
+
+    def flush(self):
+        """
+        Cierra el bloque de texto entre dos eventos de etiqueta.
+        Como BeautifulSoup, un bloque de solo espacios se reduce
+        a "\\n" (o " " si no tiene saltos de línea).
+        """
+        if not self.pending:
+            return
+
+        chunk = "".join(self.pending)
+        self.pending = []
+
+        if self.hidden:
+            return
+
+        if not self.preserve and not chunk.strip(ASCII_SPACES):
+            chunk = "\n" if "\n" in chunk else " "
+
+        self.text.append(chunk)
+
+    def start(self, tag, attrs):
+        self.flush()
+        tag = tag.lower()
+
+        if tag == "a":
+            href = attrs.get("href")
+            if href is not None:
+                self.links.append(href)
+
+        elif tag == "script":
+            src = attrs.get("src")
+            if src is not None:
+                self.scripts.append(src)
+
+        if tag in NON_TEXT_TAGS:
+            self.hidden += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve += 1
+
+    def end(self, tag):
+        self.flush()
+        tag = tag.lower()
+
+        if tag in NON_TEXT_TAGS and self.hidden:
+            self.hidden -= 1
+        elif tag in PRESERVE_WHITESPACE_TAGS and self.preserve:
+            self.preserve -= 1
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def result(self):
+        self.flush()
+        return {
+            "links": self.links,
+            "scripts": self.scripts,
+            "text": "".join(self.text),
+        }
+
+
+class _StdlibParser(HTMLParser):
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_comment(self, data):
+        self.collector.flush()
+
+    def handle_decl(self, decl):
+        self.collector.flush()
+
+    def handle_pi(self, data):
+        self.collector.flush()
+
+
+class _LxmlTarget:
+    """
+    Interfaz "target" de lxml: recibe eventos desde el parser en C
+    sin construir el árbol.
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, attrib)
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def comment(self, text):
+        self.collector.flush()
+
+    def close(self):
+        return self.collector.result()
+
+
+def _extract_stdlib(html: str) -> dict:
+    collector = _Collector()
+    parser = _StdlibParser(collector)
+    parser.feed(html)
+    parser.close()
+    return collector.result()
+
+
+def _extract_lxml(html: str) -> dict:
+    collector = _Collector()
+    parser = etree.HTMLParser(target=_LxmlTarget(collector))
+    parser.feed(html)
+    return parser.close()
+
+
+BACKENDS = {
+    "stdlib": _extract_stdlib,
+    "lxml": _extract_lxml,
+}
+
+
+def available_backend(name: str) -> str:
+    """
+    Devuelve el backend pedido si está disponible; si no, "stdlib".
+    """
+    if name == "lxml" and etree is None:
+        print("[HTML] lxml no está instalado, se usa html.parser")
+        return "stdlib"
+
+    return name if name in BACKENDS else "stdlib"
+
+
+def extract(html: str, backend: str = "stdlib") -> dict:
+    """
+    Extractor HTML de una sola pasada (sin árbol).
+    Devuelve {"links": [href...], "scripts": [src...], "text": texto visible}.
+    """
+    if not html:
+        return {"links": [], "scripts": [], "text": ""}
+
+    return BACKENDS[backend](html)
@@ -1,17 +1,62 @@
-from normalizers.email_normalizer import normalize_obfuscated
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
+from core.http_client import HttpClient
+from core.extraction import find_emails, find_credentials, find_entropy_credentials
+from collectors.passive.credential_parser import CredentialParser
+from normalizers.email_normalizer import normalize_obfuscated
+import core.constants as C
 
-import requests
 import re
 
-URL_REGEX = r"https?://[^\s\"']+"
+URL_REGEX = re.compile(r"https?://[^\s\"']+")
+
+# Cortes de ventana en modo streaming: justo después de un espacio o
+# unas comillas. Ni URLs ni emails los contienen, así que el corte no
+# deja trozos que parezcan resultados.
+SAFE_CUTS = ('"', "'", "`", " ", "\n", "\t")
+
+
+def _safe_cut(text: str, hi: int, lo: int) -> int:
+    """
+    Posición en (lo, hi] justo tras un carácter de SAFE_CUTS, o hi si
+    no hay ninguno (corte duro).
+    """
+    pos = max(text.rfind(c, lo, hi) for c in SAFE_CUTS)
+    return pos + 1 if pos >= 0 else hi
 
 
 class JSParser:
 
-    def __init__(self, connect_timeout: int = 8, read_timeout: int = 8):
+    name = "js"
+
+    STREAM_OVERLAP = 8 * 1024
+
+    def __init__(self, connect_timeout: int = None, read_timeout: int = None, client=None, cache=None,
+                 concurrency: int = 8, vendor_index=None, cred_parser=None, entropy: bool = False,
+                 stream_window: int = 0, stream_overlap: int = STREAM_OVERLAP):
         self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
+        self.client = client or HttpClient()
+        self.cache = cache  # storage.extraction_cache.ExtractionCache (opcional)
+        self.concurrency = max(1, concurrency)  # descargas simultáneas en parse_many
+
+        # Librerías conocidas que no se descargan / analizan
+        # (collectors.passive.vendor_index.VendorIndex, opcional)
+        self.vendor_index = vendor_index
+        self.vendor_skips = Counter()  # "url" / "hash" -> scripts descartados
+        self.lock = threading.Lock()
+
+        # Credenciales (con nombre) y, si entropy, secretos de alta entropía
+        self.cred_parser = cred_parser or CredentialParser()
+        self.entropy = entropy
+
+        # stream_window > 0: los scripts se analizan por ventanas de ese
+        # tamaño (caracteres) con solape, sin tener el cuerpo entero en memoria
+        self.stream_window = stream_window
+        self.stream_overlap = min(stream_overlap, stream_window // 4)
 
     def _is_external(self, script_url, base_domain):
         netloc = urlparse(script_url).netloc.lower().split(":")[0]
@@ -22,34 +67,176 @@ class JSParser:
             or netloc.endswith("." + base_domain)
         )
 
+    def _skip_vendor(self, kind, name):
+        if name is None:
+            return False
+
+        with self.lock:
+            self.vendor_skips[kind] += 1
+        return True
+
+    def _is_vendor_url(self, script_url):
+        return self.vendor_index is not None and self._skip_vendor(
+            "url", self.vendor_index.match_url(script_url)
+        )
+
     def parse(self, script_url: str, base_domain: str) -> dict | None:
 
         try:
             if self._is_external(script_url, base_domain):
                 return None
 
-            r = requests.get(
-                script_url,
-                timeout=(self.connect_timeout, self.read_timeout),
-                headers={"User-Agent": "EREBUS/1.0"}
+            if self._is_vendor_url(script_url):
+                return None
+
+            timeout = None
+            if self.connect_timeout and self.read_timeout:
+                timeout = (self.connect_timeout, self.read_timeout)
+
+            if self.stream_window:
+                return self._parse_streamed(script_url, timeout)
+
+            r = self.client.get(script_url, self.name, timeout=timeout)
+
+            if r.status_code != 200:
+                return None
+
+            return self._analyze(script_url, r.text)
+
+        except Exception as e:
+            print(f"[JS ERROR] {script_url} -> {e}")
+            return None
+
+    def _analyze(self, script_url, content):
+        if self.vendor_index is not None and self._skip_vendor(
+            "hash", self.vendor_index.match_content(content)
+        ):
+            return None
+
+        # El mismo bundle (app.js en varias ejecuciones...) solo se analiza una vez
+        emails = find_emails(content, self.cache)
+        urls = set(URL_REGEX.findall(content))  # endpoints / APIs
+        credentials = find_credentials(content, C.SOURCE_JS, self.cache)
+
+        secrets = []
+        if self.entropy:
+            secrets = find_entropy_credentials(
+                content, C.SOURCE_JS, self.cache,
+                parser=self.cred_parser,
+                exclude=[value for _, value, _ in credentials]
             )
 
+        return {
+            "script_url": script_url,
+            "emails": list(emails),
+            "urls": list(urls),
+            "credentials": credentials,
+            "secrets": secrets,
+        }
+
+    # -------------------------------------------------
+    # Modo streaming
+    # -------------------------------------------------
+
+    def _parse_streamed(self, script_url, timeout):
+        with self.client.stream(script_url, self.name, timeout=timeout) as r:
             if r.status_code != 200:
                 return None
 
-            content = r.text
+            # Cuerpo pequeño (sin comprimir): análisis normal, con caché
+            length = int(r.headers.get("Content-Length") or 0)
+            if length and length <= self.stream_window and not r.headers.get("Content-Encoding"):
+                return self._analyze(script_url, "".join(r.iter_chunks()))
 
-            emails = normalize_obfuscated(content)
-            urls = set(re.findall(URL_REGEX, content))  # endpoints / APIs
+            return self.scan_stream(script_url, r.iter_chunks())
 
-            return {
-                "script_url": script_url,
-                "emails": list(emails),
-                "urls": list(urls),
-                "raw": content
-            }
+    def scan_stream(self, script_url, chunks):
+        """
+        Mismos resultados que _analyze() sobre un iterable de bloques de
+        texto. En memoria hay como mucho una ventana (stream_window) más
+        el bloque en curso: cada ventana se solapa stream_overlap
+        caracteres con la anterior y los cortes caen tras espacios o
+        comillas (ver SAFE_CUTS), así que lo que cruza un corte aparece
+        entero en una de las dos.
+        Las credenciales con nombre usan CredentialParser.stream().
+        """
+        window = self.stream_window
+        overlap = self.stream_overlap
 
-        except Exception as e:
-            print(f"[JS ERROR] {script_url} -> {e}")
+        emails = set()
+        urls = set()
+        secrets = {}
+        creds = self.cred_parser.stream(C.SOURCE_JS)
+        digest = hashlib.sha256() if self.vendor_index is not None else None
+
+        def scan(text):
+            emails.update(normalize_obfuscated(text))
+            urls.update(URL_REGEX.findall(text))
+
+            if self.entropy:
+                for item in self.cred_parser.parse_entropy(text, C.SOURCE_JS):
+                    secrets.setdefault(item[1], item)
+
+        buffer = ""
+
+        for chunk in chunks:
+            creds.feed(chunk)
+            if digest:
+                digest.update(chunk.encode("utf-8", errors="surrogatepass"))
+
+            buffer += chunk
+
+            while len(buffer) > window:
+                end = _safe_cut(buffer, window, window - overlap)
+                scan(buffer[:end])
+
+                start = _safe_cut(buffer, end - overlap, end - 2 * overlap)
+                buffer = buffer[start:]
+
+        scan(buffer)
+
+        # El hash del contenido solo se conoce al final
+        if digest and self._skip_vendor("hash", self.vendor_index.hashes.get(digest.hexdigest())):
             return None
 
+        credentials = creds.results()
+        named = {value for _, value, _ in credentials}
+
+        return {
+            "script_url": script_url,
+            "emails": list(emails),
+            "urls": list(urls),
+            "credentials": credentials,
+            "secrets": [item for value, item in secrets.items() if value not in named],
+        }
+
+    def parse_many(self, script_urls, base_domain: str, limit: int = None) -> list:
+        """
+        Descarga y analiza varios scripts en paralelo (como mucho
+        self.concurrency a la vez).
+
+        Cada URL se procesa una sola vez aunque aparezca repetida; las
+        externas se descartan sin descargarlas. limit acota los scripts
+        analizados con éxito: si alguno falla, se completa con los
+        siguientes. Las librerías conocidas (vendor_index) tampoco
+        cuentan. Devuelve los resultados de parse() en el orden de entrada.
+        """
+        pending = [
+            url for url in dict.fromkeys(script_urls)
+            if not self._is_external(url, base_domain) and not self._is_vendor_url(url)
+        ]
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while pending:
+                budget = len(pending) if limit is None else limit - len(results)
+                if budget <= 0:
+                    break
+
+                batch, pending = pending[:budget], pending[budget:]
+
+                for parsed in executor.map(self.parse, batch, [base_domain] * len(batch)):
+                    if parsed:
+                        results.append(parsed)
+
+        return results
@@ -0,0 +1,144 @@
+import codecs
+import json
+import re
+
+# Un token JSON (tras espacios): puntuación, string o escalar
+TOKEN_REGEX = re.compile(
+    r'[ \t\r\n]*(?:([{}\[\],:])|"([^"\\]*(?:\\.[^"\\]*)*)"|([^\s{}\[\],:"]+))',
+    re.DOTALL
+)
+
+# Eventos
+START_MAP = "start_map"
+END_MAP = "end_map"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+KEY = "key"
+STRING = "string"
+SCALAR = "scalar"
+
+PUNCTUATION_EVENTS = {
+    "{": START_MAP,
+    "}": END_MAP,
+    "[": START_ARRAY,
+    "]": END_ARRAY,
+}
+
+
+def decode_string(raw: str) -> str:
+    """
+    Contenido de un string JSON tal como aparece en el texto
+    (sin comillas) -> valor.
+    """
+    if "\\" not in raw:
+        return raw
+
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def closing_quote(buffer: str, start: int) -> int:
+    """
+    Posición de la primera comilla sin escapar a partir de start (-1 si
+    no hay). Las barras anteriores pueden quedar antes de start.
+    """
+    i = buffer.find('"', start)
+
+    while i >= 0:
+        j = i
+        while j > 0 and buffer[j - 1] == "\\":
+            j -= 1
+
+        if (i - j) % 2 == 0:
+            return i
+
+        i = buffer.find('"', i + 1)
+
+    return -1
+
+
+def iter_events(chunks):
+    """
+    Tokenizador JSON incremental.
+
+    chunks: iterable de str o bytes (UTF-8), p.ej. un cuerpo HTTP leído
+    por bloques. Devuelve (evento, valor, profundidad) sin construir el
+    árbol: la memoria depende del token más largo, no del documento.
+
+    Los strings se devuelven sin decodificar (ver decode_string) para
+    no pagar la decodificación de lo que no interesa.
+    Es tolerante: no valida la gramática, solo separa tokens.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    match = TOKEN_REGEX.match
+
+    buffer = ""
+    pending = None  # string sin cerrar: posición desde la que buscar su cierre
+    stack = []  # True = objeto, False = array
+    expect_key = False
+    final = False
+    chunks = iter(chunks)
+
+    while not final:
+        chunk = next(chunks, None)
+
+        if chunk is None:
+            final = True
+            chunk = decoder.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+
+        buffer += chunk
+        end = len(buffer)
+        pos = 0
+
+        # String largo repartido en bloques: solo se mira el texto nuevo,
+        # sin volver a recorrerlo desde el principio en cada bloque
+        if pending is not None and not final:
+            if closing_quote(buffer, pending) < 0:
+                pending = end
+                continue
+        pending = None
+
+        while True:
+            m = match(buffer, pos)
+
+            # Sin token completo, o escalar que podría seguir en el
+            # siguiente bloque: se espera a tener más texto
+            if not m or (not final and m.end() == end and m.group(3) is not None):
+                if not m and buffer[pos:].lstrip(" \t\r\n").startswith('"'):
+                    pending = end - pos
+                break
+
+            pos = m.end()
+            punct, string, scalar = m.groups()
+
+            if string is not None:
+                if expect_key:
+                    expect_key = False
+                    yield KEY, string, len(stack)
+                else:
+                    yield STRING, string, len(stack)
+
+            elif scalar is not None:
+                yield SCALAR, scalar, len(stack)
+
+            elif punct == ",":
+                expect_key = bool(stack) and stack[-1]
+
+            elif punct == "{" or punct == "[":
+                yield PUNCTUATION_EVENTS[punct], None, len(stack)
+                expect_key = punct == "{"
+                stack.append(expect_key)
+
+            elif punct == "}" or punct == "]":
+                if stack:
+                    stack.pop()
+                expect_key = False
+                yield PUNCTUATION_EVENTS[punct], None, len(stack)
+
+            # ":" no genera evento
+
+        buffer = buffer[pos:]
@@ -1,41 +1,146 @@
+import json
+import re
+from collections import Counter
+
 import requests
 from .base import PassiveCollector
 import core.constants as C
+from core.http_client import HttpClient
+
+# Entre entradas del array: espacios, comas y corchetes
+SEPARATORS_REGEX = re.compile(r"[\s,\[\]]*")
+ENTRY_DECODER = json.JSONDecoder()
+
+
+# Ninguna entrada de crt.sh se acerca a esto: si el buffer lo supera
+# sin decodificar nada, el cuerpo no es el JSON esperado
+MAX_ENTRY_CHARS = 1024 * 1024
+
+
+def iter_certificates(chunks):
+    """
+    (id, name_value) de cada entrada del JSON de crt.sh (un array de
+    objetos planos), leído en streaming: cada objeto se decodifica en
+    cuanto llega completo y la memoria depende de la entrada más larga,
+    no de la respuesta.
+
+    ValueError si el cuerpo no es un array de objetos o termina a medias
+    (p.ej. una página de error con estado 200). Se detecta en cuanto
+    aparece, sin acumular el resto del cuerpo.
+    """
+    decode = ENTRY_DECODER.raw_decode
+    skip = SEPARATORS_REGEX.match
+    buffer = ""
+    started = False
+
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+
+        if not started:
+            stripped = buffer.lstrip()
+            if not stripped:
+                buffer = ""
+                continue
+            if stripped[0] != "[":
+                raise ValueError("la respuesta no es un array JSON")
+            started = True
+
+        while True:
+            pos = skip(buffer, pos).end()
+
+            if pos < len(buffer) and buffer[pos] != "{":
+                raise ValueError(f"carácter inesperado {buffer[pos]!r}")
+
+            try:
+                entry, pos = decode(buffer, pos)
+            except ValueError:
+                break  # objeto incompleto: sigue en el siguiente bloque
+
+            yield entry.get("id"), entry.get("name_value")
+
+        buffer = buffer[pos:]
+
+        if len(buffer) > MAX_ENTRY_CHARS:
+            raise ValueError("entrada sin cerrar demasiado larga")
+
+    # Fin limpio: solo separadores después de la última entrada
+    if not started or buffer:
+        raise ValueError("JSON incompleto")
+
 
 class SubdomainCollector(PassiveCollector):
+    """
+    Subdominios desde los certificados de crt.sh.
+
+    La respuesta se procesa en streaming (no se carga el JSON entero) y
+    los name_value repetidos se descartan según llegan.
 
-    def __init__(self, timeout : int = 8):
+    cache (opcional): SubdomainCache. Los certificados ya vistos en otras
+    ejecuciones no se vuelven a analizar, los nombres anteriores se
+    conservan aunque crt.sh falle o corte la respuesta, y si la última
+    descarga completa tiene menos de refresh_after segundos no se
+    descarga nada.
+    """
+
+    name = "subdomains"
+
+    def __init__(self, timeout : int = None, client=None, cache=None, refresh_after: int = None):
         self.timeout = timeout
+        self.client = client or HttpClient()
+        self.cache = cache
+        self.refresh_after = refresh_after
+
+        # certs / known_certs / new_names / cached_names / from_cache
+        self.stats = Counter()
 
     def collect(self, target: str):
-        results = []
+        previous = set()
+        known = set()
+
+        if self.cache:
+            previous = self.cache.names(target)
+            known = self.cache.known_certs(target)
+            self.stats["cached_names"] = len(previous)
+
+            age = self.cache.age(target)
+            if self.refresh_after and age is not None and age < self.refresh_after:
+                self.stats["from_cache"] += 1
+                return self._results(previous)
+
+        new_certs = set()
+        new_names = set()
+        seen_values = set()
+        complete = False
 
         try:
             url = f"https://crt.sh/?q=%25.{target}&output=json"
-            headers = {"User-Agent": "EREBUS/1.0"}
-            response = requests.get(url, headers=headers, timeout=self.timeout)
 
-            if response.status_code != 200:
-                return results
+            with self.client.stream(url, self.name, timeout=self.timeout) as response:
+                if response.status_code != 200:
+                    return self._results(previous)
 
-            data = response.json()
+                for cert_id, name_value in iter_certificates(response.iter_chunks()):
+                    self.stats["certs"] += 1
 
-            subdomains = set()
+                    if cert_id in known:
+                        self.stats["known_certs"] += 1
+                        continue
 
-            for entry in data:
-                name_value = entry.get("name_value", "")
-                for domain in name_value.split("\n"):
-                    domain = domain.strip().lower()
-                    if domain.endswith(target) and not domain.startswith("*."):
-                        subdomains.add(domain)
+                    if cert_id is not None:
+                        new_certs.add(cert_id)
 
-            for sub in sorted(subdomains):
-                results.append({
-                    "value": sub,
-                    "source": C.TECHNIQUE_SUBDOMAINS
-                })
+                    # Muchos certificados repiten el mismo name_value
+                    if not isinstance(name_value, str) or name_value in seen_values:
+                        continue
+                    seen_values.add(name_value)
 
+                    for domain in name_value.split("\n"):
+                        domain = domain.strip().lower()
+                        if domain.endswith(target) and not domain.startswith("*."):
+                            new_names.add(domain)
 
+                complete = not response.truncated
 
         except requests.RequestException as e:
 
@@ -43,6 +148,24 @@ class SubdomainCollector(PassiveCollector):
 
         except ValueError as e:
 
+            # Lo leído hasta el error se conserva, pero no cuenta como refresco
             print("Error parseando JSON de crt.sh:", e)
 
-        return results
+        new_names -= previous
+        self.stats["new_names"] += len(new_names)
+
+        if self.cache:
+            # Lo leído antes de un corte también se guarda
+            self.cache.merge(target, new_certs, new_names, complete)
+
+        return self._results(previous | new_names)
+
+    @staticmethod
+    def _results(subdomains):
+        return [
+            {
+                "value": sub,
+                "source": C.TECHNIQUE_SUBDOMAINS
+            }
+            for sub in sorted(subdomains)
+        ]
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Fichero de huellas del usuario (opcional). Formato:
+# {
+#     "patterns": {"mi-lib": "mi-lib(?:\\.min)?\\.js$"},
+#     "hosts": ["cdn.proveedor.com"],
+#     "hashes": {"<sha256 del contenido>": "jquery-3.7.1"}
+# }
+DEFAULT_PATH = Path(__file__).resolve().parent.parent.parent / "storage" / "vendor_fingerprints.json"
+
+
+# Librerías conocidas: nombre -> patrón sobre la ruta de la URL (minúsculas)
+VENDOR_PATTERNS = {
+    "jquery": r"(?:^|/)jquery(?:[.-]?(?:ui|migrate))?(?:[.-]\d+(?:\.\d+)*)?(?:\.slim)?(?:\.min)?\.js$",
+    "bootstrap": r"(?:^|/)bootstrap(?:\.bundle)?(?:[.-]\d+(?:\.\d+)*)?(?:\.min)?\.js$",
+    "popper": r"(?:^|/)popper(?:\.min)?\.js$",
+    "react": r"(?:^|/)react(?:-dom)?\.(?:production|development)(?:\.min)?\.js$",
+    "vue": r"(?:^|/)vue(?:\.runtime)?(?:\.global)?(?:\.prod)?(?:\.min)?\.js$",
+    "angular": r"(?:^|/)angular(?:-[a-z]+)?(?:\.min)?\.js$",
+    "lodash": r"(?:^|/)(?:lodash|underscore)(?:\.core)?(?:\.min)?\.js$",
+    "moment": r"(?:^|/)moment(?:-with-locales)?(?:\.min)?\.js$",
+    "fontawesome": r"(?:^|/)fontawesome(?:-all)?(?:\.min)?\.js$|/fontawesome[\w-]*/",
+    "swiper": r"(?:^|/)swiper(?:-bundle)?(?:\.min)?\.js$",
+    "slick": r"(?:^|/)slick(?:\.min)?\.js$",
+    "modernizr": r"(?:^|/)modernizr(?:[.-][\w.]+)?\.js$",
+    "polyfills": r"(?:^|/)(?:polyfills?|core-js)(?:[.-][\w]+)?(?:\.min)?\.js$",
+    "wordpress": r"/wp-includes/js/",
+    "analytics": r"(?:^|/)(?:analytics|ga|gtag|gtm|fbevents|hotjar-[\w.]+|matomo|piwik)\.js$",
+    "recaptcha": r"/recaptcha/",
+}
+
+# Hosts de terceros (CDN, analítica): todo lo que sirven es de proveedor
+VENDOR_HOSTS = {
+    "code.jquery.com", "cdnjs.cloudflare.com", "cdn.jsdelivr.net", "unpkg.com",
+    "ajax.googleapis.com", "stackpath.bootstrapcdn.com", "maxcdn.bootstrapcdn.com",
+    "www.googletagmanager.com", "www.google-analytics.com", "connect.facebook.net",
+    "static.hotjar.com", "www.gstatic.com", "www.google.com",
+}
+
+
+def fingerprint(content: str) -> str:
+    """
+    Huella de un script (sha256 del contenido en UTF-8), la que se
+    escribe en "hashes" del fichero de huellas.
+    """
+    return hashlib.sha256(content.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class VendorIndex:
+    """
+    Índice local de librerías JS conocidas (jquery, bootstrap, analítica,
+    runtimes de frameworks...). Nunca contienen emails ni credenciales del
+    objetivo, así que JSParser las descarta:
+
+    - match_url(): por host / nombre de fichero, antes de descargar.
+    - match_content(): por hash del contenido, antes de analizar.
+
+    Se amplía con el fichero JSON de DEFAULT_PATH (o el que se indique).
+    """
+
+    def __init__(self, path=None, patterns=None, hashes=None):
+        patterns = dict(VENDOR_PATTERNS if patterns is None else patterns)
+        hashes = dict(hashes or {})
+        self.hosts = set(VENDOR_HOSTS)
+
+        path = DEFAULT_PATH if path is None else Path(path)
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                patterns.update(data.get("patterns", {}))
+                self.hosts.update(h.lower() for h in data.get("hosts", []))
+                hashes.update({h.lower(): name for h, name in data.get("hashes", {}).items()})
+            except (OSError, ValueError) as e:
+                print(f"[JS] Fichero de huellas ignorado ({path}): {e}")
+
+        # Un patrón inválido del fichero se descarta sin perder el resto
+        for name, pattern in list(patterns.items()):
+            try:
+                re.compile(pattern)
+            except (re.error, TypeError) as e:
+                print(f"[JS] Patrón de huella ignorado ({name}): {e}")
+                del patterns[name]
+
+        self.hashes = hashes
+        self.names = list(patterns)
+
+        # Un único regex con un grupo por librería
+        self.regex = re.compile("|".join(
+            f"(?P<v{i}>{pattern})" for i, pattern in enumerate(patterns.values())
+        )) if patterns else None
+
+    def match_url(self, url: str):
+        """
+        Nombre de la librería o None.
+        """
+        parsed = urlparse(url)
+
+        if parsed.netloc.lower() in self.hosts:
+            return parsed.netloc.lower()
+
+        if self.regex is None:
+            return None
+
+        m = self.regex.search(parsed.path.lower())
+        if not m:
+            return None
+
+        return self.names[int(m.lastgroup[1:])]
+
+    def match_content(self, content: str):
+        if not self.hashes:
+            return None
+        return self.hashes.get(fingerprint(content))
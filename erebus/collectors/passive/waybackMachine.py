@@ -1,5 +1,6 @@
 import requests
 from urllib.parse import urlparse
+from core.http_client import HttpClient
 
 
 class WaybackCollector:
@@ -13,9 +14,10 @@ class WaybackCollector:
         ".zip", ".rar", ".7z"
     )
 
-    def __init__(self, timeout=10, limit=500):
+    def __init__(self, timeout=None, limit=500, client=None):
         self.timeout = timeout
         self.limit = limit
+        self.client = client or HttpClient()
 
     def _is_valid_html_url(self, url: str) -> bool:
         """
@@ -57,11 +59,11 @@ class WaybackCollector:
         }
 
         try:
-            r = requests.get(
+            r = self.client.get(
                 self.CDX_URL,
+                self.name,
                 params=params,
-                timeout=self.timeout,
-                headers={"User-Agent": "EREBUS/1.0"}
+                timeout=self.timeout
             )
 
             if r.status_code in [502,503,504] :
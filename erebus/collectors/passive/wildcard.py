@@ -0,0 +1,110 @@
+import random
+import string
+
+# Etiquetas que suelen ser hosts con superficie propia: suben en el ranking
+INTERESTING_LABELS = (
+    "api", "admin", "auth", "login", "sso", "portal", "intranet", "vpn",
+    "mail", "webmail", "dev", "staging", "stage", "test", "qa", "uat",
+    "beta", "internal", "git", "jenkins", "jira", "confluence", "grafana",
+    "kibana", "backup", "db", "ftp", "remote", "owa", "support", "shop",
+)
+
+LABEL_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def parent_zone(domain: str, target: str):
+    """
+    Zona padre de un subdominio del objetivo (a.b.example.com -> b.example.com).
+    None para el propio objetivo o nombres fuera de él.
+    """
+    if domain == target or not domain.endswith("." + target):
+        return None
+    return domain.split(".", 1)[1]
+
+
+def rank_key(domain: str, target: str):
+    """
+    Orden de prioridad: el objetivo, luego nombres con etiquetas
+    interesantes, luego los menos profundos.
+    """
+    labels = domain[:-len(target)].rstrip(".").split(".") if domain != target else []
+    hits = sum(any(word in label for word in INTERESTING_LABELS) for label in labels)
+    return (domain != target, -hits, len(labels), domain)
+
+
+class WildcardFilter:
+    """
+    Detección de registros DNS comodín (*.zona) antes de resolver y
+    crawlear los subdominios de crt.sh.
+
+    1. Por cada zona padre se resuelven `probes` etiquetas aleatorias: si
+       todas responden, la zona tiene comodín y sus IPs son las de las
+       sondas.
+    2. Los nombres bajo una zona comodín se resuelven (A) y los que
+       devuelven las mismas IPs que el comodín se colapsan en uno solo
+       (el mejor del ranking); los que tienen IPs propias son hosts reales.
+    3. El resto se ordena con rank_key.
+
+    dns_collector: DNSCollector (sondas y resoluciones en un solo lote
+    concurrente cada una, a través de su caché).
+    """
+
+    def __init__(self, dns_collector, probes: int = 2, seed=None):
+        self.dns_collector = dns_collector
+        self.probes = max(1, probes)
+        self.rng = random.Random(seed)
+
+    def _label(self):
+        return "".join(self.rng.choices(LABEL_ALPHABET, k=16))
+
+    def detect(self, domains, target: str) -> dict:
+        """
+        {zona: frozenset(IPs del comodín)} de las zonas con comodín.
+        """
+        zones = {parent_zone(d, target) for d in domains} - {None}
+        probes = {
+            zone: [f"{self._label()}.{zone}" for _ in range(self.probes)]
+            for zone in sorted(zones)
+        }
+
+        answers = self.dns_collector.collect_many([n for names in probes.values() for n in names])
+
+        wildcards = {}
+        for zone, names in probes.items():
+            results = [answers[n] for n in names]
+            if all(results):
+                wildcards[zone] = frozenset(r["ip"] for result in results for r in result)
+
+        return wildcards
+
+    def prune(self, domains, target: str):
+        """
+        (distintos ordenados, colapsados {nombre: representante}, comodines).
+        """
+        domains = sorted(set(domains), key=lambda d: rank_key(d, target))
+        wildcards = self.detect(domains, target)
+
+        covered = [d for d in domains if parent_zone(d, target) in wildcards]
+        answers = self.dns_collector.collect_many(covered) if covered else {}
+
+        distinct = []
+        collapsed = {}
+        representatives = {}  # (zona, IPs) -> nombre que se conserva
+
+        for domain in domains:
+            zone = parent_zone(domain, target)
+
+            if zone in wildcards:
+                ips = frozenset(r["ip"] for r in answers[domain])
+
+                # Mismas IPs que el comodín: no es un host propio
+                if ips and ips <= wildcards[zone]:
+                    group = (zone, wildcards[zone])
+                    if group in representatives:
+                        collapsed[domain] = representatives[group]
+                        continue
+                    representatives[group] = domain
+
+            distinct.append(domain)
+
+        return distinct, collapsed, wildcards
@@ -18,11 +18,117 @@ APP_CONFIG = {
     },
 
     "limits": {
-        "max_dns": 20,
+        "max_dns": 5000,
         "max_pages": 300,
         "max_scripts": 15
     },
 
+    "crawler": {
+        "async": True,  # motor asyncio (N peticiones en vuelo)
+        "concurrency": 16,  # peticiones simultáneas (global)
+        "per_host": 4,  # peticiones simultáneas por host
+        "html_parser": "stdlib",  # extractor HTML: "stdlib" (html.parser, mismo texto que antes) | "lxml" (opcional, más rápido)
+        "priority": "keywords",  # orden de la frontera: "bfs" | "keywords" (/contact, /about, /team...)
+        "checkpoint_every": 25,  # páginas entre checkpoints (reanudación tras fallo)
+    },
+
+    "extraction": {
+        "enabled": True,  # parsing HTML / regex / credenciales en un pool de procesos
+        "workers": 0,  # procesos del pool (0 = uno por núcleo)
+        "cache": True,  # no volver a analizar cuerpos idénticos (hash del contenido)
+        "cache_entries": 4096,  # resultados en memoria (LRU)
+        "cache_persistent": True,  # además en disco (storage/extraction_cache.db), entre ejecuciones
+    },
+
+    "scraping": {
+        "concurrency": 4,  # páginas renderizándose a la vez (un solo Chromium por ejecución)
+        "context_reuse": 20,  # páginas por contexto de navegador antes de recrearlo
+
+        # Triaje estático: solo se renderizan las páginas cuyo HTML indica que
+        # necesitan JS (div raíz vacío, poco texto, frameworks, fetch/XHR...)
+        "triage": {
+            "enabled": True,
+            "threshold": 0.4,  # puntuación mínima (0..1) para renderizar
+            "max_renders": 50,  # presupuesto de renderizados (None = sin límite)
+            "audit_sample": 3,  # páginas descartadas que se renderizan igualmente para medir pérdidas
+        },
+
+        # Perfil de renderizado: qué no se descarga y cuándo la página está lista
+        "render": {
+            "block_types": ["image", "font", "stylesheet", "media", "texttrack", "eventsource", "manifest"],
+            "block_trackers": True,  # analítica / publicidad (render_profile.TRACKER_DOMAINS)
+            "block_third_party": True,  # otros dominios, salvo documentos, scripts y XHR/fetch
+            "wait": "dom_quiet",  # "dom_quiet" | "domcontentloaded" | "load" | "networkidle" (anterior)
+            "quiet_ms": 500,  # dom_quiet: ms sin cambios en el DOM
+            "max_inflight": 2,  # dom_quiet: peticiones en vuelo admitidas al dar la página por lista
+        },
+        # Credenciales en respuestas JSON (XHR) capturadas por el scraper
+        "json_keys": {
+            "user": ["user", "username", "login"],
+            "password": ["password", "pwd", "pass"],
+            "token": ["apikey", "api_key", "token", "secret"],
+        },
+        "json_max_depth": 64,  # niveles de anidamiento recorridos
+        "json_stream_bytes": 1024 * 1024,  # Content-Length a partir del cual se vuelve a pedir y se recorre en streaming
+    },
+
+    "subdomains": {
+        "cache": True,  # certificados y nombres de crt.sh acumulados (storage/subdomain_cache.db)
+        "refresh_after": 24 * 3600,  # segundos: antes de esto se usan los nombres guardados sin descargar
+    },
+
+    "dns": {
+        "concurrency": 100,  # dominios resolviéndose a la vez (cada uno con todos sus tipos en paralelo)
+        "record_types": ["A", "AAAA", "CNAME", "MX", "TXT"],  # todos los tipos se piden a la vez (cadenas CNAME seguidas)
+        "cache": True,  # respuestas y NXDOMAIN en disco (storage/dns_cache.db) según su TTL
+        "negative_ttl": 300,  # TTL de NXDOMAIN / sin respuesta cuando no viene SOA
+        "max_ttl": 24 * 3600,  # tope al TTL de cualquier respuesta guardada
+        "wildcard_filter": True,  # detectar *.zona y colapsar los nombres que solo responden con el comodín
+        "wildcard_probes": 2,  # etiquetas aleatorias resueltas por zona padre
+    },
+
+    "js": {
+        "concurrency": 8,  # scripts descargados a la vez en la fase de parsing JS
+        "skip_vendor": True,  # no descargar / analizar librerías conocidas (jquery, bootstrap, analítica...)
+        "vendor_fingerprints": None,  # JSON de huellas propias (None = storage/vendor_fingerprints.json)
+        # Análisis por ventanas sin cargar el script entero (0 = desactivado).
+        # Los scripts analizados así no pasan por la caché HTTP
+        "stream_window": 0,  # caracteres por ventana, p.ej. 1024 * 1024
+        "stream_overlap": 8 * 1024,  # solape entre ventanas
+    },
+
+    "entropy": {
+        "enabled": True,  # secretos sin nombre de variable (cadenas de alta entropía) en JS
+        "min_length": 20,  # longitud mínima del literal
+        "min_entropy": 3.5,  # bits por carácter (Shannon)
+        "min_confidence": 0.5,  # puntuación mínima 0..1 para guardarlo
+    },
+
+    "http": {
+        "pool_connections": 32,  # hosts distintos con pool propio
+        "pool_maxsize": 16,  # conexiones keep-alive por host
+
+        # Tamaño máximo de cuerpo descargado por collector (bytes); el resto se corta
+        "max_body_bytes": {
+            "crawler": 5 * 1024 * 1024,
+            "emails": 5 * 1024 * 1024,
+            "js": 10 * 1024 * 1024,
+        },
+    },
+
+    "cache": {
+        "enabled": True,  # caché HTTP persistente (storage/http_cache)
+        "max_mb": 256,  # tamaño máximo en disco (expulsión LRU)
+
+        # TTL por fuente (segundos). Pasado el TTL se revalida con GET condicional
+        "ttl": {
+            "crawler": 6 * 3600,
+            "emails": 6 * 3600,
+            "js": 24 * 3600,
+            "wayback": 7 * 24 * 3600,
+        },
+    },
+
     "timeouts": {
 
         # -------------------------
@@ -30,7 +136,7 @@ APP_CONFIG = {
         # -------------------------
         "http_crawler_page": 300,  # Crawler HTML (requests.get)
         "http_email_passive": 20,  # EmailCollector (HTML pasivo)
-        "http_subdomains": 25,  # crt.sh
+        "http_subdomains": 25,  # crt.sh (en streaming: espera máxima entre bloques, no total)
 
         # -------------------------
         # DNS
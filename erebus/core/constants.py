@@ -5,6 +5,7 @@
 DOMAIN_STATUS_NOT_EVALUATED = "not_evaluated"
 DOMAIN_STATUS_RESOLVABLE = "resolvable"
 DOMAIN_STATUS_NOT_RESOLVABLE = "not_resolvable"
+DOMAIN_STATUS_WILDCARD = "wildcard"  # responde con las IPs del comodín de su zona
 
 # ---------------------------------------------
 # Techniques
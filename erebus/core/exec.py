@@ -5,8 +5,9 @@ import core.constants as C
 
 
 class Execution:
-    def __init__(self, target: str):
-        self.ID = str(uuid.uuid4())
+    def __init__(self, target: str, execution_id: str = None):
+        # execution_id: reanudar una ejecución existente
+        self.ID = execution_id or str(uuid.uuid4())
         self.TARGET = target
 
         self.START = datetime.now(timezone.utc)
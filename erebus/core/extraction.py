@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from collectors.passive.html_extractor import extract
+from collectors.passive.credential_parser import CredentialParser
+from collectors.active.triage import render_score
+from normalizers.email_normalizer import normalize_obfuscated
+import core.constants as C
+
+_cred_parser = CredentialParser()
+
+
+# ---------------------------------------------
+# Trabajo CPU (se ejecuta en los procesos del pool)
+# ---------------------------------------------
+
+def extract_page(html: str, html_parser: str = "stdlib", triage: bool = False) -> dict:
+    """
+    Parsing + emails + credenciales de una página HTML.
+    Devuelve solo resultados compactos (sin el HTML).
+    triage: añade render_score (solo páginas live con triaje de scraping).
+    """
+    extracted = extract(html, html_parser)
+
+    emails = normalize_obfuscated(extracted["text"])
+    emails |= normalize_obfuscated(html)
+
+    result = {
+        "emails": list(emails),
+        "links": extracted["links"],
+        "scripts": extracted["scripts"],
+        "credentials": _cred_parser.parse(html, source=C.SOURCE_HTML),
+    }
+
+    if triage:
+        # ¿Merece la pena renderizarla en el navegador? (scraping)
+        result["render_score"] = render_score(html, extracted["text"], extracted["scripts"])["score"]
+
+    return result
+
+
+# ---------------------------------------------
+# Memoización por contenido (storage.extraction_cache)
+# ---------------------------------------------
+
+def page_kind(html_parser: str, triage: bool = False) -> str:
+    return f"page:{html_parser}:triage" if triage else f"page:{html_parser}"
+
+
+def extract_page_cached(html: str, html_parser: str = "stdlib", cache=None, triage: bool = False) -> dict:
+    if cache is None:
+        return extract_page(html, html_parser, triage)
+
+    return cache.memoize(
+        page_kind(html_parser, triage), html, partial(extract_page, html_parser=html_parser, triage=triage)
+    )
+
+
+def find_emails(text: str, cache=None) -> list:
+    if cache is None:
+        return list(normalize_obfuscated(text))
+
+    return cache.memoize("emails", text, lambda t: sorted(normalize_obfuscated(t)))
+
+
+def find_credentials(text: str, source: str, cache=None) -> list:
+    if cache is None:
+        return _cred_parser.parse(text, source=source)
+
+    creds = cache.memoize(f"credentials:{source}", text, partial(_cred_parser.parse, source=source))
+    return [tuple(c) for c in creds]
+
+
+def find_entropy_credentials(text: str, source: str, cache=None, parser=None, exclude=()) -> list:
+    """
+    Secretos de alta entropía: [(tipo, valor, source, confianza)].
+    """
+    parser = parser or _cred_parser
+
+    def compute(t):
+        return parser.parse_entropy(t, source=source, exclude=exclude)
+
+    if cache is None:
+        return compute(text)
+
+    # Los umbrales y lo excluido forman parte de la clave
+    kind = (
+        f"entropy:{source}:{parser.entropy_min_length}:"
+        f"{parser.entropy_min_bits}:{parser.entropy_min_confidence}:"
+        + ",".join(sorted(exclude))
+    )
+    return [tuple(c) for c in cache.memoize(kind, text, compute)]
+
+
+class ExtractionPool:
+    """
+    Pool de procesos para la extracción (BeautifulSoup / regex / decodificación),
+    fuera del GIL del proceso principal.
+
+    workers <= 0 -> un proceso por núcleo.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
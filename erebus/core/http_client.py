@@ -0,0 +1,213 @@
+import codecs
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpClient:
+    """
+    Cliente HTTP único para todos los collectors.
+
+    - Una requests.Session con pool de conexiones keep-alive por host.
+    - User-Agent y timeouts centralizados (cfg["timeouts"]).
+    - Caché HTTP opcional (storage.http_cache.HttpCache).
+    - Descarga en streaming: cabeceras primero, corte inmediato si el
+      Content-Type no interesa y límite de bytes por collector.
+    - Contadores de peticiones y bytes por collector.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    USER_AGENT = "EREBUS/1.0"
+
+    # collector -> clave(s) de cfg["timeouts"]
+    TIMEOUT_KEYS = {
+        "crawler": "http_crawler_page",
+        "emails": "http_email_passive",
+        "subdomains": "http_subdomains",
+        "js": ("js_connect", "js_read"),
+        "wayback": "wayback_timeout",
+    }
+
+    def __init__(self, timeouts=None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 cache=None, user_agent: str = USER_AGENT, default_timeout: int = 8,
+                 max_body_bytes=None):
+        self.timeouts = timeouts or {}
+        self.max_body_bytes = max_body_bytes or {}
+        self.default_timeout = default_timeout
+        self.cache = cache
+        self.user_agent = user_agent
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+        # pool_connections: hosts con pool propio / pool_maxsize: conexiones por host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    # -------------------------------------------------
+    # Timeouts
+    # -------------------------------------------------
+
+    def timeout_for(self, collector: str):
+        key = self.TIMEOUT_KEYS.get(collector)
+
+        if isinstance(key, tuple):
+            return tuple(self.timeouts.get(k, self.default_timeout) for k in key)
+
+        return self.timeouts.get(key, self.default_timeout)
+
+    # -------------------------------------------------
+    # Peticiones
+    # -------------------------------------------------
+
+    def get(self, url: str, collector: str, timeout=None, accept=None, **kwargs):
+        """
+        GET acotado.
+        accept: fragmentos de Content-Type admitidos (p.ej. ("text/html",)).
+        Si no coincide, la respuesta vuelve con cuerpo vacío y skipped=True.
+        Si el cuerpo supera max_body_bytes[collector], se corta y truncated=True.
+        """
+        if timeout is None:
+            timeout = self.timeout_for(collector)
+
+        fetch = partial(
+            self._fetch,
+            max_bytes=self.max_body_bytes.get(collector),
+            accept=accept
+        )
+
+        if self.cache:
+            response = self.cache.get(
+                url,
+                collector,
+                fetch=fetch,
+                timeout=timeout,
+                **kwargs
+            )
+        else:
+            response = fetch(url, timeout=timeout, **kwargs)
+
+        self._count(collector, response)
+        return response
+
+    @contextmanager
+    def stream(self, url: str, collector: str, timeout=None, **kwargs):
+        """
+        GET sin cargar el cuerpo en memoria:
+
+            with client.stream(url, "js") as response:
+                for text in response.iter_chunks():
+                    ...
+
+        iter_chunks() devuelve el cuerpo decodificado por bloques de
+        CHUNK_SIZE bytes, cortando en max_bytes[collector]. No pasa por
+        la caché HTTP (el cuerpo no llega a existir entero).
+        """
+        if timeout is None:
+            timeout = self.timeout_for(collector)
+
+        max_bytes = self.max_body_bytes.get(collector)
+        response = self.session.get(url, stream=True, timeout=timeout, **kwargs)
+
+        response.skipped = False
+        response.truncated = False
+        response.streamed_bytes = 0
+
+        def iter_chunks():
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+
+            for chunk in response.iter_content(self.CHUNK_SIZE):
+                if max_bytes and response.streamed_bytes + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - response.streamed_bytes]
+                    response.truncated = True
+
+                response.streamed_bytes += len(chunk)
+                yield decoder.decode(chunk)
+
+                if response.truncated:
+                    break
+
+            yield decoder.decode(b"", final=True)
+
+        response.iter_chunks = iter_chunks
+
+        try:
+            yield response
+        finally:
+            response.close()
+            self._count(collector, response)
+
+    def _fetch(self, url, max_bytes=None, accept=None, **kwargs):
+        response = self.session.get(url, stream=True, **kwargs)
+
+        response.skipped = False
+        response.truncated = False
+
+        try:
+            content_type = response.headers.get("Content-Type", "").lower()
+
+            # Cabeceras primero: lo que no se va a parsear no se descarga
+            if accept and response.status_code == 200 and not any(a in content_type for a in accept):
+                response.skipped = True
+                response._content = b""
+                return response
+
+            chunks = []
+            size = 0
+
+            for chunk in response.iter_content(self.CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+
+                if max_bytes and size > max_bytes:
+                    response.truncated = True
+                    break
+
+            content = b"".join(chunks)
+            response._content = content[:max_bytes] if max_bytes else content
+
+        finally:
+            response._content_consumed = True
+            response.close()
+
+        return response
+
+    def _count(self, collector, response):
+        with self.lock:
+            stats = self.stats.setdefault(
+                collector,
+                {
+                    "requests": 0, "bytes": 0, "cache_hits": 0,
+                    "not_modified": 0, "skipped": 0, "truncated": 0
+                }
+            )
+
+            if getattr(response, "skipped", False):
+                stats["skipped"] += 1
+            if getattr(response, "truncated", False):
+                stats["truncated"] += 1
+
+            if getattr(response, "revalidated", False):
+                stats["requests"] += 1
+                stats["not_modified"] += 1
+            elif getattr(response, "from_cache", False):
+                stats["cache_hits"] += 1
+            elif hasattr(response, "streamed_bytes"):
+                stats["requests"] += 1
+                stats["bytes"] += response.streamed_bytes
+            else:
+                stats["requests"] += 1
+                stats["bytes"] += len(response.content)
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
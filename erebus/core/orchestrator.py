@@ -1,16 +1,31 @@
+import time
+from collections import Counter
 from urllib.parse import urlparse
 
-from collectors.passive.dns import DNSCollector
+from collectors.passive.dns import DNSCollector, RECORD_TYPES
+from collectors.passive.wildcard import WildcardFilter, rank_key
 from collectors.passive.subdomains import SubdomainCollector
 from collectors.passive.whoisCollector import WhoisCollector
 from collectors.passive.emails import EmailCollector
-from collectors.passive.crawler import Crawler
+from collectors.passive.crawler import Crawler, CrawlCheckpoint
+from collectors.passive.frontier import PRIORITIES
+from collectors.passive.html_extractor import available_backend
 from collectors.passive.js_parser import JSParser
-from collectors.passive.credential_parser import CredentialParser
+from collectors.passive.vendor_index import VendorIndex
+from collectors.passive.credential_parser import CredentialParser, ENTROPY_TYPE
 from collectors.active.scraper import Scraper
+from collectors.active.browser_pool import BrowserPool
+from collectors.active.render_profile import RenderProfile
+from collectors.active.triage import select_pages
 from normalizers.email_normalizer import normalize_email
 
 from collectors.passive.waybackMachine import WaybackCollector
+from storage.http_cache import HttpCache
+from core.http_client import HttpClient
+from core.extraction import ExtractionPool
+from storage.dns_cache import DnsCache
+from storage.subdomain_cache import SubdomainCache
+from storage.extraction_cache import ExtractionCache
 
 import core.constants as C
 
@@ -67,51 +82,184 @@ class Orchestrator:
             raise ValueError(
                 "Configuración inválida: se esperaban las claves 'modules' y 'limits'"
             )
+
+        priority = cfg.get("crawler", {}).get("priority", "bfs")
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Configuración inválida: crawler.priority '{priority}' desconocida "
+                f"(válidas: {', '.join(PRIORITIES)})"
+            )
     def _init_collectors(self, cfg):
 
         # -------------------------------------------------
         # Inicialización de collectors (desde cfg)
         # -------------------------------------------------
 
+        # Caché HTTP compartida
+        cache_cfg = cfg.get("cache", {})
+        if cache_cfg.get("enabled"):
+            self.http_cache = HttpCache(
+                max_bytes=int(cache_cfg.get("max_mb", 256)) * 1024 * 1024,
+                ttls=cache_cfg.get("ttl", {})
+            )
+        else:
+            self.http_cache = None
+
+        # Cliente HTTP compartido (pool keep-alive + timeouts de cfg["timeouts"])
+        http_cfg = cfg.get("http", {})
+        self.http_client = HttpClient(
+            timeouts=cfg["timeouts"],
+            pool_connections=int(http_cfg.get("pool_connections", 10)),
+            pool_maxsize=int(http_cfg.get("pool_maxsize", 10)),
+            cache=self.http_cache,
+            max_body_bytes=http_cfg.get("max_body_bytes", {})
+        )
+
         # Pasivos
+        # crt.sh en streaming + certificados / nombres acumulados entre ejecuciones
+        subdomains_cfg = cfg.get("subdomains", {})
+
+        if subdomains_cfg.get("cache", True):
+            self.subdomain_cache = SubdomainCache()
+        else:
+            self.subdomain_cache = None
+
         self.subdomain_collector = SubdomainCollector(
-            timeout=cfg["timeouts"]["http_subdomains"]
+            client=self.http_client,
+            cache=self.subdomain_cache,
+            refresh_after=subdomains_cfg.get("refresh_after")
         )
 
         self.whois_collector = WhoisCollector()
 
+        # DNS: consultas concurrentes + caché por TTL (storage/dns_cache.db)
+        dns_cfg = cfg.get("dns", {})
+
+        if dns_cfg.get("cache", True):
+            self.dns_cache = DnsCache(max_ttl=int(dns_cfg.get("max_ttl", 24 * 3600)))
+        else:
+            self.dns_cache = None
+
         self.dns_collector = DNSCollector(
-            timeout=cfg["timeouts"]["dns_resolution"]
+            timeout=cfg["timeouts"]["dns_resolution"],
+            concurrency=int(dns_cfg.get("concurrency", 100)),
+            cache=self.dns_cache,
+            negative_ttl=int(dns_cfg.get("negative_ttl", DNSCollector.NEGATIVE_TTL)),
+            # A siempre: alimenta resolved_domain_results y el estado del dominio
+            record_types=list(dict.fromkeys(["A", *dns_cfg.get("record_types", RECORD_TYPES)]))
         )
 
-        self.email_collector = EmailCollector(
-            timeout=cfg["timeouts"]["http_email_passive"]
-        )
+        # Comodines DNS: sondas con etiquetas aleatorias por zona antes de resolver
+        if dns_cfg.get("wildcard_filter", True):
+            self.wildcard_filter = WildcardFilter(
+                self.dns_collector,
+                probes=int(dns_cfg.get("wildcard_probes", 2))
+            )
+        else:
+            self.wildcard_filter = None
+
+        self.email_collector = EmailCollector(client=self.http_client)
 
         # Crawler
         self.crawler_cls = Crawler
-        self.crawler_timeout = cfg["timeouts"]["http_crawler_page"]
         self.crawler_max_pages = int(cfg["limits"]["max_pages"])
 
+        crawler_cfg = cfg.get("crawler", {})
+        self.crawler_async = crawler_cfg.get("async", False)
+        self.crawler_concurrency = int(crawler_cfg.get("concurrency", 1))
+        self.crawler_per_host = int(crawler_cfg.get("per_host", 1))
+        self.crawler_priority = PRIORITIES[crawler_cfg.get("priority", "bfs")]
+        self.crawler_html_parser = available_backend(crawler_cfg.get("html_parser", "stdlib"))
+        self.crawler_checkpoint_every = int(crawler_cfg.get("checkpoint_every", 25))
+
+        # Extracción CPU (parsing + regex) en procesos aparte
+        extraction_cfg = cfg.get("extraction", {})
+
+        # Caché de extracción por contenido (memoria + SQLite entre ejecuciones)
+        if extraction_cfg.get("cache"):
+            self.extraction_cache = ExtractionCache(
+                max_entries=int(extraction_cfg.get("cache_entries", 4096)),
+                persistent=extraction_cfg.get("cache_persistent", True)
+            )
+        else:
+            self.extraction_cache = None
+
+        if extraction_cfg.get("enabled"):
+            self.extraction = ExtractionPool(
+                workers=int(extraction_cfg.get("workers", 0))
+            )
+        else:
+            self.extraction = None
+
+        # Credenciales
+        entropy_cfg = cfg.get("entropy", {})
+        self.entropy_enabled = entropy_cfg.get("enabled", False)
+        self.cred_parser = CredentialParser(
+            entropy_min_length=int(entropy_cfg.get("min_length", CredentialParser.ENTROPY_MIN_LENGTH)),
+            entropy_min_bits=float(entropy_cfg.get("min_entropy", CredentialParser.ENTROPY_MIN_BITS)),
+            entropy_min_confidence=float(entropy_cfg.get("min_confidence", CredentialParser.ENTROPY_MIN_CONFIDENCE))
+        )
+
         # JS
+        js_cfg = cfg.get("js", {})
+        if js_cfg.get("skip_vendor"):
+            vendor_index = VendorIndex(path=js_cfg.get("vendor_fingerprints"))
+        else:
+            vendor_index = None
+
         self.js_parser = JSParser(
-            connect_timeout=cfg["timeouts"]["js_connect"],
-            read_timeout=cfg["timeouts"]["js_read"]
+            client=self.http_client,
+            cache=self.extraction_cache,
+            concurrency=int(js_cfg.get("concurrency", 8)),
+            vendor_index=vendor_index,
+            cred_parser=self.cred_parser,
+            entropy=self.entropy_enabled,
+            stream_window=int(js_cfg.get("stream_window", 0)),
+            stream_overlap=int(js_cfg.get("stream_overlap", JSParser.STREAM_OVERLAP))
         )
 
-        # Credenciales
-        self.cred_parser = CredentialParser()
-
         # Scraping
+        scraping_cfg = cfg.get("scraping", {})
+
+        # Un navegador por ejecución (se lanza al primer renderizado)
+        self.browser_pool = BrowserPool(
+            concurrency=int(scraping_cfg.get("concurrency", 4)),
+            user_agent=self.http_client.user_agent,
+            context_reuse=int(scraping_cfg.get("context_reuse", 20))
+        )
+
+        render_cfg = scraping_cfg.get("render")
+        if render_cfg:
+            render_profile = RenderProfile(
+                block_types=render_cfg.get("block_types", RenderProfile.BLOCK_TYPES),
+                block_trackers=render_cfg.get("block_trackers", True),
+                block_third_party=render_cfg.get("block_third_party", True),
+                wait=render_cfg.get("wait", "dom_quiet"),
+                quiet_ms=int(render_cfg.get("quiet_ms", 500)),
+                max_inflight=int(render_cfg.get("max_inflight", 2))
+            )
+        else:
+            render_profile = RenderProfile.full()
+
+        # Triaje: solo se renderizan las páginas que parecen necesitar JS
+        self.triage_cfg = scraping_cfg.get("triage", {})
+
         self.scraper = Scraper(
-            timeout=cfg["timeouts"]["scraping_page_load"]
+            timeout=cfg["timeouts"]["scraping_page_load"],
+            user_agent=self.http_client.user_agent,
+            json_keys=scraping_cfg.get("json_keys"),
+            json_max_depth=scraping_cfg.get("json_max_depth"),
+            json_stream_bytes=int(scraping_cfg.get("json_stream_bytes", Scraper.JSON_STREAM_BYTES)),
+            pool=self.browser_pool,
+            render_profile=render_profile,
+            client=self.http_client
         )
 
         # Emails en URLS históricas
 
         self.wayback_collector = WaybackCollector(
-            timeout=cfg["timeouts"].get("wayback_timeout", 10),
-            limit=cfg["limits"].get("wayback_urls", 50)
+            limit=cfg["limits"].get("wayback_urls", 50),
+            client=self.http_client
         )
 
     # -----------------------------
@@ -138,16 +286,66 @@ class Orchestrator:
             return False
         seen.add(domain)
         return True
+
+    # -------------------------------------------------
+    # Crawling
+    # -------------------------------------------------
+
+    def _new_crawler(self, start_url, max_pages, allowed_domain, checkpoint=None, triage=False, exclude_hosts=None):
+        return self.crawler_cls(
+            start_url=start_url,
+            max_pages=max_pages,
+            allowed_domain=allowed_domain,
+            concurrency=self.crawler_concurrency,
+            per_host=self.crawler_per_host,
+            priority=self.crawler_priority,
+            client=self.http_client,
+            html_parser=self.crawler_html_parser,
+            checkpoint=checkpoint,
+            exclude_hosts=exclude_hosts,
+            extraction=self.extraction,
+            cache=self.extraction_cache,
+            triage=triage
+        )
+
+    def _iter_crawler(self, crawler):
+        if self.crawler_async:
+            return crawler.iter_pages_async()
+        return crawler.iter_pages()
     # -------------------------------------------------
     # Main
     # -------------------------------------------------
 
 
-    def run(self, execution, cfg):
+    def run(self, execution, cfg, resume=False):
+        """
+        resume=True reanuda una ejecución fallida con el mismo execution.ID:
+        los crawls continúan desde su último checkpoint y lo ya guardado
+        en base de datos no se vuelve a insertar.
+        """
 
         self._validate_cfg(cfg)
         self._init_collectors(cfg)
 
+        try:
+            self._run(execution, cfg, resume)
+        finally:
+            self._close()
+
+    def _close(self):
+        self.browser_pool.close()
+        if self.extraction:
+            self.extraction.close()
+        if self.extraction_cache:
+            self.extraction_cache.close()
+        if self.dns_cache:
+            self.dns_cache.close()
+        if self.subdomain_cache:
+            self.subdomain_cache.close()
+        self.http_client.close()
+
+    def _run(self, execution, cfg, resume):
+
         # -------------------------------------------------
         # 0. Estado inicial
         # -------------------------------------------------
@@ -159,6 +357,9 @@ class Orchestrator:
         all_domains = set()
         all_domains.add(execution.TARGET)
 
+        # Hosts colapsados por un comodín DNS: el crawler live no los visita
+        wildcard_hosts = set()
+
         emails_html = set()
         emails_crawler = set()
         emails_js = set()
@@ -169,9 +370,55 @@ class Orchestrator:
 
         creds_html = set()
         creds_js = set()
+        creds_js_entropy = set()
         creds_scraping_dom = set()
         creds_scraping_json = set()
 
+        # Resultado ligero del crawler live (url + scripts) para JS y scraping
+        live_urls = list(self._build_crawl_urls(execution.TARGET))
+        live_results = []
+        wayback_urls = set()
+
+        if resume:
+            print(f"Reanudando ejecución {execution.ID}...")
+
+            seen_domains.update(self.database.get_domains(execution.ID))
+
+            # Lo ya guardado vuelve al conjunto de su técnica: las métricas
+            # finales cuentan también lo encontrado antes de la caída
+            emails_by_technique = {
+                C.TECHNIQUE_PASSIVE_HTML: emails_html,
+                C.TECHNIQUE_CRAWLER_HTML: emails_crawler,
+                C.TECHNIQUE_JS_STATIC: emails_js,
+                C.TECHNIQUE_SCRAPING_DOM: emails_scraping_dom,
+                C.TECHNIQUE_SCRAPING_JSON: emails_scraping_json,
+            }
+            creds_by_technique = {
+                C.TECHNIQUE_CRAWLER_HTML: creds_html,
+                C.TECHNIQUE_JS_STATIC: creds_js,
+                C.TECHNIQUE_SCRAPING_DOM: creds_scraping_dom,
+                C.TECHNIQUE_SCRAPING_JSON: creds_scraping_json,
+            }
+
+            for email, technique, context in self.database.get_emails(execution.ID):
+                seen_emails.add(email)
+
+                if technique in emails_by_technique:
+                    emails_by_technique[technique].add(email)
+
+                if technique == C.TECHNIQUE_CRAWLER_HTML:
+                    if context == "wayback":
+                        emails_from_wayback.add(email)
+                    else:
+                        emails_from_live.add(email)
+
+            for ctype, value, technique in self.database.get_credentials(execution.ID):
+                seen_creds.add((ctype, value.lower()))
+
+                if technique == C.TECHNIQUE_JS_STATIC and ctype == ENTROPY_TYPE:
+                    creds_js_entropy.add((ctype, value))
+                elif technique in creds_by_technique:
+                    creds_by_technique[technique].add((ctype, value))
 
         # -------------------------------------------------
         # 1. Subdominios (pasivo)
@@ -181,6 +428,23 @@ class Orchestrator:
             print("Encontrando subdominios...")
             subdomains = self.subdomain_collector.collect(execution.TARGET)
 
+            crtsh_stats = self.subdomain_collector.stats
+            if crtsh_stats["from_cache"]:
+                print(f"[SUBDOMINIOS] {len(subdomains)} nombres desde la caché local (crt.sh consultado hace poco)")
+            else:
+                print(
+                    f"[SUBDOMINIOS] crt.sh: {crtsh_stats['certs']} certificados "
+                    f"({crtsh_stats['known_certs']} ya conocidos) | "
+                    f"{crtsh_stats['new_names']} nombres nuevos | {len(subdomains)} en total"
+                )
+
+            # Al reanudar, crt.sh da por conocidos los certificados del primer
+            # intento: se conservan las métricas de ese intento
+            if not (resume and self.database.has_metric(execution.ID, "subdomains_certs")):
+                self.database.insert_metric(execution.ID, "subdomains_certs", crtsh_stats["certs"])
+                self.database.insert_metric(execution.ID, "subdomains_known_certs", crtsh_stats["known_certs"])
+                self.database.insert_metric(execution.ID, "subdomains_new_names", crtsh_stats["new_names"])
+
             for s in subdomains:
                 domain = self._is_valid_domain(s.get("value"))
                 if domain:
@@ -199,7 +463,9 @@ class Orchestrator:
         # 2. WHOIS
         # -------------------------------------------------
 
-        if cfg["modules"]["whois"]:
+        if cfg["modules"]["whois"] and not (
+            resume and self.database.has_whois_result(execution.ID, execution.TARGET)
+        ):
             print("Consultando WHOIS...")
             whois_data = self.whois_collector.collect(execution.TARGET)
             if whois_data:
@@ -209,6 +475,33 @@ class Orchestrator:
                     whois_data
                 )
 
+        # -------------------------------------------------
+        # 2b. Comodines DNS (antes de resolver y crawlear)
+        # -------------------------------------------------
+
+        dns_domains = sorted(all_domains, key=lambda d: rank_key(d, execution.TARGET))
+
+        if cfg["modules"]["dns"] and self.wildcard_filter and len(all_domains) > 1:
+            print("Detectando comodines DNS...")
+            dns_domains, collapsed, wildcards = self.wildcard_filter.prune(all_domains, execution.TARGET)
+
+            for domain in collapsed:
+                self.database.update_domain_status(
+                    execution.ID,
+                    domain,
+                    C.DOMAIN_STATUS_WILDCARD
+                )
+
+            wildcard_hosts.update(collapsed)
+
+            print(
+                f"[DNS] comodines en {len(wildcards)} zonas: {len(collapsed)} nombres colapsados | "
+                f"{len(dns_domains)} hosts distintos"
+            )
+
+            self.database.insert_metric(execution.ID, "dns_wildcard_zones", len(wildcards))
+            self.database.insert_metric(execution.ID, "dns_wildcard_collapsed", len(collapsed))
+
         # -------------------------------------------------
         # 3. DNS
         # -------------------------------------------------
@@ -216,28 +509,39 @@ class Orchestrator:
         if cfg["modules"]["dns"]:
             print("Resolviendo DNS...")
             max_dns = int(cfg["limits"]["max_dns"])
-            domains_to_resolve = list(all_domains)[:max_dns]
 
-            for domain in domains_to_resolve:
+            domains_to_resolve = []
+            for domain in dns_domains[:max_dns]:
                 clean_domain = self._is_valid_domain(domain)
-                if not clean_domain:
-                    continue
+                if clean_domain:
+                    domains_to_resolve.append(clean_domain)
+
+            # Solo las consultas de esta etapa (no las sondas de comodines)
+            stats_before = Counter(self.dns_collector.stats)
 
-                dns_results = self.dns_collector.collect(clean_domain)
+            start = time.perf_counter()
+            profiles = self.dns_collector.resolve_many(domains_to_resolve)
+            elapsed = time.perf_counter() - start
 
-                if dns_results:
+            dns_records = []
+
+            for clean_domain, profile in profiles.items():
+                ips = profile.get("A", []) + profile.get("AAAA", [])
+                dns_records.extend(self.dns_collector.records(clean_domain, profile))
+
+                if ips:
                     self.database.update_domain_status(
                         execution.ID,
                         clean_domain,
                         C.DOMAIN_STATUS_RESOLVABLE
                     )
 
-                    for r in dns_results:
+                    for ip in ips:
                         self.database.insert_resolved_domain(
                             execution.ID,
-                            r["domain"],
-                            r["ip"],
-                            r["source"]
+                            clean_domain,
+                            ip,
+                            C.TECHNIQUE_DNS
                         )
                 else:
                     self.database.update_domain_status(
@@ -246,6 +550,22 @@ class Orchestrator:
                         C.DOMAIN_STATUS_NOT_RESOLVABLE
                     )
 
+            self.database.insert_dns_records(execution.ID, dns_records, C.TECHNIQUE_DNS)
+
+            dns_stats = self.dns_collector.stats - stats_before
+            queries = dns_stats["resolved"] + dns_stats["nxdomain"] + dns_stats["noanswer"] + dns_stats["errors"]
+            print(
+                f"[DNS] {len(profiles)} dominios ({', '.join(self.dns_collector.record_types)}) en {elapsed:.1f}s | "
+                f"{queries} consultas: {dns_stats['resolved']} con respuesta, {dns_stats['nxdomain']} NXDOMAIN, "
+                f"{dns_stats['noanswer']} sin registros, {dns_stats['errors']} errores | "
+                f"{dns_stats['cached']} desde caché | {len(dns_records)} registros"
+            )
+
+            self.database.insert_metric(execution.ID, "dns_queries", queries)
+            self.database.insert_metric(execution.ID, "dns_records", len(dns_records))
+            self.database.insert_metric(execution.ID, "dns_cache_hits", dns_stats["cached"])
+            self.database.insert_metric(execution.ID, "dns_errors", dns_stats["errors"])
+
         # -------------------------------------------------
         # 4. Emails pasivos (HTML simple)
         # -------------------------------------------------
@@ -276,52 +596,64 @@ class Orchestrator:
         if cfg["modules"]["crawler"]:
             print("Buscando emails mediante crawler (live + wayback)...")
 
-            live_results = []
-            wayback_results = []
-
-            # -------------------------
-            # LIVE CRAWLER
-            # -------------------------
-            live_urls = list(self._build_crawl_urls(execution.TARGET))
-
-            crawler_live = self.crawler_cls(
-                start_url=live_urls,
-                max_pages=self.crawler_max_pages,
-                timeout=self.crawler_timeout,
-                allowed_domain=execution.TARGET
-            )
-
-            live_results = crawler_live.run()
-
-            for page in live_results:
-                page["origin"] = "live"
-
-            # -------------------------
-            # WAYBACK CRAWLER (SOLO HTML)
-            # -------------------------
-            if cfg["modules"].get("wayback"):
-                print("Recolectando URLs históricas desde Wayback Machine...")
-                wayback_urls = self.wayback_collector.collect(execution.TARGET)
-
-                if wayback_urls:
-                    crawler_wb = self.crawler_cls(
-                        start_url=list(wayback_urls),
-                        max_pages=cfg["limits"].get("wayback_pages", 20),
-                        timeout=self.crawler_timeout,
-                        allowed_domain=None
-                    )
+            def crawl_pages():
+
+                # -------------------------
+                # LIVE CRAWLER
+                # -------------------------
+                crawler_live = self._new_crawler(
+                    start_url=live_urls,
+                    max_pages=self.crawler_max_pages,
+                    allowed_domain=execution.TARGET,
+                    checkpoint=CrawlCheckpoint(
+                        self.database, execution.ID, "live", self.crawler_checkpoint_every
+                    ),
+                    # render_score solo si el scraping lo va a usar
+                    triage=bool(cfg["modules"]["scraping"] and self.triage_cfg.get("enabled")),
+                    exclude_hosts=wildcard_hosts
+                )
 
-                    wayback_results = crawler_wb.run()
+                if crawler_live.resumed:
+                    print(f"[CRAWLER] live reanudado: {len(crawler_live.visited)} páginas ya visitadas")
+                    live_results.extend(self.database.get_crawled_pages(execution.ID, "live"))
+
+                for page in self._iter_crawler(crawler_live):
+                    page["origin"] = "live"
+
+                    # Para JS y scraping solo se conserva la parte ligera
+                    live_results.append({
+                        "url": page["url"],
+                        "scripts": page.get("scripts", []),
+                        "render_score": page.get("render_score")
+                    })
+
+                    yield page
+
+                # -------------------------
+                # WAYBACK CRAWLER (SOLO HTML)
+                # -------------------------
+                if cfg["modules"].get("wayback"):
+                    print("Recolectando URLs históricas desde Wayback Machine...")
+                    wayback_urls.update(self.wayback_collector.collect(execution.TARGET))
+
+                    if wayback_urls:
+                        crawler_wb = self._new_crawler(
+                            start_url=list(wayback_urls),
+                            max_pages=cfg["limits"].get("wayback_pages", 20),
+                            allowed_domain=None,
+                            checkpoint=CrawlCheckpoint(
+                                self.database, execution.ID, "wayback", self.crawler_checkpoint_every
+                            )
+                        )
 
-                    for page in wayback_results:
-                        page["origin"] = "wayback"
+                        for page in self._iter_crawler(crawler_wb):
+                            page["origin"] = "wayback"
+                            yield page
 
             # -------------------------
-            # PROCESADO HTML UNIFICADO
+            # PROCESADO HTML UNIFICADO (página a página)
             # -------------------------
-            all_crawl_results = live_results + wayback_results
-
-            for page in all_crawl_results:
+            for page in crawl_pages():
                 page_url = page["url"]
                 domain = urlparse(page_url).netloc
                 origin = page["origin"]
@@ -358,8 +690,10 @@ class Orchestrator:
                         )
 
                 # Credenciales HTML
-                raw_html = page.get("raw_html", "")
-                creds = self.cred_parser.parse(raw_html, source=C.SOURCE_HTML)
+                # (ya extraídas por el crawler; si no, se parsean aquí)
+                creds = page.get("credentials")
+                if creds is None:
+                    creds = self.cred_parser.parse(page.get("raw_html", ""), source=C.SOURCE_HTML)
 
                 for ctype, value, source in creds:
                     creds_html.add((ctype, value))
@@ -382,68 +716,79 @@ class Orchestrator:
             print("Parseando JS (solo live)...")
 
             max_scripts = int(cfg["limits"]["max_scripts"])
-            parsed_scripts = 0
 
             base_domain = urlparse(live_urls[0]).netloc
 
+            # Scripts únicos de todas las páginas: un bundle común a todo
+            # el sitio se descarga y analiza una sola vez
+            references = {}
             for page in live_results:
-                if parsed_scripts >= max_scripts:
-                    break
-
                 if "@" in page["url"]:
                     continue
 
                 for script_url in page.get("scripts", []):
-                    if parsed_scripts >= max_scripts:
-                        break
+                    references[script_url] = references.get(script_url, 0) + 1
 
-                    parsed = self.js_parser.parse(script_url, base_domain)
-                    if not parsed:
-                        continue
+            parsed_results = self.js_parser.parse_many(references, base_domain, limit=max_scripts)
+            parsed_scripts = len(parsed_results)
 
-                    parsed_scripts += 1
+            for parsed in parsed_results:
+                script_url = parsed["script_url"]
 
-                    self.database.insert_js_result(
-                        execution.ID,
-                        parsed["script_url"],
-                        parsed.get("emails", []),
-                        parsed.get("urls", [])
-                    )
+                self.database.insert_js_result(
+                    execution.ID,
+                    parsed["script_url"],
+                    parsed.get("emails", []),
+                    parsed.get("urls", [])
+                )
+
+                # Emails JS
+                for e in parsed.get("emails", []):
+                    email = normalize_email(e)
+                    if email:
+                        emails_js.add(email)
 
-                    # Emails JS
-                    for e in parsed.get("emails", []):
-                        email = normalize_email(e)
-                        if email:
-                            emails_js.add(email)
-
-                            if self._is_new_email(email, seen_emails):
-                                self.database.insert_email(
-                                    execution.ID,
-                                    email,
-                                    urlparse(script_url).netloc,
-                                    technique=C.TECHNIQUE_JS_STATIC,
-                                    source=script_url,
-                                    context="live"
-                                )
-
-                    # Credenciales JS
-                    raw_js = parsed.get("raw", "")
-                    creds = self.cred_parser.parse(raw_js, source=C.SOURCE_JS)
-
-                    for ctype, value, source in creds:
-                        creds_js.add((ctype, value))
-
-                        if self._is_new_credential(ctype, value, seen_creds):
-                            self.database.insert_credential(
+                        if self._is_new_email(email, seen_emails):
+                            self.database.insert_email(
                                 execution.ID,
-                                ctype,
-                                value,
+                                email,
+                                urlparse(script_url).netloc,
                                 technique=C.TECHNIQUE_JS_STATIC,
                                 source=script_url,
                                 context="live"
                             )
 
+                # Credenciales JS (ya extraídas por JSParser)
+                for ctype, value, source in parsed.get("credentials", []):
+                    creds_js.add((ctype, value))
+
+                    if self._is_new_credential(ctype, value, seen_creds):
+                        self.database.insert_credential(
+                            execution.ID,
+                            ctype,
+                            value,
+                            technique=C.TECHNIQUE_JS_STATIC,
+                            source=script_url,
+                            context="live"
+                        )
+
+                # Secretos de alta entropía (sin nombre de variable)
+                for ctype, value, source, confidence in parsed.get("secrets", []):
+                    creds_js_entropy.add((ctype, value))
+
+                    if self._is_new_credential(ctype, value, seen_creds):
+                        self.database.insert_credential(
+                            execution.ID,
+                            ctype,
+                            value,
+                            technique=C.TECHNIQUE_JS_STATIC,
+                            source=script_url,
+                            context="live",
+                            confidence=confidence
+                        )
+
             print(f"[JS] Scripts parseados: {parsed_scripts}/{max_scripts}")
+            print(f"[JS] Scripts únicos: {len(references)} (referencias en páginas: {sum(references.values())})")
 
         # -------------------------------------------------
         # 7. Scraping activo (SOLO LIVE)
@@ -452,14 +797,66 @@ class Orchestrator:
         if cfg["modules"]["scraping"]:
             print("Realizando scraping activo (solo live)...")
 
-            for page in live_results:
-                if "@" in page["url"]:
-                    continue
+            scrape_pages = [page for page in live_results if "@" not in page["url"]]
+
+            if self.triage_cfg.get("enabled"):
+                to_render, audit, skipped = select_pages(
+                    scrape_pages,
+                    threshold=float(self.triage_cfg.get("threshold", 0.4)),
+                    budget=self.triage_cfg.get("max_renders"),
+                    audit_sample=int(self.triage_cfg.get("audit_sample", 0)),
+                    seed=execution.ID
+                )
+            else:
+                to_render, audit, skipped = scrape_pages, [], []
+
+            print(
+                f"[SCRAPING] triaje: {len(to_render)} a renderizar | "
+                f"{len(skipped)} descartadas | {len(audit)} de auditoría"
+            )
 
-                result = self.scraper.scrape(page["url"])
+            # Lo que ya se tiene sin navegador: un hallazgo de una página
+            # de auditoría que no esté aquí es algo que el triaje perdería
+            static_emails = emails_html | emails_crawler | emails_js
+            static_creds = creds_html | creds_js | creds_js_entropy
+            audit_urls = {page["url"] for page in audit}
+            audit_lost = set()
+
+            scrape_urls = [page["url"] for page in to_render + audit]
+            render_totals = {"pages": 0, "render_ms": 0.0, "blocked": 0, "requests": 0, "bytes": 0}
+
+            # Renderizado concurrente en el navegador compartido; los
+            # resultados llegan en el orden de scrape_urls
+            for page_url, result in zip(scrape_urls, self.scraper.scrape_many(scrape_urls)):
                 if not result:
                     continue
 
+                if page_url in audit_urls:
+                    found_emails = {
+                        normalize_email(e)
+                        for e in set(result["emails_dom"]) | set(result["emails_json"])
+                    } - {None}
+                    found_creds = {
+                        (ctype, value)
+                        for ctype, value, _ in result["credentials_dom"] + result["credentials_json"]
+                    }
+
+                    lost = (found_emails - static_emails) | {c[1] for c in found_creds - static_creds}
+                    if lost:
+                        print(f"[SCRAPING] auditoría: {page_url} tenía {len(lost)} hallazgo(s) solo renderizando")
+                    audit_lost |= lost
+
+                render = result["render"]
+                render_totals["pages"] += 1
+                for key in ("render_ms", "blocked", "requests", "bytes"):
+                    render_totals[key] += render[key]
+
+                print(
+                    f"[SCRAPING] {page_url} -> {render['render_ms']:.0f} ms | "
+                    f"bloqueadas: {render['blocked']}/{render['requests']} | "
+                    f"{render['bytes'] / 1024:.0f} KB descargados"
+                )
+
                 for e in result["emails_dom"]:
                     email = normalize_email(e)
                     if email:
@@ -469,9 +866,9 @@ class Orchestrator:
                             self.database.insert_email(
                                 execution.ID,
                                 email,
-                                urlparse(page["url"]).hostname,
+                                urlparse(page_url).hostname,
                                 technique=C.TECHNIQUE_SCRAPING_DOM,
-                                source=page["url"],
+                                source=page_url,
                                 context="rendered_dom"
                             )
 
@@ -484,7 +881,7 @@ class Orchestrator:
                             ctype,
                             value,
                             technique=C.TECHNIQUE_SCRAPING_DOM,
-                            source=page["url"],
+                            source=page_url,
                             context="rendered"
                         )
 
@@ -497,9 +894,9 @@ class Orchestrator:
                             self.database.insert_email(
                                 execution.ID,
                                 email,
-                                urlparse(page["url"]).netloc,
+                                urlparse(page_url).netloc,
                                 technique=C.TECHNIQUE_SCRAPING_JSON,
-                                source=page["url"],
+                                source=page_url,
                                 context="fetch/xhr"
                             )
 
@@ -512,10 +909,38 @@ class Orchestrator:
                             ctype,
                             value,
                             technique=C.TECHNIQUE_SCRAPING_JSON,
-                            source=page["url"],
+                            source=page_url,
                             context="fetch/xhr"
                         )
 
+            print(
+                f"[SCRAPING] navegadores lanzados: {self.browser_pool.launches} | "
+                f"contextos: {self.browser_pool.contexts_created} | "
+                f"páginas renderizadas: {self.browser_pool.pages}"
+            )
+
+            self.database.insert_metric(execution.ID, "scraping_renders", len(to_render))
+            self.database.insert_metric(execution.ID, "scraping_renders_skipped", len(skipped))
+            self.database.insert_metric(execution.ID, "scraping_audit_renders", len(audit))
+            self.database.insert_metric(execution.ID, "scraping_audit_lost_findings", len(audit_lost))
+
+            if audit:
+                print(f"[SCRAPING] auditoría: {len(audit_lost)} hallazgo(s) que el triaje habría perdido")
+
+            if render_totals["pages"]:
+                print(
+                    f"[SCRAPING] renderizado medio: {render_totals['render_ms'] / render_totals['pages']:.0f} ms | "
+                    f"peticiones bloqueadas: {render_totals['blocked']}/{render_totals['requests']} | "
+                    f"descargado: {render_totals['bytes'] / (1024 * 1024):.1f} MB"
+                )
+
+                self.database.insert_metric(
+                    execution.ID, "scraping_render_ms_avg",
+                    round(render_totals["render_ms"] / render_totals["pages"])
+                )
+                self.database.insert_metric(execution.ID, "scraping_blocked_requests", render_totals["blocked"])
+                self.database.insert_metric(execution.ID, "scraping_bytes_loaded", render_totals["bytes"])
+
         #--------------------------------------------------
         # Métrica A/B (scraping vs no scraping)
         # -------------------------------------------------
@@ -543,6 +968,7 @@ class Orchestrator:
 
         print(f"[CREDS] html: {len(creds_html)}")
         print(f"[CREDS] js_static: {len(creds_js)}")
+        print(f"[CREDS] js_entropy: {len(creds_js_entropy)}")
         print(f"[CREDS] scraping_dom: {len(creds_scraping_dom)}")
         print(f"[CREDS] scraping_json: {len(creds_scraping_json)}")
         print(f"[CREDS] scraping_total: {len(creds_scraping_total)}")
@@ -560,6 +986,7 @@ class Orchestrator:
 
         self.database.insert_metric(execution.ID, "creds_html", len(creds_html))
         self.database.insert_metric(execution.ID, "creds_js_static", len(creds_js))
+        self.database.insert_metric(execution.ID, "creds_js_entropy", len(creds_js_entropy))
         self.database.insert_metric(execution.ID, "creds_scraping_dom", len(creds_scraping_dom))
         self.database.insert_metric(execution.ID, "creds_scraping_json", len(creds_scraping_json))
         self.database.insert_metric(execution.ID, "creds_scraping_total", len(creds_scraping_total))
@@ -570,4 +997,43 @@ class Orchestrator:
         self.database.insert_metric(execution.ID,"emails_from_live",len(emails_from_live))
         self.database.insert_metric(execution.ID,"emails_total_with_wayback",len(emails_total_with_wayback))
 
+        if self.http_cache:
+            print(
+                f"[CACHE] hits: {self.http_cache.hits} | "
+                f"304: {self.http_cache.revalidated} | "
+                f"descargas: {self.http_cache.misses}"
+            )
+
+            self.database.insert_metric(execution.ID, "http_cache_hits", self.http_cache.hits)
+            self.database.insert_metric(execution.ID, "http_cache_revalidated", self.http_cache.revalidated)
+            self.database.insert_metric(execution.ID, "http_cache_misses", self.http_cache.misses)
+
+        if self.js_parser.vendor_index:
+            vendor_skips = self.js_parser.vendor_skips
+            print(
+                f"[JS] librerías conocidas descartadas: {vendor_skips['url']} por URL | "
+                f"{vendor_skips['hash']} por hash"
+            )
+
+            self.database.insert_metric(execution.ID, "js_vendor_skipped_url", vendor_skips["url"])
+            self.database.insert_metric(execution.ID, "js_vendor_skipped_hash", vendor_skips["hash"])
+
+        if self.extraction_cache:
+            print(
+                f"[EXTRACCIÓN] caché: {self.extraction_cache.hits} reutilizadas | "
+                f"{self.extraction_cache.misses} analizadas"
+            )
+
+            self.database.insert_metric(execution.ID, "extraction_cache_hits", self.extraction_cache.hits)
+            self.database.insert_metric(execution.ID, "extraction_cache_misses", self.extraction_cache.misses)
+
+        for collector, stats in sorted(self.http_client.stats.items()):
+            print(
+                f"[HTTP] {collector}: {stats['requests']} peticiones, {stats['bytes']} bytes, "
+                f"{stats['skipped']} descartadas, {stats['truncated']} truncadas"
+            )
+
+            for name, value in stats.items():
+                self.database.insert_metric(execution.ID, f"http_{collector}_{name}", value)
+
 
@@ -28,6 +28,15 @@ def build_config_from_ui():
             "max_pages": APP_CONFIG["limits"]["max_pages"],
             "max_scripts": APP_CONFIG["limits"]["max_scripts"],
         },
+        "crawler": dict(APP_CONFIG["crawler"]),
+        "extraction": dict(APP_CONFIG["extraction"]),
+        "scraping": dict(APP_CONFIG["scraping"]),
+        "subdomains": dict(APP_CONFIG["subdomains"]),
+        "dns": dict(APP_CONFIG["dns"]),
+        "js": dict(APP_CONFIG["js"]),
+        "entropy": dict(APP_CONFIG["entropy"]),
+        "http": dict(APP_CONFIG["http"]),
+        "cache": dict(APP_CONFIG["cache"]),
         "timeouts": {
         "http_crawler_page": http_crawler_var.get(),
         "http_email_passive": http_email_var.get(),
@@ -58,13 +67,41 @@ def run_erebus():
     if APP_CONFIG["debug"]["clear_db_on_run"]:
         db.clear_all()
 
-    orchestrator = Orchestrator(db)
     execution = Execution(target)
     db.insert_execution(execution)
 
+    execute(db, execution)
+
+
+def resume_erebus():
+    execution_id = entry_resume.get().strip()
+
+    if not execution_id:
+        messagebox.showerror("Error", "Introduce el ID de la ejecución a reanudar")
+        return
+
+    output.delete("1.0", tk.END)
+
+    # Sin clear_all: hacen falta los checkpoints de la ejecución
+    db = Database()
+    row = db.get_execution(execution_id)
+
+    if not row:
+        messagebox.showerror("Error", "Ejecución no encontrada")
+        return
+
+    execution = Execution(row["target"], execution_id=execution_id)
+    db.update_execution(execution)
+
+    execute(db, execution, resume=True)
+
+
+def execute(db, execution, resume=False):
+    orchestrator = Orchestrator(db)
+
     try:
         cfg = build_config_from_ui()
-        orchestrator.run(execution, cfg)
+        orchestrator.run(execution, cfg, resume=resume)
         execution.finish()
 
     except Exception as e:
@@ -90,68 +127,78 @@ def on_crawler_toggle():
 # UI
 # ----------------------------
 
-root = tk.Tk()
-root.title("EREBUS")
-
-tk.Label(root, text="Objetivo (dominio):").pack(anchor="w")
-entry_target = tk.Entry(root, width=40)
-entry_target.pack(anchor="w", pady=4)
-
-options = tk.Frame(root)
-options.pack(anchor="w", pady=6)
-
-# Vars
-subdomains_var = tk.BooleanVar(value=True)
-whois_var = tk.BooleanVar(value=True)
-dns_var = tk.BooleanVar(value=True)
-emails_var = tk.BooleanVar(value=True)
-crawler_var = tk.BooleanVar(value=True)
-js_var = tk.BooleanVar(value=False)
-scraping_var = tk.BooleanVar(value=False)
-wayback_var = tk.BooleanVar(value=True)
-
-http_crawler_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_crawler_page"])
-http_email_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_email_passive"])
-http_subdomains_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_subdomains"])
-dns_timeout_var = tk.IntVar(value=APP_CONFIG["timeouts"]["dns_resolution"])
-js_connect_var = tk.IntVar(value=APP_CONFIG["timeouts"]["js_connect"])
-js_read_var = tk.IntVar(value=APP_CONFIG["timeouts"]["js_read"])
-scraping_timeout_var = tk.IntVar(value=APP_CONFIG["timeouts"]["scraping_page_load"])
-wayback_timeout_var = tk.IntVar( value=APP_CONFIG["timeouts"]["wayback_timeout"])
-
-
-def add_row(row, text, var, timeout_var=None):
-    tk.Checkbutton(options, text=text, variable=var).grid(row=row, column=0, sticky="w")
-    if timeout_var:
-        tk.Entry(options, width=6, textvariable=timeout_var).grid(row=row, column=1, padx=20)
-
-add_row(0, "Subdominios (crt.sh)", subdomains_var, http_subdomains_var)
-add_row(1, "WHOIS", whois_var)
-add_row(2, "DNS", dns_var, dns_timeout_var)
-add_row(3, "Emails passive", emails_var, http_email_var)
-add_row(4, "Wayback (URLS históricas)", wayback_var, wayback_timeout_var)
-
-crawler_check = tk.Checkbutton(
-    options, text="Crawler HTML", variable=crawler_var, command=on_crawler_toggle
-)
-crawler_check.grid(row=5, column=0, sticky="w")
-tk.Entry(options, width=6, textvariable=http_crawler_var).grid(row=5, column=1, padx=6)
-
-js_check = tk.Checkbutton(options, text="Parsing JS", variable=js_var)
-js_check.grid(row=6, column=0, sticky="w")
-tk.Label(options, text="conn/read").grid(row=6, column=1, sticky="w")
-tk.Entry(options, width=3, textvariable=js_connect_var).grid(row=6, column=2)
-tk.Entry(options, width=3, textvariable=js_read_var).grid(row=6, column=3)
-
-scraping_check = tk.Checkbutton(options, text="Scraping", variable=scraping_var)
-scraping_check.grid(row=7, column=0, sticky="w")
-tk.Entry(options, width=6, textvariable=scraping_timeout_var).grid(row=7, column=1, padx=6)
-
-on_crawler_toggle()
-
-tk.Button(root, text="Ejecutar análisis", command=run_erebus).pack(pady=8)
-
-output = tk.Text(root, width=100, height=20)
-output.pack()
-
-root.mainloop()
+if __name__ == "__main__":
+    # En Windows los procesos del pool de extracción reimportan este módulo
+    root = tk.Tk()
+    root.title("EREBUS")
+
+    tk.Label(root, text="Objetivo (dominio):").pack(anchor="w")
+    entry_target = tk.Entry(root, width=40)
+    entry_target.pack(anchor="w", pady=4)
+
+    options = tk.Frame(root)
+    options.pack(anchor="w", pady=6)
+
+    # Vars
+    subdomains_var = tk.BooleanVar(value=True)
+    whois_var = tk.BooleanVar(value=True)
+    dns_var = tk.BooleanVar(value=True)
+    emails_var = tk.BooleanVar(value=True)
+    crawler_var = tk.BooleanVar(value=True)
+    js_var = tk.BooleanVar(value=False)
+    scraping_var = tk.BooleanVar(value=False)
+    wayback_var = tk.BooleanVar(value=True)
+
+    http_crawler_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_crawler_page"])
+    http_email_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_email_passive"])
+    http_subdomains_var = tk.IntVar(value=APP_CONFIG["timeouts"]["http_subdomains"])
+    dns_timeout_var = tk.IntVar(value=APP_CONFIG["timeouts"]["dns_resolution"])
+    js_connect_var = tk.IntVar(value=APP_CONFIG["timeouts"]["js_connect"])
+    js_read_var = tk.IntVar(value=APP_CONFIG["timeouts"]["js_read"])
+    scraping_timeout_var = tk.IntVar(value=APP_CONFIG["timeouts"]["scraping_page_load"])
+    wayback_timeout_var = tk.IntVar( value=APP_CONFIG["timeouts"]["wayback_timeout"])
+
+
+    def add_row(row, text, var, timeout_var=None):
+        tk.Checkbutton(options, text=text, variable=var).grid(row=row, column=0, sticky="w")
+        if timeout_var:
+            tk.Entry(options, width=6, textvariable=timeout_var).grid(row=row, column=1, padx=20)
+
+    add_row(0, "Subdominios (crt.sh)", subdomains_var, http_subdomains_var)
+    add_row(1, "WHOIS", whois_var)
+    add_row(2, "DNS", dns_var, dns_timeout_var)
+    add_row(3, "Emails passive", emails_var, http_email_var)
+    add_row(4, "Wayback (URLS históricas)", wayback_var, wayback_timeout_var)
+
+    crawler_check = tk.Checkbutton(
+        options, text="Crawler HTML", variable=crawler_var, command=on_crawler_toggle
+    )
+    crawler_check.grid(row=5, column=0, sticky="w")
+    tk.Entry(options, width=6, textvariable=http_crawler_var).grid(row=5, column=1, padx=6)
+
+    js_check = tk.Checkbutton(options, text="Parsing JS", variable=js_var)
+    js_check.grid(row=6, column=0, sticky="w")
+    tk.Label(options, text="conn/read").grid(row=6, column=1, sticky="w")
+    tk.Entry(options, width=3, textvariable=js_connect_var).grid(row=6, column=2)
+    tk.Entry(options, width=3, textvariable=js_read_var).grid(row=6, column=3)
+
+    scraping_check = tk.Checkbutton(options, text="Scraping", variable=scraping_var)
+    scraping_check.grid(row=7, column=0, sticky="w")
+    tk.Entry(options, width=6, textvariable=scraping_timeout_var).grid(row=7, column=1, padx=6)
+
+    on_crawler_toggle()
+
+    tk.Button(root, text="Ejecutar análisis", command=run_erebus).pack(pady=8)
+
+    resume_frame = tk.Frame(root)
+    resume_frame.pack(anchor="w", pady=4)
+
+    tk.Label(resume_frame, text="Reanudar ejecución (ID):").pack(side="left")
+    entry_resume = tk.Entry(resume_frame, width=40)
+    entry_resume.pack(side="left", padx=4)
+    tk.Button(resume_frame, text="Reanudar", command=resume_erebus).pack(side="left")
+
+    output = tk.Text(root, width=100, height=20)
+    output.pack()
+
+    root.mainloop()
@@ -2,15 +2,21 @@ import re
 import base64
 import html
 
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+# Patrones precompilados: se compilan una vez al importar el módulo
 
+EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+# (patrón, sustitución, prefiltro)
+# El prefiltro es la parte central del patrón, que empieza por un literal
+# (re lo busca sin probar cada posición): si no aparece, el patrón
+# completo tampoco puede aplicarse y se salta.
 OBFUSCATED_PATTERNS = [
-    (r"\s*\[\s*at\s*\]\s*", "@"),
-    (r"\s*\(\s*at\s*\)\s*", "@"),
-    (r"\s+at\s+", "@"),
-    (r"\s*\[\s*dot\s*\]\s*", "."),
-    (r"\s*\(\s*dot\s*\)\s*", "."),
-    (r"\s+dot\s+", "."),
+    (re.compile(r"\s*\[\s*at\s*\]\s*"), "@", re.compile(r"\[\s*at\s*\]")),
+    (re.compile(r"\s*\(\s*at\s*\)\s*"), "@", re.compile(r"\(\s*at\s*\)")),
+    (re.compile(r"\s+at\s+"), "@", re.compile(r"at(?=\s)(?<=\sat)")),
+    (re.compile(r"\s*\[\s*dot\s*\]\s*"), ".", re.compile(r"\[\s*dot\s*\]")),
+    (re.compile(r"\s*\(\s*dot\s*\)\s*"), ".", re.compile(r"\(\s*dot\s*\)")),
+    (re.compile(r"\s+dot\s+"), ".", re.compile(r"dot(?=\s)(?<=\sdot)")),
 ]
 
 # "info" + "@" + "example.com"
@@ -23,53 +29,153 @@ BASE64_CALL_REGEX = re.compile(r"atob\(\s*['\"]([A-Za-z0-9+/=]{20,})['\"]\s*\)")
 
 BASE64_TOKEN_REGEX = re.compile(r"\b[A-Za-z0-9+/=]{24,}\b")
 
+WHITESPACE_REGEX = re.compile(r"\s+")
+
+# ---------------------------------------------
+# Decodificación por ventanas (etapas 4 y 6)
+# ---------------------------------------------
+
+# Entidades HTML y escapes JS/Python que pueden esconder un email
+# (de las entidades con nombre solo las que dan caracteres de un email)
+ESCAPE_REGEX = re.compile(
+    r"&(?:#[0-9]+|#[xX][0-9a-fA-F]+|commat|period|lowbar|hyphen|plus|percnt);?"
+    r"|\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|[0-7]{1,3})"
+)
+
+JS_ESCAPE_REGEX = re.compile(
+    r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|[0-7]{1,3}|[\\'\"abfnrtv])"
+)
+
+SIMPLE_ESCAPES = {
+    "\\": "\\", "'": "'", '"': '"', "a": "\a", "b": "\b",
+    "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v",
+}
+
+# Una ventana acaba en el primer separador (o a WINDOW caracteres del escape)
+WINDOW_SEPARATOR = re.compile(r"[\s<>\"'`]")
+WINDOW_START = re.compile(r"[\s<>\"'`][^\s<>\"'`]*$")
+WINDOW = 128
+
+# Base64 suelto: tramos de 24+ caracteres, con continuación en líneas
+# siguientes (base64 partido cada 64/76 caracteres)
+BASE64_CANDIDATE_REGEX = re.compile(
+    r"(?<![A-Za-z0-9+/=])[A-Za-z0-9+/=]{24,}(?:[ \t]*\r?\n[ \t]*[A-Za-z0-9+/=]+)*"
+)
+
+# Límite de decodificaciones por documento (etapas 4 y 6)
+MAX_DECODE_WINDOWS = 10000
+MAX_BASE64_DECODES = 2000
+
+
 def normalize_obfuscated(text: str) -> set:
+    """
+    Cada etapa tiene un prefiltro barato (condición necesaria para que
+    encuentre algo); si no se cumple, la etapa se salta sin copiar el texto.
+    """
     found = set()
     if not text:
         return found
 
+    has_at = "@" in text
     lowered = text.lower()
 
     # 1. Emails en claro
-    for e in re.findall(EMAIL_REGEX, lowered):
-        found.add(e)
+    if has_at:
+        found.update(EMAIL_REGEX.findall(lowered))
 
     # 2. Sustituciones [at]/[dot]
+    # (candidate solo se copia si algún patrón se aplica)
     candidate = lowered
-    for pattern, repl in OBFUSCATED_PATTERNS:
-        candidate = re.sub(pattern, repl, candidate)
+    for pattern, repl, prefilter in OBFUSCATED_PATTERNS:
+        if prefilter.search(candidate):
+            candidate = pattern.sub(repl, candidate)
 
-    for e in re.findall(EMAIL_REGEX, candidate):
-        found.add(e)
+    # Sin sustituciones el resultado es el de la etapa 1
+    if candidate is not lowered and "@" in candidate:
+        found.update(EMAIL_REGEX.findall(candidate))
 
     # 3. Concatenaciones simples
-    for user, domain in CONCAT_REGEX.findall(text):
-        email = f"{user}@{domain}".lower()
-        if re.match(EMAIL_REGEX, email):
-            found.add(email)
-
-    # 4. HTML entities y escapes JS
-    unescaped = html.unescape(text)
-    try:
-        unescaped = unescaped.encode().decode("unicode_escape")
-    except Exception:
-        pass
-
-    for e in re.findall(EMAIL_REGEX, unescaped.lower()):
-        found.add(e)
+    if has_at and "+" in text:
+        for user, domain in CONCAT_REGEX.findall(text):
+            email = f"{user}@{domain}".lower()
+            if EMAIL_REGEX.match(email):
+                found.add(email)
+
+    # 4. HTML entities y escapes JS (solo ventanas alrededor de cada escape)
+    if "&" in text or "\\" in text:
+        for window in _escape_windows(text):
+            unescaped = _unescape_window(window)
+            if "@" in unescaped:
+                found.update(EMAIL_REGEX.findall(unescaped.lower()))
 
     # 5. Base64 en llamadas atob()
-    for token in BASE64_CALL_REGEX.findall(text):
-        _decode_base64_email(token, found)
+    if "atob(" in text:
+        for token in BASE64_CALL_REGEX.findall(text):
+            _decode_base64_email(token, found)
 
     # 6. Base64 suelto (más restrictivo)
-    compact = re.sub(r"\s+", "", text)
+    for i, match in enumerate(BASE64_CANDIDATE_REGEX.finditer(text)):
+        if i >= MAX_BASE64_DECODES:
+            break
 
-    for token in BASE64_TOKEN_REGEX.findall(compact):
-        _decode_base64_email(token, found)
+        # Solo se compacta el candidato, no el documento
+        compact = WHITESPACE_REGEX.sub("", match.group())
+
+        for token in BASE64_TOKEN_REGEX.findall(compact):
+            _decode_base64_email(token, found)
 
     return found
 
+
+def _escape_windows(text: str):
+    """
+    Ventanas de texto alrededor de cada entidad / escape: se extienden
+    hasta el separador más cercano (espacio, comillas, < >) con un
+    máximo de WINDOW caracteres por lado. Las ventanas solapadas se
+    recorren una sola vez.
+    """
+    end = 0
+    windows = 0
+
+    for match in ESCAPE_REGEX.finditer(text):
+        if match.start() < end:
+            continue
+
+        if windows >= MAX_DECODE_WINDOWS:
+            break
+        windows += 1
+
+        lo = max(end, match.start() - WINDOW)
+        left = WINDOW_START.search(text, lo, match.start())
+        start = left.start() + 1 if left else lo
+
+        right = WINDOW_SEPARATOR.search(text, match.end(), match.end() + WINDOW)
+        end = right.start() if right else min(len(text), match.end() + WINDOW)
+
+        yield text[start:end]
+
+
+def _unescape_window(window: str) -> str:
+    if "&" in window:
+        window = html.unescape(window)
+    if "\\" in window:
+        window = JS_ESCAPE_REGEX.sub(_replace_js_escape, window)
+    return window
+
+
+def _replace_js_escape(match) -> str:
+    seq = match.group(1)
+
+    if seq in SIMPLE_ESCAPES:
+        return SIMPLE_ESCAPES[seq]
+
+    code = int(seq[1:], 16) if seq[0] in "xuU" else int(seq, 8)
+
+    if code > 0x10FFFF:
+        return match.group()
+
+    return chr(code)
+
 def normalize_email(email: str) -> str | None:
     if not email:
         return None
@@ -82,9 +188,13 @@ def normalize_email(email: str) -> str | None:
     return email
 
 def _decode_base64_email(token: str, found: set):
+    # Sin relleno y con longitud no múltiplo de 4, b64decode siempre falla
+    if len(token) % 4 and "=" not in token:
+        return
+
     try:
         decoded = base64.b64decode(token).decode("utf-8", errors="ignore")
-        for e in re.findall(EMAIL_REGEX, decoded.lower()):
-            found.add(e)
+        if "@" in decoded:
+            found.update(EMAIL_REGEX.findall(decoded.lower()))
     except Exception:
         pass
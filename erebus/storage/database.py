@@ -1,4 +1,6 @@
+import json
 import sqlite3
+from datetime import datetime, timezone
 from pathlib import Path
 
 class Database:
@@ -9,7 +11,7 @@ class Database:
         db_dir = project_dir / "storage"
         db_dir.mkdir(exist_ok=True)
 
-        self.db_path = db_dir / "erebus.db"
+        self.db_path = db_dir / path
         self.conn = sqlite3.connect(self.db_path)
 
         print(f"[DB] Using database at: {self.db_path}")
@@ -64,6 +66,21 @@ class Database:
         )
         """)
 
+        # ------------------------
+        # Registros DNS (A, AAAA, CNAME, MX, TXT)
+        # ------------------------
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dns_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            execution_id TEXT,
+            domain TEXT,
+            type TEXT,
+            value TEXT,
+            source TEXT,
+            UNIQUE (execution_id, domain, type, value)
+        )
+        """)
+
         # ------------------------
         # WHOIS
         # ------------------------
@@ -109,10 +126,26 @@ class Database:
             url TEXT,
             emails TEXT,
             links TEXT,
-            scripts TEXT
+            scripts TEXT,
+            UNIQUE (execution_id, url)
         )
         """)
 
+        # Bases creadas sin UNIQUE: una página recrawleada al reanudar se
+        # guardaba dos veces. Se conserva la primera fila
+        unique = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = 'crawler_results'"
+        ).fetchone()
+        if not unique:
+            cursor.execute("""
+            DELETE FROM crawler_results WHERE id NOT IN (
+                SELECT MIN(id) FROM crawler_results GROUP BY execution_id, url
+            )
+            """)
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_crawler_results_url ON crawler_results (execution_id, url)"
+            )
+
         # ------------------------
         # Resultados JS (debug / trazabilidad)
         # ------------------------
@@ -138,10 +171,16 @@ class Database:
             technique TEXT,
             source TEXT,
             context TEXT,
+            confidence REAL,
             UNIQUE (execution_id, type, value)
         )
         """)
 
+        # Bases creadas antes de la columna confidence
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(credential_results)")}
+        if "confidence" not in columns:
+            cursor.execute("ALTER TABLE credential_results ADD COLUMN confidence REAL")
+
         # ------------------------
         # Métricas resumen
         # ------------------------
@@ -149,9 +188,50 @@ class Database:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             execution_id TEXT,
             metric TEXT,       
-            value REAL
+            value REAL,
+            UNIQUE (execution_id, metric)
         )""")
 
+        # Bases creadas sin UNIQUE: una ejecución reanudada repetía las
+        # métricas de las etapas ya hechas. Se conserva la última fila
+        unique = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = 'execution_metrics'"
+        ).fetchone()
+        if not unique:
+            cursor.execute("""
+            DELETE FROM execution_metrics WHERE id NOT IN (
+                SELECT MAX(id) FROM execution_metrics GROUP BY execution_id, metric
+            )
+            """)
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_execution_metrics ON execution_metrics (execution_id, metric)"
+            )
+
+        # ------------------------
+        # Checkpoints del crawler (reanudación)
+        # ------------------------
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            execution_id TEXT,
+            crawl TEXT,
+            frontier TEXT,
+            visited TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (execution_id, crawl)
+        )
+        """)
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_page_outcomes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            execution_id TEXT,
+            crawl TEXT,
+            url TEXT,
+            outcome TEXT,
+            UNIQUE (execution_id, crawl, url)
+        )
+        """)
+
         self.conn.commit()
 
     # -------------------------------------------------
@@ -163,12 +243,15 @@ class Database:
         cursor.execute("DELETE FROM executions")
         cursor.execute("DELETE FROM domain_results")
         cursor.execute("DELETE FROM resolved_domain_results")
+        cursor.execute("DELETE FROM dns_records")
         cursor.execute("DELETE FROM whois_results")
         cursor.execute("DELETE FROM email_results")
         cursor.execute("DELETE FROM crawler_results")
         cursor.execute("DELETE FROM js_results")
         cursor.execute("DELETE FROM credential_results")
         cursor.execute("DELETE FROM execution_metrics")
+        cursor.execute("DELETE FROM crawl_checkpoints")
+        cursor.execute("DELETE FROM crawl_page_outcomes")
         self.conn.commit()
 
     # -------------------------------------------------
@@ -201,6 +284,26 @@ class Database:
         ))
         self.conn.commit()
 
+    def get_execution(self, execution_id):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT id, target, start_time, end_time, status
+        FROM executions
+        WHERE id = ?
+        """, (execution_id,))
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "id": row[0],
+            "target": row[1],
+            "start_time": row[2],
+            "end_time": row[3],
+            "status": row[4]
+        }
+
     # -------------------------------------------------
     # Dominios
     # -------------------------------------------------
@@ -221,19 +324,46 @@ class Database:
             WHERE execution_id = ? AND domain = ?
         """, (status, execution_id, domain))
         self.conn.commit()
+
+    def get_domains(self, execution_id):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT domain FROM domain_results WHERE execution_id = ?
+        """, (execution_id,))
+        return [row[0] for row in cursor.fetchall()]
+
     def insert_resolved_domain(self, execution_id, domain, ip, source):
         cursor = self.conn.cursor()
         cursor.execute("""
-        INSERT INTO resolved_domain_results
+        INSERT OR IGNORE INTO resolved_domain_results
         (execution_id, domain, ip, source)
         VALUES (?, ?, ?, ?)
         """, (execution_id, domain, ip, source))
         self.conn.commit()
 
+    def insert_dns_records(self, execution_id, records, source):
+        """
+        records: filas (dominio, tipo, valor). Un único commit por lote.
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+        INSERT OR IGNORE INTO dns_records
+        (execution_id, domain, type, value, source)
+        VALUES (?, ?, ?, ?, ?)
+        """, [(execution_id, domain, rtype, value, source) for domain, rtype, value in records])
+        self.conn.commit()
+
     # -------------------------------------------------
     # WHOIS
     # -------------------------------------------------
 
+    def has_whois_result(self, execution_id, domain):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM whois_results WHERE execution_id = ? AND domain = ? LIMIT 1
+        """, (execution_id, domain))
+        return cursor.fetchone() is not None
+
     def insert_whois_result(self, execution_id, domain, data):
         cursor = self.conn.cursor()
         cursor.execute("""
@@ -277,6 +407,13 @@ class Database:
         """, (execution_id, email, domain, technique, source, context))
         self.conn.commit()
 
+    def get_emails(self, execution_id):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT email, technique, context FROM email_results WHERE execution_id = ?
+        """, (execution_id,))
+        return cursor.fetchall()
+
     # -------------------------------------------------
     # Crawler / JS (debug)
     # -------------------------------------------------
@@ -284,7 +421,7 @@ class Database:
     def insert_crawler_result(self, execution_id, url, emails, links, scripts):
         cursor = self.conn.cursor()
         cursor.execute("""
-        INSERT INTO crawler_results
+        INSERT OR IGNORE INTO crawler_results
         (execution_id, url, emails, links, scripts)
         VALUES (?, ?, ?, ?, ?)
         """, (
@@ -313,27 +450,101 @@ class Database:
     # Credenciales
     # -------------------------------------------------
 
-    def insert_credential(self, execution_id, ctype, value, technique, source, context):
+    def insert_credential(self, execution_id, ctype, value, technique, source, context, confidence=None):
         cursor = self.conn.cursor()
         cursor.execute("""
         INSERT INTO credential_results
-        (execution_id, type, value, technique, source, context)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, (execution_id, ctype, value, technique, source, context))
+        (execution_id, type, value, technique, source, context, confidence)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (execution_id, ctype, value, technique, source, context, confidence))
         self.conn.commit()
 
+    def get_credentials(self, execution_id):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT type, value, technique FROM credential_results WHERE execution_id = ?
+        """, (execution_id,))
+        return cursor.fetchall()
+
     # -------------------------------------------------
     # Métricas resumen
     # -------------------------------------------------
 
     def insert_metric(self, execution_id, metric, value):
+        # Una fila por métrica y ejecución: al reanudar, el valor se reemplaza
         cursor = self.conn.cursor()
         cursor.execute("""
-            INSERT INTO execution_metrics (execution_id, metric, value)
+            INSERT OR REPLACE INTO execution_metrics (execution_id, metric, value)
             VALUES (?, ?, ?)
         """, (execution_id, metric, value))
         self.conn.commit()
 
+    def has_metric(self, execution_id, metric):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM execution_metrics WHERE execution_id = ? AND metric = ? LIMIT 1
+        """, (execution_id, metric))
+        return cursor.fetchone() is not None
+
+    # -------------------------------------------------
+    # Checkpoints del crawler
+    # -------------------------------------------------
+
+    def save_crawl_checkpoint(self, execution_id, crawl, frontier, visited, outcomes):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        INSERT OR REPLACE INTO crawl_checkpoints
+        (execution_id, crawl, frontier, visited, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        """, (
+            execution_id,
+            crawl,
+            json.dumps(frontier),
+            json.dumps(list(visited)),
+            datetime.now(timezone.utc).isoformat()
+        ))
+        cursor.executemany("""
+        INSERT OR REPLACE INTO crawl_page_outcomes
+        (execution_id, crawl, url, outcome)
+        VALUES (?, ?, ?, ?)
+        """, [(execution_id, crawl, url, outcome) for url, outcome in outcomes])
+        self.conn.commit()
+
+    def load_crawl_checkpoint(self, execution_id, crawl):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT frontier, visited FROM crawl_checkpoints
+        WHERE execution_id = ? AND crawl = ?
+        """, (execution_id, crawl))
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "frontier": json.loads(row[0]),
+            "visited": json.loads(row[1])
+        }
+
+    def get_crawled_pages(self, execution_id, crawl):
+        """
+        Páginas ya procesadas (url + scripts) de un crawl checkpointeado.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT o.url, COALESCE(MAX(c.scripts), '')
+        FROM crawl_page_outcomes o
+        LEFT JOIN crawler_results c
+            ON c.execution_id = o.execution_id AND c.url = o.url
+        WHERE o.execution_id = ? AND o.crawl = ? AND o.outcome = 'ok'
+        GROUP BY o.url
+        """, (execution_id, crawl))
+
+        return [
+            {"url": url, "scripts": [s for s in scripts.split(",") if s]}
+            for url, scripts in cursor.fetchall()
+        ]
+
     # -------------------------------------------------
     # Helpers
     # -------------------------------------------------
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class DnsCache:
+    """
+    Caché de respuestas DNS según su TTL, compartida entre ejecuciones.
+
+    - Clave: (nombre, tipo de registro).
+    - Valor: estado ("ok", "nxdomain", "noanswer") + lista de respuestas.
+    - Las respuestas negativas también se guardan (TTL del SOA o
+      negative_ttl): un subdominio inexistente no se vuelve a preguntar.
+    - Los errores transitorios (timeouts) no se guardan.
+
+    Nivel en memoria (lo consultado en esta ejecución) + SQLite en disco.
+    Las escrituras se confirman en flush() / close(), no una a una.
+    """
+
+    def __init__(self, path=None, persistent: bool = True, max_ttl: int = 24 * 3600):
+        self.max_ttl = max_ttl
+        self.memory = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.Lock()
+        self.conn = None
+
+        if persistent:
+            if path is None:
+                path = Path(__file__).resolve().parent / "dns_cache.db"
+
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self._create_db()
+
+    def _create_db(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS dns_answers (
+            name TEXT,
+            rdtype TEXT,
+            status TEXT,
+            answers TEXT,
+            expires REAL,
+            PRIMARY KEY (name, rdtype)
+        )
+        """)
+        self.conn.commit()
+
+    # -------------------------------------------------
+    # API pública
+    # -------------------------------------------------
+
+    def get(self, name: str, rdtype: str):
+        """
+        (estado, respuestas) si hay una entrada vigente, si no None.
+        """
+        key = (name.lower(), rdtype)
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+
+            if entry is None and self.conn:
+                row = self.conn.execute(
+                    "SELECT status, answers, expires FROM dns_answers WHERE name = ? AND rdtype = ?",
+                    key
+                ).fetchone()
+
+                if row:
+                    entry = (row[0], json.loads(row[1]), row[2])
+                    self.memory[key] = entry
+
+            if entry is None or entry[2] <= now:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, name: str, rdtype: str, status: str, answers, ttl: int):
+        key = (name.lower(), rdtype)
+        expires = time.time() + min(max(ttl, 0), self.max_ttl)
+        answers = list(answers)
+
+        with self.lock:
+            self.memory[key] = (status, answers, expires)
+
+            if self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dns_answers (name, rdtype, status, answers, expires) VALUES (?, ?, ?, ?, ?)",
+                    (*key, status, json.dumps(answers), expires)
+                )
+
+    def flush(self):
+        with self.lock:
+            if self.conn:
+                self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                # Lo caducado no se volverá a usar
+                self.conn.execute("DELETE FROM dns_answers WHERE expires <= ?", (time.time(),))
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Subir cuando cambie la lógica de extracción: invalida lo ya guardado
+EXTRACTION_VERSION = 2
+
+
+class ExtractionCache:
+    """
+    Caché de resultados de extracción direccionada por contenido.
+
+    - Clave: blake2b(tipo + versión + cuerpo). Un mismo cuerpo (variantes
+      http/https/www, bundles repetidos, copias de Wayback) se analiza una
+      sola vez.
+    - Nivel 1: LRU en memoria acotado a max_entries.
+    - Nivel 2 (opcional): SQLite en disco, compartido entre ejecuciones y
+      acotado a max_rows (expulsión por último acceso).
+    - Los valores se guardan como JSON: listas / dicts / strings.
+    """
+
+    EVICT_EVERY = 500
+
+    def __init__(self, max_entries: int = 4096, path=None, persistent: bool = True, max_rows: int = 200000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.memory = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+
+        self.lock = threading.Lock()
+        self.conn = None
+
+        if persistent:
+            if path is None:
+                path = Path(__file__).resolve().parent / "extraction_cache.db"
+
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self._create_db()
+
+    def _create_db(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS extractions (
+            key TEXT PRIMARY KEY,
+            kind TEXT,
+            value TEXT,
+            last_access REAL
+        )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_access ON extractions (last_access)"
+        )
+        self.conn.commit()
+
+    # -------------------------------------------------
+    # API pública
+    # -------------------------------------------------
+
+    @staticmethod
+    def key(kind: str, text: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{kind}\0{EXTRACTION_VERSION}\0".encode())
+        h.update(text.encode("utf-8", errors="surrogatepass"))
+        return h.hexdigest()
+
+    def get(self, key: str):
+        """
+        Valor guardado o None.
+        """
+        with self.lock:
+            raw = self.memory.get(key)
+
+            if raw is not None:
+                self.memory.move_to_end(key)
+
+            elif self.conn:
+                row = self.conn.execute(
+                    "SELECT value FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row:
+                    raw = row[0]
+                    self.conn.execute(
+                        "UPDATE extractions SET last_access = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+                    self.conn.commit()
+                    self._remember(key, raw)
+
+            if raw is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return json.loads(raw)
+
+    def put(self, key: str, kind: str, value):
+        raw = json.dumps(value)
+
+        with self.lock:
+            self._remember(key, raw)
+
+            if self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, kind, value, last_access) VALUES (?, ?, ?, ?)",
+                    (key, kind, raw, time.time())
+                )
+                self.conn.commit()
+
+                self.puts += 1
+                if self.puts % self.EVICT_EVERY == 0:
+                    self._evict()
+
+    def memoize(self, kind: str, text: str, compute):
+        """
+        compute(text) solo si el resultado de este cuerpo no está en caché.
+        """
+        key = self.key(kind, text)
+        value = self.get(key)
+
+        if value is None:
+            value = compute(text)
+            self.put(key, kind, value)
+
+        return value
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self._evict()
+                self.conn.close()
+                self.conn = None
+
+    # -------------------------------------------------
+    # Internos
+    # -------------------------------------------------
+
+    def _remember(self, key, raw):
+        self.memory[key] = raw
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+        if total <= self.max_rows:
+            return
+
+        self.conn.execute("""
+            DELETE FROM extractions WHERE key IN (
+                SELECT key FROM extractions ORDER BY last_access LIMIT ?
+            )
+        """, (total - self.max_rows,))
+        self.conn.commit()
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class CachedResponse:
+    """
+    Respuesta servida desde la caché.
+    Expone lo que usan los collectors de requests.Response:
+    status_code, headers, content, text y json().
+    """
+
+    def __init__(self, url, status_code, headers, content: bytes, revalidated=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = True
+        self.revalidated = revalidated  # True si ha hecho falta un 304
+
+    @property
+    def encoding(self):
+        return get_encoding_from_headers(self.headers) or "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HttpCache:
+    """
+    Caché HTTP persistente en disco, compartida por todos los collectors.
+
+    - Cuerpos direccionados por contenido (sha256): dos URLs con el mismo
+      cuerpo ocupan un único fichero.
+    - Índice SQLite con validadores (ETag / Last-Modified).
+    - TTL por fuente: dentro del TTL se sirve sin red; pasado el TTL se
+      revalida con un GET condicional (304 -> se reutiliza el cuerpo).
+    - Expulsión LRU cuando el tamaño total supera max_bytes.
+    """
+
+    def __init__(self, path=None, max_bytes: int = 256 * 1024 * 1024, ttls=None, default_ttl: int = 3600):
+        if path is None:
+            path = Path(__file__).resolve().parent / "http_cache"
+
+        self.dir = Path(path)
+        self.bodies_dir = self.dir / "bodies"
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        # El crawler asíncrono llama desde varios hilos
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.dir / "index.db", check_same_thread=False)
+        self._create_db()
+
+    def _create_db(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            source TEXT,
+            status INTEGER,
+            headers TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT,
+            size INTEGER,
+            fetched_at REAL,
+            last_access REAL
+        )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)"
+        )
+        self.conn.commit()
+
+    # -------------------------------------------------
+    # API pública
+    # -------------------------------------------------
+
+    def get(self, url: str, source: str, fetch=requests.get, params=None, headers=None, **kwargs):
+        """
+        Equivalente a fetch(url, ...) pasando por la caché.
+        Solo se almacenan respuestas 200 completas.
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+        entry = self._lookup(key)
+        body = self._read_body(entry["body_hash"]) if entry else None
+
+        if body is None:
+            entry = None
+
+        if entry and time.time() - entry["fetched_at"] < self.ttl(source):
+            self.hits += 1
+            self._touch(key)
+            return self._to_response(key, entry, body)
+
+        request_headers = dict(headers or {})
+
+        if entry:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = fetch(url, params=params, headers=request_headers, **kwargs)
+
+        if entry and response.status_code == 304:
+            self.revalidated += 1
+            self._touch(key, refreshed=True)
+            return self._to_response(key, entry, body, revalidated=True)
+
+        self.misses += 1
+
+        # Cuerpos cortados o descartados por Content-Type no se guardan
+        complete = not getattr(response, "truncated", False) and not getattr(response, "skipped", False)
+
+        if response.status_code == 200 and complete:
+            self._store(key, source, response)
+
+        return response
+
+    def ttl(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # -------------------------------------------------
+    # Índice
+    # -------------------------------------------------
+
+    def _lookup(self, key):
+        with self.lock:
+            row = self.conn.execute("""
+                SELECT status, headers, etag, last_modified, body_hash, fetched_at
+                FROM responses WHERE key = ?
+            """, (key,)).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "status": row[0],
+            "headers": json.loads(row[1]),
+            "etag": row[2],
+            "last_modified": row[3],
+            "body_hash": row[4],
+            "fetched_at": row[5],
+        }
+
+    def _touch(self, key, refreshed=False):
+        now = time.time()
+
+        with self.lock:
+            if refreshed:
+                self.conn.execute(
+                    "UPDATE responses SET last_access = ?, fetched_at = ? WHERE key = ?",
+                    (now, now, key)
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?",
+                    (now, key)
+                )
+            self.conn.commit()
+
+    def _store(self, key, source, response):
+        content = response.content
+        body_hash = hashlib.sha256(content).hexdigest()
+        body_path = self._body_path(body_hash)
+
+        if not body_path.exists():
+            body_path.parent.mkdir(exist_ok=True)
+            tmp = body_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(content)
+            tmp.replace(body_path)
+
+        now = time.time()
+
+        with self.lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO responses
+                (key, source, status, headers, etag, last_modified, body_hash, size, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                key,
+                source,
+                response.status_code,
+                json.dumps(dict(response.headers)),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                body_hash,
+                len(content),
+                now,
+                now
+            ))
+            self.conn.commit()
+            self._evict()
+
+    def _evict(self):
+        """
+        Borra las entradas menos usadas hasta bajar de max_bytes.
+        El tamaño cuenta cada cuerpo una sola vez.
+        """
+        total = self.conn.execute("""
+            SELECT COALESCE(SUM(size), 0) FROM (
+                SELECT MAX(size) AS size FROM responses GROUP BY body_hash
+            )
+        """).fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            "SELECT key, body_hash, size FROM responses ORDER BY last_access"
+        ).fetchall()
+
+        for key, body_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+            still_used = self.conn.execute(
+                "SELECT 1 FROM responses WHERE body_hash = ? LIMIT 1", (body_hash,)
+            ).fetchone()
+
+            if not still_used:
+                self._body_path(body_hash).unlink(missing_ok=True)
+                total -= size
+
+        self.conn.commit()
+
+    # -------------------------------------------------
+    # Cuerpos
+    # -------------------------------------------------
+
+    def _body_path(self, body_hash):
+        return self.bodies_dir / body_hash[:2] / body_hash
+
+    def _read_body(self, body_hash):
+        try:
+            return self._body_path(body_hash).read_bytes()
+        except OSError:
+            return None
+
+    def _to_response(self, key, entry, body, revalidated=False):
+        return CachedResponse(key, entry["status"], entry["headers"], body, revalidated)
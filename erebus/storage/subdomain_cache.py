@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class SubdomainCache:
+    """
+    Resultados de crt.sh acumulados entre ejecuciones.
+
+    - crtsh_certs: ids de certificado ya procesados por dominio. En la
+      siguiente descarga sus name_value no se vuelven a analizar.
+    - crtsh_names: subdominios encontrados (nunca se pierden: si crt.sh
+      falla o corta la respuesta, se devuelven los anteriores).
+    - crtsh_refresh: última descarga completa por dominio.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = Path(__file__).resolve().parent / "subdomain_cache.db"
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_db()
+
+    def _create_db(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS crtsh_certs (
+            domain TEXT,
+            cert_id INTEGER,
+            PRIMARY KEY (domain, cert_id)
+        )
+        """)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS crtsh_names (
+            domain TEXT,
+            name TEXT,
+            first_seen REAL,
+            PRIMARY KEY (domain, name)
+        )
+        """)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS crtsh_refresh (
+            domain TEXT PRIMARY KEY,
+            refreshed REAL
+        )
+        """)
+        self.conn.commit()
+
+    # -------------------------------------------------
+    # API pública
+    # -------------------------------------------------
+
+    def known_certs(self, domain: str) -> set:
+        with self.lock:
+            rows = self.conn.execute("SELECT cert_id FROM crtsh_certs WHERE domain = ?", (domain,))
+            return {row[0] for row in rows}
+
+    def names(self, domain: str) -> set:
+        with self.lock:
+            rows = self.conn.execute("SELECT name FROM crtsh_names WHERE domain = ?", (domain,))
+            return {row[0] for row in rows}
+
+    def age(self, domain: str):
+        """
+        Segundos desde la última descarga completa (None si nunca).
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT refreshed FROM crtsh_refresh WHERE domain = ?", (domain,)
+            ).fetchone()
+
+        return None if row is None else time.time() - row[0]
+
+    def merge(self, domain: str, cert_ids, names, complete: bool):
+        """
+        Añade certificados y nombres nuevos en una sola transacción.
+        complete=False (descarga cortada): no cuenta como refresco.
+        """
+        now = time.time()
+
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO crtsh_certs (domain, cert_id) VALUES (?, ?)",
+                [(domain, cert_id) for cert_id in cert_ids]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO crtsh_names (domain, name, first_seen) VALUES (?, ?, ?)",
+                [(domain, name, now) for name in names]
+            )
+
+            if complete:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO crtsh_refresh (domain, refreshed) VALUES (?, ?)",
+                    (domain, now)
+                )
+
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
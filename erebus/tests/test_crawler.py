@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from collectors.passive.crawler import Crawler, CrawlCheckpoint
+from core.extraction import ExtractionPool
+from storage.database import Database
+
+PAGES = 12
+DELAY = 0.2
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """
+    Web de prueba: /p0 ... /pN enlazadas entre sí, cada una con un email
+    y una credencial.
+    """
+
+    def do_GET(self):
+        time.sleep(DELAY)
+
+        if self.path == "/doc.pdf":
+            body = b"%PDF-1.4"
+            ctype = "application/pdf"
+        else:
+            n = self.path.strip("/").lstrip("p") or "0"
+            links = "".join(f'<a href="/p{i}">p{i}</a>' for i in range(PAGES))
+            body = (
+                f"<html><body><p>contacto{n} [at] erebus [dot] com</p>"
+                f'{links}<a href="/doc.pdf">pdf</a>'
+                f'<script src="/app.js"></script>'
+                f"<script>var password = 'clave{n}-secreta';</script></body></html>"
+            ).encode()
+            ctype = "text/html; charset=utf-8"
+
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def summarize(results):
+    return sorted((p["url"], sorted(p["emails"]), sorted(p["links"])) for p in results)
+
+
+def test_async_matches_sequential():
+    server, base = start_server()
+
+    try:
+        seq = Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1").run()
+
+        start = time.monotonic()
+        conc = asyncio.run(
+            Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1",
+                    concurrency=8, per_host=8).run_async()
+        )
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+
+    assert len(seq) == PAGES
+    assert summarize(seq) == summarize(conc)
+
+    # Con 8 en vuelo no debe acercarse al tiempo secuencial (PAGES * DELAY)
+    assert elapsed < PAGES * DELAY / 2
+
+
+def test_async_respects_max_pages():
+    server, base = start_server()
+
+    try:
+        results = asyncio.run(
+            Crawler(f"{base}/p0", max_pages=5, timeout=5, allowed_domain="127.0.0.1",
+                    concurrency=4, per_host=2).run_async()
+        )
+    finally:
+        server.shutdown()
+
+    assert len(results) == 5
+
+
+def test_iter_pages_streams_same_pages():
+    server, base = start_server()
+
+    try:
+        crawler = Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1",
+                          concurrency=4, per_host=4)
+        pages = crawler.iter_pages_async()
+
+        # La primera página llega antes de terminar el crawl
+        first = next(pages)
+        assert len(crawler.visited) < PAGES
+
+        streamed = [first] + list(pages)
+        seq = list(Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1").iter_pages())
+    finally:
+        server.shutdown()
+
+    assert summarize(streamed) == summarize(seq)
+
+
+class CountingPool(ExtractionPool):
+    def __init__(self, workers):
+        super().__init__(workers=workers)
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        return super().submit(fn, *args)
+
+
+def test_process_pool_extraction_matches_inline():
+    server, base = start_server()
+    pool = CountingPool(workers=2)
+
+    try:
+        seq = Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1").run()
+        pooled = asyncio.run(
+            Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1",
+                    concurrency=4, per_host=4, extraction=pool).run_async()
+        )
+        pooled_seq = Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1",
+                             extraction=pool).run()
+    finally:
+        pool.close()
+        server.shutdown()
+
+    def credentials(results):
+        return {page["url"]: sorted(map(tuple, page["credentials"])) for page in results}
+
+    assert summarize(pooled) == summarize(seq) == summarize(pooled_seq)
+    assert credentials(pooled) == credentials(seq) == credentials(pooled_seq)
+    assert any(credentials(seq).values())
+
+    # Modo asíncrono y secuencial: todas las páginas pasan por el pool
+    assert pool.submitted == 2 * PAGES
+
+
+def test_resume_from_checkpoint(tmp_path):
+    server, base = start_server()
+    db = Database(tmp_path / "erebus.db")
+
+    def new_crawler():
+        return Crawler(f"{base}/p0", max_pages=PAGES, timeout=5, allowed_domain="127.0.0.1",
+                       checkpoint=CrawlCheckpoint(db, "exec-1", "live", every=2))
+
+    try:
+        # Primera ejecución: se "cae" tras procesar 5 páginas
+        first = new_crawler()
+        pages = first.iter_pages()
+        done = []
+        for _ in range(5):
+            page = next(pages)
+            done.append(page["url"])
+            db.insert_crawler_result("exec-1", page["url"], [], page["links"], page["scripts"])
+        del pages
+
+        checkpoint = db.load_crawl_checkpoint("exec-1", "live")
+        assert 0 < len(checkpoint["visited"]) <= 5
+
+        # Reanudación: no repite lo ya checkpointeado y completa el resto
+        second = new_crawler()
+        assert second.resumed
+        rest = []
+        for page in second.iter_pages():
+            rest.append(page["url"])
+            db.insert_crawler_result("exec-1", page["url"], [], page["links"], page["scripts"])
+    finally:
+        server.shutdown()
+
+    assert not set(checkpoint["visited"]) & set(rest)
+    assert len(set(done) | set(rest)) == PAGES
+    assert {p["url"] for p in db.get_crawled_pages("exec-1", "live")} == set(done) | set(rest)
+
+    # Lo procesado tras el último checkpoint se recrawlea, pero no se duplica
+    rows = db.conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM crawler_results").fetchone()
+    assert rows == (PAGES, PAGES)
@@ -9,9 +9,7 @@ parsed = parser.parse(
 
 print(parsed)
 
-from collectors.passive.credential_parser import CredentialParser
-
-cred = CredentialParser()
-creds = cred.parse(parsed["raw"], source="js")
+# JSParser ya devuelve las credenciales (sin el cuerpo del script)
+creds = parsed["credentials"]
 
 print(creds)
@@ -0,0 +1,89 @@
+import json
+
+from collectors.passive.credential_parser import CredentialParser
+
+JS = (
+    "var user-password = 'abc123'; login_name=\"admin\"; "
+    "var apiKey = 'AKIA0000XYZ99'; password='abc123'; USERNAME = \"root\";"
+)
+
+EXPECTED = [
+    ("user", "admin", "js"),
+    ("user", "root", "js"),
+    ("password", "abc123", "js"),
+    ("token", "AKIA0000XYZ99", "js"),
+]
+
+
+def test_single_scan_keeps_order_and_overlaps():
+    # "user-password = ..." es a la vez usuario y contraseña, como con
+    # los tres findall por separado
+    assert CredentialParser().parse(JS, "js") == [("user", "abc123", "js")] + EXPECTED
+
+
+def test_no_assignment_no_scan():
+    assert CredentialParser().parse("user password token secret", "html") == []
+
+
+def test_stream_matches_whole_text():
+    text = ("function f(e){return e}; " * 50 + JS) * 20
+    whole = CredentialParser().parse(text, "js")
+
+    chunks = [text[i:i + 37] for i in range(0, len(text), 37)]
+    assert CredentialParser().parse_stream(chunks, "js", overlap=128) == whole
+
+    # Cuerpos grandes: parse() ya trocea por sí mismo
+    assert CredentialParser(chunk_size=500, overlap=128).parse(text, "js") == whole
+
+
+PAYLOAD = {
+    "data": [
+        {"id": 1, "user": "alice", "meta": {"token": "tok_123456789", "note": "a,b:{c}"}},
+        {"id": 2, "Username": "bób", "password": "s3cr\"et"},
+    ],
+    "api_key": "key_abcdefghij",
+}
+
+
+def test_parse_json_deep_nesting_is_iterative():
+    deep = node = []
+    for _ in range(50000):
+        child = []
+        node.append(child)
+        node = child
+    node.append({"secret": "hidden_value"})
+
+    parser = CredentialParser()
+    assert parser.parse_json(deep, "json") == [("token", "hidden_value", "json")]
+    assert parser.parse_json(deep, "json", max_depth=10) == []
+
+
+def test_parse_json_stream_matches_tree():
+    parser = CredentialParser()
+    body = json.dumps(PAYLOAD, ensure_ascii=False).encode()
+
+    # Bloques pequeños: cortes dentro de strings y de caracteres UTF-8
+    chunks = [body[i:i + 5] for i in range(0, len(body), 5)]
+
+    for depth in (None, 1, 3):
+        assert (
+            parser.parse_json_stream(chunks, "json", max_depth=depth)
+            == parser.parse_json(PAYLOAD, "json", max_depth=depth)
+        )
+
+
+def test_parse_json_stream_long_string_across_many_chunks():
+    parser = CredentialParser()
+
+    # ~1 MB de string con comillas y barras escapadas, en bloques de 8 bytes:
+    # cada bloque solo mira el texto nuevo (antes se recorría el string entero)
+    secret = ('v' * 9 + '"\\') * 80000
+    body = json.dumps({"blob": secret, "token": secret})
+    chunks = [body[i:i + 8] for i in range(0, len(body), 8)]
+
+    assert parser.parse_json_stream(chunks, "json") == [("token", secret, "json")]
+
+
+def test_json_key_set_is_configurable():
+    parser = CredentialParser(json_keys={"token": ["note"]})
+    assert parser.parse_json(PAYLOAD, "json") == [("token", "a,b:{c}", "json")]
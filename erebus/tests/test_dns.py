@@ -0,0 +1,142 @@
+import asyncio
+
+import dns.message
+import dns.name
+import dns.resolver
+import dns.rrset
+
+from collectors.passive.dns import DNSCollector
+import core.constants as C
+from storage.dns_cache import DnsCache
+
+
+class FakeAnswer(list):
+    def __init__(self, values, ttl, rdtype="A"):
+        self.rrset = dns.rrset.from_text("x.", ttl, "IN", rdtype, *values)
+        super().__init__(self.rrset)
+
+
+class FakeResolver:
+    """
+    Responde sin red; cuenta consultas y consultas simultáneas.
+    records: {nombre: (ips A, ttl)} o {nombre: {tipo: (valores, ttl)}}.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+        self.active = 0
+        self.max_active = 0
+
+    async def resolve(self, name, rdtype):
+        self.queries.append(name if rdtype == "A" else (name, rdtype))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.001)
+            if name == "slow.example.com":
+                raise dns.resolver.LifetimeTimeout(timeout=1, errors=[])
+
+            if name not in self.records:
+                qname = dns.name.from_text(name)
+                response = dns.message.make_response(dns.message.make_query(qname, "A"))
+                response.authority.append(dns.rrset.from_text(
+                    "example.com.", 900, "IN", "SOA",
+                    "ns1.example.com. admin.example.com. 1 7200 3600 1209600 60"
+                ))
+                raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+
+            typed = self.records[name]
+            if isinstance(typed, tuple):
+                typed = {"A": typed}
+
+            if rdtype not in typed:
+                qname = dns.name.from_text(name)
+                raise dns.resolver.NoAnswer(response=dns.message.make_response(dns.message.make_query(qname, rdtype)))
+
+            return FakeAnswer(*typed[rdtype], rdtype=rdtype)
+        finally:
+            self.active -= 1
+
+
+def test_collect_many_concurrent_and_ordered():
+    records = {f"h{i}.example.com": ([f"10.0.0.{i}"], 300) for i in range(30)}
+    collector = DNSCollector(concurrency=8)
+    collector.resolver = FakeResolver(records)
+
+    domains = list(records) + ["nope.example.com", "h0.example.com"]
+    results = collector.collect_many(domains)
+
+    assert list(results) == list(dict.fromkeys(domains))
+    assert results["h3.example.com"] == [{"domain": "h3.example.com", "ip": "10.0.0.3", "source": C.TECHNIQUE_DNS}]
+    assert results["nope.example.com"] == []
+    assert 1 < collector.resolver.max_active <= 8
+    assert collector.stats["resolved"] == 30 and collector.stats["nxdomain"] == 1
+
+
+def test_cache_answers_and_nxdomain_by_ttl(tmp_path):
+    path = tmp_path / "dns.db"
+    records = {"www.example.com": (["10.0.0.2", "10.0.0.1"], 300)}
+
+    cache = DnsCache(path=path)
+    collector = DNSCollector(cache=cache)
+    collector.resolver = FakeResolver(records)
+    collector.collect_many(["www.example.com", "nope.example.com", "slow.example.com"])
+    cache.close()
+
+    # NXDOMAIN: mínimo entre el TTL del SOA (900) y su minimum (60)
+    cache = DnsCache(path=path)
+    assert cache.get("www.example.com", "A") == ("ok", ["10.0.0.1", "10.0.0.2"])
+    assert cache.get("nope.example.com", "A") == ("nxdomain", [])
+    assert cache.get("slow.example.com", "A") is None  # los timeouts no se guardan
+
+    # Segunda ejecución: solo se pregunta lo que no estaba en caché
+    collector = DNSCollector(cache=cache)
+    collector.resolver = FakeResolver(records)
+    results = collector.collect_many(["www.example.com", "nope.example.com", "slow.example.com"])
+
+    assert collector.resolver.queries == ["slow.example.com"]
+    assert collector.stats["cached"] == 2
+    assert [r["ip"] for r in results["www.example.com"]] == ["10.0.0.1", "10.0.0.2"]
+
+    # Caducado -> se vuelve a consultar
+    cache.put("www.example.com", "A", "ok", ["10.0.0.1"], ttl=0)
+    assert cache.get("www.example.com", "A") is None
+    cache.close()
+
+
+def test_profile_all_record_types_with_shared_cname_chain():
+    records = {
+        "www.example.com": {"CNAME": (["edge.cdn.net."], 300)},
+        "shop.example.com": {"CNAME": (["edge.cdn.net."], 300)},
+        "edge.cdn.net": {"CNAME": (["lb.cdn.net."], 300)},
+        "lb.cdn.net": {"A": (["192.0.2.7"], 60), "AAAA": (["2001:db8::7"], 60)},
+        "example.com": {
+            "A": (["192.0.2.1"], 300),
+            "MX": (["20 mx2.example.com.", "10 mx1.example.com."], 300),
+            "TXT": (['"v=spf1 " "include:_spf.example.net -all"'], 300),
+        },
+    }
+    # El resolver sigue los CNAME en las consultas A / AAAA
+    for alias in ("www.example.com", "shop.example.com", "edge.cdn.net"):
+        records[alias].update({t: records["lb.cdn.net"][t] for t in ("A", "AAAA")})
+
+    collector = DNSCollector(record_types=("A", "AAAA", "CNAME", "MX", "TXT"))
+    collector.resolver = FakeResolver(records)
+    profiles = collector.resolve_many(["example.com", "www.example.com", "shop.example.com"])
+
+    assert profiles["example.com"]["MX"] == ["10 mx1.example.com", "20 mx2.example.com"]
+    assert profiles["example.com"]["TXT"] == ["v=spf1 include:_spf.example.net -all"]
+    assert profiles["www.example.com"]["CNAME"] == ["edge.cdn.net", "lb.cdn.net"]
+    assert profiles["shop.example.com"]["AAAA"] == ["2001:db8::7"]
+
+    # Cada salto de la cadena compartida se consulta una sola vez
+    queries = collector.resolver.queries
+    assert queries.count(("edge.cdn.net", "CNAME")) == 1
+    assert queries.count(("lb.cdn.net", "CNAME")) == 1
+    assert len(queries) == len(set(queries)) == 3 * 5 + 2
+
+    rows = collector.records("www.example.com", profiles["www.example.com"])
+    assert ("www.example.com", "CNAME", "edge.cdn.net") in rows
+    assert ("edge.cdn.net", "CNAME", "lb.cdn.net") in rows
+    assert ("www.example.com", "A", "192.0.2.7") in rows
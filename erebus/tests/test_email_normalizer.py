@@ -0,0 +1,32 @@
+import pytest
+
+from normalizers.email_normalizer import normalize_obfuscated
+
+CASES = [
+    ("Escríbenos a Info@Example.com", {"info@example.com"}),
+    ("info [at] example [dot] com", {"info@example.com"}),
+    ("soporte(at)empresa(dot)es", {"soporte@empresa.es"}),
+    ("ventas at tienda dot org", {"ventas@tienda.org"}),
+    ("var m = 'info' + '@' + 'example.com';", {"info@example.com"}),
+    ("info&#64;example.com", {"info@example.com"}),
+    ("info\\x40example.com", {"info@example.com"}),
+    ("atob('aW5mb0BleGFtcGxlLmNvbQ==')", {"info@example.com"}),
+    ("Encoded: dmVudGFzQGVtcHJlc2Eub3Jn", {"ventas@empresa.org"}),
+    # Base64 partido en varias líneas
+    ("key:\n  bGFyZ29fbm9tYnJlX2RlX2Nv\n  bnRhY3RvQGVtcHJlc2EuY29t\n",
+     {"largo_nombre_de_contacto@empresa.com"}),
+    # Prefiltros: sin disparadores no hay resultados
+    ("Texto normal sin direcciones, con (paréntesis) y [corchetes].", set()),
+    ("function handler(e){return e.target.value.length>3}", set()),
+    # Escapes: solo se decodifica la ventana de cada uno; un escape
+    # inválido en otra parte del documento no anula el resto
+    ("var re = /\\x/; var c = 'info\\x40example\\u002ecom';", {"info@example.com"}),
+    ("<p>mi&#46;nombre&commat;empresa&#x2E;es</p>", {"mi.nombre@empresa.es"}),
+    # Sin escapes el texto no ASCII ya no se reinterpreta como latin-1
+    ("Kevin@example.com", {"kevin@example.com"}),
+]
+
+
+@pytest.mark.parametrize("text,expected", CASES)
+def test_normalize_obfuscated(text, expected):
+    assert normalize_obfuscated(text) == expected
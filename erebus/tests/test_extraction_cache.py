@@ -0,0 +1,49 @@
+from core.extraction import find_credentials, find_emails
+from storage.extraction_cache import ExtractionCache
+
+BODY = "<p>info [at] example [dot] com</p><script>var password = 'hunter22';</script>"
+
+
+def test_memoize_computes_once_and_persists(tmp_path):
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return sorted(text.split())
+
+    cache = ExtractionCache(path=tmp_path / "extraction.db")
+    assert cache.memoize("words", "b a", compute) == ["a", "b"]
+    assert cache.memoize("words", "b a", compute) == ["a", "b"]
+    cache.close()
+
+    # Otra ejecución: sale del nivel SQLite
+    cache = ExtractionCache(path=tmp_path / "extraction.db")
+    assert cache.memoize("words", "b a", compute) == ["a", "b"]
+    cache.close()
+
+    assert len(calls) == 1
+
+
+def test_kinds_do_not_collide(tmp_path):
+    cache = ExtractionCache(path=tmp_path / "extraction.db")
+
+    emails = find_emails(BODY, cache)
+    creds = find_credentials(BODY, "html", cache)
+
+    assert emails == ["info@example.com"]
+    assert creds == [("password", "hunter22", "html")]
+    assert find_emails(BODY, cache) == emails
+    assert find_credentials(BODY, "js", cache) == [("password", "hunter22", "js")]
+    assert cache.hits == 1
+    cache.close()
+
+
+def test_memory_tier_is_bounded():
+    cache = ExtractionCache(max_entries=2, persistent=False)
+
+    for text in ("a", "b", "c"):
+        cache.memoize("len", text, len)
+
+    assert len(cache.memory) == 2
+    assert cache.get(cache.key("len", "a")) is None
+    assert cache.get(cache.key("len", "c")) == 1
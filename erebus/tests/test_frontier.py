@@ -0,0 +1,60 @@
+import copy
+
+import pytest
+
+from collectors.passive.frontier import Frontier, bfs_priority, keyword_priority
+from core.config import APP_CONFIG
+from core.orchestrator import Orchestrator
+
+
+def drain(frontier):
+    out = []
+    while frontier:
+        out.append(frontier.pop()[0])
+    return out
+
+
+def test_fifo_without_duplicates():
+    f = Frontier()
+
+    assert f.push("https://a.com/1")
+    assert f.push("https://a.com/2")
+    assert not f.push("https://a.com/1")
+
+    assert len(f) == 2
+    assert drain(f) == ["https://a.com/1", "https://a.com/2"]
+
+    # Una URL ya desencolada no vuelve a entrar
+    assert not f.push("https://a.com/1")
+
+
+def test_bfs_priority_orders_by_depth():
+    f = Frontier(bfs_priority)
+    f.push("https://a.com/deep", 3)
+    f.push("https://a.com/x", 1)
+    f.push("https://a.com/y", 1)
+
+    assert drain(f) == ["https://a.com/x", "https://a.com/y", "https://a.com/deep"]
+
+
+def test_keyword_priority_prefers_contact_pages():
+    f = Frontier(keyword_priority)
+    f.push("https://a.com/blog/post-1", 1)
+    f.push("https://a.com/about", 2)
+    f.push("https://a.com/contacto", 2)
+    f.push("https://a.com/news", 1)
+
+    assert drain(f) == [
+        "https://a.com/contacto",
+        "https://a.com/about",
+        "https://a.com/blog/post-1",
+        "https://a.com/news",
+    ]
+
+
+def test_unknown_priority_rejected():
+    cfg = copy.deepcopy(APP_CONFIG)
+    cfg["crawler"]["priority"] = "keyword"
+
+    with pytest.raises(ValueError, match="bfs, keywords"):
+        Orchestrator(None)._validate_cfg(cfg)
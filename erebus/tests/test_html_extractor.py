@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from collectors.passive.html_extractor import extract
+from normalizers.email_normalizer import normalize_obfuscated
+
+INDEX = (Path(__file__).resolve().parent.parent / "Pages" / "index.html").read_text(encoding="utf-8")
+
+SAMPLE = """
+<html><body>
+<p>info [at] <b>ejemplo</b> [dot] com &amp; soporte&#64;ejemplo.com</p>
+<a href="/contacto">c</a><a>sin href</a><a href="">vacío</a>
+<script src="/app.js"></script><script>var oculto = "x@y.com";</script>
+<style>p { color: red }</style><!-- comentario --><pre>  </pre>
+</body></html>
+"""
+
+
+def bs4_reference(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        "links": [a["href"] for a in soup.find_all("a", href=True)],
+        "scripts": [s["src"] for s in soup.find_all("script", src=True)],
+        "text": soup.get_text(),
+    }
+
+
+@pytest.mark.parametrize("html", [INDEX, SAMPLE])
+def test_stdlib_matches_beautifulsoup(html):
+    assert extract(html, "stdlib") == bs4_reference(html)
+
+
+@pytest.mark.parametrize("html", [INDEX, SAMPLE])
+def test_lxml_backend_same_findings(html):
+    pytest.importorskip("lxml")
+
+    ref = bs4_reference(html)
+    got = extract(html, "lxml")
+
+    assert got["links"] == ref["links"]
+    assert got["scripts"] == ref["scripts"]
+    assert normalize_obfuscated(got["text"]) == normalize_obfuscated(ref["text"])
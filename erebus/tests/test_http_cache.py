@@ -0,0 +1,83 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from storage.http_cache import HttpCache
+
+BODY = b"<html><body>info@erebus.com</body></html>"
+ETAG = '"v1"'
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    full = 0
+    not_modified = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            ETagHandler.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        ETagHandler.full += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_ttl_and_conditional_revalidation(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        cache = HttpCache(tmp_path, ttls={"fresh": 3600, "stale": 0})
+
+        # 1ª descarga completa, 2ª dentro del TTL sin red
+        assert cache.get(url, "fresh", timeout=5).text == BODY.decode()
+        r = cache.get(url, "fresh", timeout=5)
+        assert r.from_cache and r.headers["Content-Type"].startswith("text/html")
+        assert ETagHandler.full == 1 and ETagHandler.not_modified == 0
+
+        # TTL vencido: GET condicional -> 304 y cuerpo reutilizado
+        r = cache.get(url, "stale", timeout=5)
+        assert r.status_code == 200 and r.content == BODY
+        assert ETagHandler.full == 1 and ETagHandler.not_modified == 1
+
+        # Persistente: otra instancia sobre el mismo directorio
+        cache.close()
+        assert HttpCache(tmp_path, ttls={"fresh": 3600}).get(url, "fresh", timeout=5).from_cache
+    finally:
+        server.shutdown()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.headers = {"Content-Type": "text/plain"}
+        self.content = content
+
+
+def test_lru_eviction_and_shared_bodies(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=250)
+
+    def fetch(body):
+        return lambda url, **kwargs: FakeResponse(body)
+
+    # Mismo cuerpo en dos URLs: un solo fichero
+    cache.get("http://a/1", "t", fetch=fetch(b"x" * 100))
+    cache.get("http://a/2", "t", fetch=fetch(b"x" * 100))
+    assert len(list(cache.bodies_dir.rglob("*"))) == 2  # subdirectorio + cuerpo
+
+    cache.get("http://a/3", "t", fetch=fetch(b"y" * 100))
+    cache.get("http://a/1", "t", fetch=fetch(b"!"))  # acceso: a/1 pasa a ser reciente
+    cache.get("http://a/4", "t", fetch=fetch(b"z" * 100))
+
+    keys = {row[0] for row in cache.conn.execute("SELECT key FROM responses")}
+    assert "http://a/3" not in keys
+    assert {"http://a/1", "http://a/4"} <= keys
@@ -0,0 +1,103 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from core.http_client import HttpClient
+
+BODY = b"<html>ok</html>"
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ports = set()
+    agents = set()
+
+    def do_GET(self):
+        KeepAliveHandler.ports.add(self.client_address[1])
+        KeepAliveHandler.agents.add(self.headers.get("User-Agent"))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_connections_are_reused_and_counted():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        client = HttpClient(timeouts={"http_crawler_page": 5})
+
+        for i in range(5):
+            client.get(f"{base}/p{i}", "crawler")
+        client.get(f"{base}/app.js", "js")
+    finally:
+        client.close()
+        server.shutdown()
+
+    # Una única conexión TCP para las 6 peticiones
+    assert len(KeepAliveHandler.ports) == 1
+    assert KeepAliveHandler.agents == {"EREBUS/1.0"}
+
+    assert client.stats["crawler"]["requests"] == 5
+    assert client.stats["crawler"]["bytes"] == 5 * len(BODY)
+    assert client.stats["js"]["requests"] == 1
+
+
+def test_timeouts_come_from_config():
+    client = HttpClient(timeouts={"http_subdomains": 25, "js_connect": 3, "js_read": 5})
+
+    assert client.timeout_for("subdomains") == 25
+    assert client.timeout_for("js") == (3, 5)
+    assert client.timeout_for("desconocido") == client.default_timeout
+
+
+class MixedHandler(BaseHTTPRequestHandler):
+    """
+    /big: HTML de 1 MB / /video: binario de 1 MB
+    """
+
+    def do_GET(self):
+        ctype = "video/mp4" if self.path == "/video" else "text/html"
+        body = b"a" * (1024 * 1024)
+
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass  # el cliente ha cortado la descarga
+
+    def log_message(self, *args):
+        pass
+
+
+def test_skip_by_content_type_and_truncate_by_size():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MixedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        client = HttpClient(max_body_bytes={"crawler": 100 * 1024})
+
+        video = client.get(f"{base}/video", "crawler", accept=("text/html",))
+        big = client.get(f"{base}/big", "crawler", accept=("text/html",))
+    finally:
+        client.close()
+        server.shutdown()
+
+    assert video.skipped and video.content == b""
+    assert big.truncated and len(big.content) == 100 * 1024
+    assert big.text == "a" * 100 * 1024
+
+    stats = client.stats["crawler"]
+    assert stats["skipped"] == 1 and stats["truncated"] == 1
+    assert stats["bytes"] == 100 * 1024
@@ -0,0 +1,92 @@
+import json
+import threading
+
+from collectors.passive.js_parser import JSParser
+from collectors.passive.vendor_index import VendorIndex, fingerprint
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeClient:
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, name, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+
+        if url in self.broken:
+            return FakeResponse(404)
+        return FakeResponse(200, f'var contact = "info@example.com"; // {url}')
+
+
+def test_unique_scripts_fetched_once_in_order():
+    client = FakeClient()
+    parser = JSParser(client=client, concurrency=4)
+
+    urls = [f"https://example.com/js/{i}.js" for i in range(6)]
+    results = parser.parse_many(urls + urls[::-1] + ["https://cdn.other.net/lib.js"], "example.com")
+
+    assert [r["script_url"] for r in results] == urls
+    assert sorted(client.calls) == sorted(urls)
+    assert results[0]["emails"] == ["info@example.com"]
+
+
+def test_limit_counts_successful_unique_scripts():
+    urls = [f"https://example.com/{i}.js" for i in range(10)]
+    client = FakeClient(broken=urls[:2])
+    parser = JSParser(client=client, concurrency=3)
+
+    results = parser.parse_many(urls * 3, "example.com", limit=4)
+
+    assert [r["script_url"] for r in results] == urls[2:6]
+    assert sorted(client.calls) == sorted(urls[:6])
+
+
+def test_vendor_scripts_skipped_without_budget(tmp_path):
+    jquery = "/*! jQuery v3.7.1 */ var contact = 'vendor@example.com';"
+    custom = tmp_path / "vendor.json"
+    custom.write_text(json.dumps({
+        "patterns": {"widget": r"/widget\.js$"},
+        "hashes": {fingerprint(jquery): "jquery-3.7.1"},
+    }))
+
+    class VendorClient(FakeClient):
+        def get(self, url, name, timeout=None):
+            if url.endswith("lib.js"):
+                return FakeResponse(200, jquery)
+            return super().get(url, name, timeout)
+
+    client = VendorClient()
+    parser = JSParser(client=client, vendor_index=VendorIndex(path=custom))
+
+    urls = [
+        "https://example.com/js/jquery-3.7.1.min.js",
+        "https://example.com/wp-includes/js/wp-embed.min.js",
+        "https://example.com/js/widget.js",
+        "https://example.com/js/lib.js",
+        "https://example.com/js/app.js",
+        "https://example.com/js/chunk.js",
+    ]
+    results = parser.parse_many(urls, "example.com", limit=2)
+
+    assert [r["script_url"] for r in results] == urls[4:]
+    assert parser.vendor_skips == {"url": 3, "hash": 1}
+    assert "https://example.com/js/jquery-3.7.1.min.js" not in client.calls
+
+
+def test_invalid_user_pattern_skipped(tmp_path):
+    custom = tmp_path / "vendor.json"
+    custom.write_text(json.dumps({"patterns": {"bad": "foo(.js", "widget": r"/widget\.js$"}}))
+
+    index = VendorIndex(path=custom)
+
+    assert "bad" not in index.names
+    assert index.match_url("https://example.com/js/widget.js") == "widget"
+    assert index.match_url("https://example.com/js/jquery.min.js") == "jquery"
@@ -0,0 +1,55 @@
+import random
+import string
+
+from collectors.passive.js_parser import JSParser
+
+
+def bundle(modules=400):
+    rnd = random.Random(1)
+    alphabet = string.ascii_letters + string.digits
+    parts = []
+
+    for i in range(modules):
+        parts.append(f"n[{i}]=function(e,t){{var o=t({i % 97});return o.useState(null)}}")
+
+        if i % 37 == 0:
+            parts.append(f'var contact="sales{i}@example.com",api="https://api.example.com/v{i}/items"')
+        if i % 53 == 0:
+            parts.append(f'var apiKey="AKIA{i:012d}XYZ",password="p{i}!x"')
+        if i % 61 == 0:
+            parts.append(f'var s="{"".join(rnd.choices(alphabet, k=32))}"')
+        if i % 71 == 0:
+            parts.append(f'/* soporte{i} [at] example [dot] org */')
+
+    return ";".join(parts)
+
+
+def chunked(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+def normalized(result):
+    return (
+        sorted(result["emails"]),
+        sorted(result["urls"]),
+        result["credentials"],
+        sorted(result["secrets"]),
+    )
+
+
+def test_stream_matches_whole_body():
+    text = bundle()
+    parser = JSParser(client=object(), entropy=True, stream_window=4096, stream_overlap=512)
+
+    whole = parser._analyze("https://example.com/app.js", text)
+    streamed = parser.scan_stream("https://example.com/app.js", chunked(text, 1000))
+
+    assert whole["emails"] and whole["urls"] and whole["credentials"] and whole["secrets"]
+    assert normalized(streamed) == normalized(whole)
+
+
+def test_stream_result_has_no_raw_body():
+    parser = JSParser(client=object(), stream_window=4096, stream_overlap=512)
+    result = parser.scan_stream("https://example.com/app.js", chunked(bundle(50), 700))
+
+    assert "raw" not in result
@@ -0,0 +1,122 @@
+import copy
+import sqlite3
+from collections import Counter
+
+import core.constants as C
+import core.orchestrator as orchestrator
+from collectors.passive.credential_parser import ENTROPY_TYPE
+from core.config import APP_CONFIG
+from core.exec import Execution
+from core.orchestrator import Orchestrator
+from storage.database import Database
+
+
+class StoredDB:
+    """Base de datos con hallazgos de una ejecución anterior (caída)."""
+
+    EMAILS = [
+        ("a@example.com", C.TECHNIQUE_PASSIVE_HTML, "html"),
+        ("b@example.com", C.TECHNIQUE_CRAWLER_HTML, "live"),
+        ("c@example.com", C.TECHNIQUE_CRAWLER_HTML, "wayback"),
+        ("d@example.com", C.TECHNIQUE_JS_STATIC, "live"),
+        ("e@example.com", C.TECHNIQUE_SCRAPING_DOM, "rendered_dom"),
+        ("f@example.com", C.TECHNIQUE_SCRAPING_JSON, "fetch/xhr"),
+    ]
+    CREDENTIALS = [
+        ("password", "hunter2", C.TECHNIQUE_CRAWLER_HTML),
+        ("token", "abc123", C.TECHNIQUE_JS_STATIC),
+        (ENTROPY_TYPE, "Zq8vN2xL0pRt5Yw3Kb7Hs1Jd", C.TECHNIQUE_JS_STATIC),
+        ("user", "admin", C.TECHNIQUE_SCRAPING_JSON),
+    ]
+
+    def __init__(self):
+        self.metrics = {}
+
+    def get_emails(self, execution_id):
+        return self.EMAILS
+
+    def get_credentials(self, execution_id):
+        return self.CREDENTIALS
+
+    def insert_metric(self, execution_id, metric, value):
+        self.metrics[metric] = value
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: [] if name.startswith(("get_", "load_")) else None
+
+
+def test_resumed_run_counts_stored_findings():
+    cfg = copy.deepcopy(APP_CONFIG)
+    cfg["modules"] = {k: False for k in cfg["modules"]}
+    cfg["cache"]["enabled"] = False
+    cfg["extraction"].update(enabled=False, cache=False)
+    cfg["dns"]["cache"] = False
+    cfg["subdomains"]["cache"] = False
+
+    db = StoredDB()
+    Orchestrator(db).run(Execution("example.com"), cfg, resume=True)
+
+    expected = {
+        "emails_passive_html": 1, "emails_crawler_html": 2, "emails_js_static": 1,
+        "emails_scraping_dom": 1, "emails_scraping_json": 1,
+        "emails_from_live": 1, "emails_from_wayback": 1,
+        "creds_html": 1, "creds_js_static": 1, "creds_js_entropy": 1,
+        "creds_scraping_dom": 0, "creds_scraping_json": 1,
+    }
+    assert {k: db.metrics[k] for k in expected} == expected
+
+
+def test_metrics_replaced_on_resume(tmp_path):
+    # Base anterior al UNIQUE con una métrica repetida
+    conn = sqlite3.connect(tmp_path / "erebus.db")
+    conn.execute("CREATE TABLE execution_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "execution_id TEXT, metric TEXT, value REAL)")
+    conn.executemany("INSERT INTO execution_metrics (execution_id, metric, value) VALUES (?, ?, ?)",
+                     [("exec-1", "dns_queries", 10), ("exec-1", "dns_queries", 12)])
+    conn.commit()
+    conn.close()
+
+    db = Database(tmp_path / "erebus.db")
+    db.insert_metric("exec-1", "dns_errors", 1)
+    db.insert_metric("exec-1", "dns_errors", 3)
+
+    rows = db.conn.execute("SELECT metric, value FROM execution_metrics ORDER BY metric").fetchall()
+    assert rows == [("dns_errors", 3), ("dns_queries", 12)]
+
+
+class RepeatedCrtsh:
+    """crt.sh con los mismos 3 certificados: la segunda vez ya son conocidos."""
+
+    calls = 0
+
+    def __init__(self, **kwargs):
+        self.stats = Counter()
+
+    def collect(self, target):
+        first = RepeatedCrtsh.calls == 0
+        RepeatedCrtsh.calls += 1
+
+        self.stats.update(certs=3, new_names=2 if first else 0, known_certs=0 if first else 3)
+        return [{"value": "www.example.com"}, {"value": "api.example.com"}]
+
+
+def test_resume_keeps_first_subdomain_metrics(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "SubdomainCollector", RepeatedCrtsh)
+    monkeypatch.setattr(RepeatedCrtsh, "calls", 0)
+
+    cfg = copy.deepcopy(APP_CONFIG)
+    cfg["modules"] = {k: k == "subdomains" for k in cfg["modules"]}
+    cfg["cache"]["enabled"] = False
+    cfg["extraction"].update(enabled=False, cache=False)
+    cfg["dns"]["cache"] = False
+    cfg["subdomains"]["cache"] = False
+
+    db = Database(tmp_path / "erebus.db")
+    execution = Execution("example.com")
+    Orchestrator(db).run(execution, cfg)
+    Orchestrator(db).run(execution, copy.deepcopy(cfg), resume=True)
+
+    rows = dict(db.conn.execute(
+        "SELECT metric, value FROM execution_metrics WHERE metric LIKE 'subdomains_%'"
+    ).fetchall())
+    assert rows == {"subdomains_certs": 3, "subdomains_known_certs": 0, "subdomains_new_names": 2}
@@ -0,0 +1,238 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager, contextmanager
+
+from collectors.active.browser_pool import BrowserPool
+from collectors.active.render_profile import RenderProfile
+from collectors.active.scraper import Scraper
+
+
+class FakeResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.headers = {"content-type": "application/json"}
+        self.body = body
+
+    async def text(self):
+        await asyncio.sleep(0)
+        return self.body
+
+
+class FakeRequest:
+    method = "GET"
+
+    async def all_headers(self):
+        return {":authority": "example.com", "cookie": "session=1", "accept-encoding": "br"}
+
+
+class LargeResponse(FakeResponse):
+    """Respuesta JSON por encima del umbral: no debe leerse entera."""
+
+    def __init__(self, url, size):
+        super().__init__(url, None)
+        self.headers["content-length"] = str(size)
+        self.request = FakeRequest()
+
+    async def text(self):
+        raise AssertionError("cuerpo leído entero desde el navegador")
+
+
+class FakeStream:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def iter_chunks(self):
+        for i in range(0, len(self.body), 16):
+            yield self.body[i:i + 16]
+
+
+class FakeClient:
+    def __init__(self, body):
+        self.body = body
+        self.calls = []
+
+    @contextmanager
+    def stream(self, url, collector, timeout=None, **kwargs):
+        self.calls.append((url, timeout, kwargs.get("headers")))
+        yield FakeStream(self.body)
+
+
+class FakePage:
+    def __init__(self, pool):
+        self.pool = pool
+        self.handlers = []
+        self.url = None
+
+    def on(self, event, handler):
+        if event == "response":
+            self.handlers.append(handler)
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        self.url = url
+        api = url + "api/me.json"
+        for handler in self.handlers:
+            handler(FakeResponse(api, '{"user": {"login": "admin", "token": "t0k3n-abcdef"}}'))
+
+        # Las páginas tardan distinto: el orden de llegada no es el de entrada
+        await asyncio.sleep(0.001 * (sum(map(ord, url)) % 5))
+
+    async def evaluate(self, script, args):
+        await asyncio.sleep(args[0] / 1000)
+
+    async def content(self):
+        name = self.url.rstrip("/").rsplit("/", 1)[-1]
+        return f"<html><body><p>{name} [at] example [dot] com</p></body></html>"
+
+
+class FakePool(BrowserPool):
+    """BrowserPool sin navegador: cuenta páginas simultáneas."""
+
+    page_class = FakePage
+
+    def __init__(self, concurrency):
+        super().__init__(concurrency=concurrency)
+        self.active = 0
+        self.max_active = 0
+
+    @asynccontextmanager
+    async def page(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self.launches += 1
+
+        async with self._semaphore:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.pages += 1
+            try:
+                yield self.page_class(self)
+            finally:
+                self.active -= 1
+
+    async def aclose(self):
+        pass
+
+
+def test_scrape_many_concurrent_and_ordered():
+    pool = FakePool(concurrency=3)
+    scraper = Scraper(pool=pool)
+
+    urls = [f"https://example.com/user{i}" for i in range(12)]
+    results = list(scraper.scrape_many(urls))
+    pool.close()
+
+    assert [r["url"] for r in results] == [u + "/" for u in urls]
+    assert results[4]["emails_dom"] == {"user4@example.com"}
+    assert ("token", "t0k3n-abcdef", "scraping_json") in results[0]["credentials_json"]
+
+    assert pool.launches == 1
+    assert pool.pages == 12
+    assert 1 < pool.max_active <= 3
+
+
+def test_render_profile_blocks_heavy_and_third_party():
+    profile = RenderProfile()
+
+    assert profile.blocks("image", "https://www.example.com/logo.png", "example.com")
+    assert profile.blocks("script", "https://www.googletagmanager.com/gtm.js", "example.com")
+    assert profile.blocks("websocket", "wss://chat.vendor.io/ws", "example.com")
+
+    assert not profile.blocks("xhr", "https://api.example.com/v1/me", "example.com")
+    assert not profile.blocks("script", "https://cdn.vendor.io/app.js", "example.com")
+    assert not RenderProfile.full().blocks("image", "https://cdn.vendor.io/a.png", "example.com")
+
+
+def test_dom_quiet_profile_reports_render_stats():
+    pool = FakePool(concurrency=2)
+    scraper = Scraper(pool=pool, render_profile=RenderProfile(quiet_ms=5))
+
+    results = list(scraper.scrape_many(["https://example.com/a", "https://example.com/b"]))
+    pool.close()
+
+    for result in results:
+        assert set(result["render"]) == {"blocked", "requests", "bytes", "render_ms"}
+        assert result["render"]["render_ms"] >= 5
+
+
+
+class LargeJSONPage(FakePage):
+    async def goto(self, url, timeout=None, wait_until=None):
+        self.url = url
+        for handler in self.handlers:
+            handler(LargeResponse(url + "api/big.json", 4096))
+
+
+def test_large_json_response_streamed_through_client():
+    body = json.dumps({"items": [{"n": i} for i in range(50)],
+                       "owner": {"email": "ops@example.com", "api_key": "k3y-0123456789"}})
+    client = FakeClient(body)
+    pool = FakePool(concurrency=1)
+    pool.page_class = LargeJSONPage
+
+    scraper = Scraper(timeout=12000, pool=pool, client=client, json_stream_bytes=1024)
+    result = scraper.scrape("https://example.com/app")
+    pool.close()
+
+    assert client.calls == [("https://example.com/app/api/big.json", 12, {"cookie": "session=1"})]
+    assert "ops@example.com" in result["emails_json"]
+    assert ("token", "k3y-0123456789", "scraping_json") in result["credentials_json"]
+
+
+class StorageFrame:
+    def __init__(self, storage):
+        self.storage = storage
+
+    async def evaluate(self, script):
+        self.storage.clear()
+
+
+class StoragePage:
+    def __init__(self, context):
+        self.frames = [StorageFrame(context.storage)]
+
+    async def close(self):
+        pass
+
+
+class StorageContext:
+    def __init__(self):
+        self.storage = {}
+        self.cookies = {}
+
+    async def new_page(self):
+        return StoragePage(self)
+
+    async def clear_cookies(self):
+        self.cookies.clear()
+
+    async def close(self):
+        pass
+
+
+class StorageBrowser:
+    async def new_context(self, user_agent=None):
+        return StorageContext()
+
+
+def test_reused_context_starts_without_previous_storage():
+    pool = BrowserPool(concurrency=1, context_reuse=5)
+    pool._browser = StorageBrowser()
+    pool._semaphore = asyncio.Semaphore(1)
+
+    async def visit():
+        async with pool.page() as page:
+            seen = dict(page.frames[0].storage)
+            page.frames[0].storage["session"] = "abc"
+        return seen
+
+    first = pool.run(visit())
+    second = pool.run(visit())
+    pool.loop.close()
+
+    assert first == {} and second == {}
+    assert pool.contexts_created == 1 and pool.pages == 2
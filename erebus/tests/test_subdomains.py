@@ -0,0 +1,128 @@
+import json
+from contextlib import contextmanager
+
+import pytest
+import requests
+
+from collectors.passive import subdomains
+from collectors.passive.subdomains import SubdomainCollector, iter_certificates
+from storage.subdomain_cache import SubdomainCache
+
+
+def crtsh(entries):
+    return json.dumps([
+        {"issuer_ca_id": 1, "common_name": names.split("\n")[0], "name_value": names, "id": cert_id}
+        for cert_id, names in entries
+    ])
+
+
+class FakeResponse:
+    def __init__(self, body, fail_at=None):
+        self.status_code = 200
+        self.truncated = False
+        self.body = body
+        self.fail_at = fail_at
+
+        self.read = 0
+
+    def iter_chunks(self):
+        for i in range(0, len(self.body), 7):
+            if self.fail_at is not None and i >= self.fail_at:
+                raise requests.ConnectionError("Read timed out")
+            self.read += 7
+            yield self.body[i:i + 7]
+
+
+class FakeClient:
+    def __init__(self, body, fail_at=None):
+        self.body = body
+        self.fail_at = fail_at
+        self.requests = 0
+
+    @contextmanager
+    def stream(self, url, collector, timeout=None):
+        self.requests += 1
+        self.response = FakeResponse(self.body, self.fail_at)
+        yield self.response
+
+
+def values(results):
+    return [r["value"] for r in results]
+
+
+def test_iter_certificates_streams_entries():
+    body = crtsh([(10, "a.example.com\nb.example.com"), (11, "*.example.com")])
+    assert list(iter_certificates([body[:13], body[13:]])) == [
+        (10, "a.example.com\nb.example.com"),
+        (11, "*.example.com"),
+    ]
+
+
+def test_incremental_merge_and_partial_download(tmp_path):
+    cache = SubdomainCache(path=tmp_path / "crtsh.db")
+    first = crtsh([(1, "www.example.com"), (2, "api.example.com\nwww.example.com"), (3, "*.example.com")])
+
+    collector = SubdomainCollector(client=FakeClient(first), cache=cache)
+    assert values(collector.collect("example.com")) == ["api.example.com", "www.example.com"]
+
+    # Segunda ejecución: solo el certificado 4 es nuevo
+    second = crtsh([(4, "vpn.example.com\nevil.com"), (1, "www.example.com"), (2, "api.example.com\nwww.example.com")])
+    collector = SubdomainCollector(client=FakeClient(second), cache=cache)
+
+    assert values(collector.collect("example.com")) == ["api.example.com", "vpn.example.com", "www.example.com"]
+    assert collector.stats["known_certs"] == 2 and collector.stats["new_names"] == 1
+    assert cache.known_certs("example.com") == {1, 2, 3, 4}
+
+    # Corte a mitad (timeout): se conservan los anteriores y lo ya leído
+    third = crtsh([(5, "mail.example.com"), (6, "dev.example.com")])
+    collector = SubdomainCollector(client=FakeClient(third, fail_at=len(third) // 2), cache=cache)
+    found = values(collector.collect("example.com"))
+
+    assert "mail.example.com" in found and "dev.example.com" not in found
+    assert "vpn.example.com" in found
+    assert 5 in cache.known_certs("example.com")
+
+
+def test_recent_refresh_skips_download(tmp_path):
+    cache = SubdomainCache(path=tmp_path / "crtsh.db")
+    body = crtsh([(1, "www.example.com")])
+
+    SubdomainCollector(client=FakeClient(body), cache=cache).collect("example.com")
+
+    client = FakeClient(body)
+    collector = SubdomainCollector(client=client, cache=cache, refresh_after=3600)
+
+    assert values(collector.collect("example.com")) == ["www.example.com"]
+    assert client.requests == 0
+
+
+def test_malformed_body_is_not_a_complete_refresh(tmp_path):
+    cache = SubdomainCache(path=tmp_path / "crtsh.db")
+    cache.merge("example.com", [1], ["www.example.com"], complete=False)
+
+    # Página de error con estado 200: se deja de leer al primer carácter
+    html = "<html><body>" + "crt.sh is overloaded " * 5000 + "</body></html>"
+    client = FakeClient(html)
+    collector = SubdomainCollector(client=client, cache=cache, refresh_after=3600)
+
+    assert values(collector.collect("example.com")) == ["www.example.com"]
+    assert client.response.read == 7
+    assert cache.age("example.com") is None
+
+    # Array cortado a mitad de una entrada (sin corte de conexión)
+    body = crtsh([(2, "api.example.com"), (3, "dev.example.com")])
+    collector = SubdomainCollector(client=FakeClient(body[:-20]), cache=cache, refresh_after=3600)
+
+    assert values(collector.collect("example.com")) == ["api.example.com", "www.example.com"]
+    assert cache.age("example.com") is None
+
+
+def test_iter_certificates_stops_buffering_garbage(monkeypatch):
+    monkeypatch.setattr(subdomains, "MAX_ENTRY_CHARS", 64)
+    chunks = iter(['[{"id": 1, "name_value": "a.example.com"}, {"id": 2, "name_value": "'] + ["x" * 16] * 1000)
+
+    with pytest.raises(ValueError):
+        for _ in iter_certificates(chunks):
+            pass
+
+    assert len(list(chunks)) > 990
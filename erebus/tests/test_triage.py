@@ -0,0 +1,49 @@
+from collectors.active.triage import render_score, select_pages
+from collectors.passive.html_extractor import extract
+from core.extraction import extract_page_cached
+from storage.extraction_cache import ExtractionCache
+
+SPA = """<!doctype html><html><head>
+<script src="/static/js/main.js"></script>
+<script>window.__CONFIG__ = {api: "/api/v1"}; fetch("/api/v1/contacts").then(r => r.json())</script>
+</head><body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div></body></html>"""
+
+STATIC = "<html><body><h1>Contacto</h1>" + "<p>Escríbenos a info@example.com para cualquier consulta sobre el servicio.</p>" * 10 + "</body></html>"
+
+
+def score(html):
+    extracted = extract(html)
+    return render_score(html, extracted["text"], extracted["scripts"])
+
+
+def test_spa_shell_scores_high_and_static_page_low():
+    spa = score(SPA)
+    static = score(STATIC)
+
+    assert spa["score"] == 1.0
+    assert {"empty_root", "little_text", "fetch_hints", "noscript"} <= set(spa["signals"])
+    assert static == {"score": 0.0, "signals": []}
+
+
+def test_select_pages_budget_and_audit():
+    pages = [{"url": f"/p{i}", "render_score": s} for i, s in enumerate([0.1, 0.9, 0.5, 0.0, 0.6, 0.2])]
+    pages.append({"url": "/resumed"})  # sin puntuación: se renderiza
+
+    render, audit, skipped = select_pages(pages, threshold=0.4, budget=3, audit_sample=2, seed="exec")
+
+    assert [p["url"] for p in render] == ["/resumed", "/p1", "/p4"]
+    assert len(audit) == 2 and all(p["render_score"] < 0.4 for p in audit)
+    assert len(render) + len(audit) + len(skipped) == len(pages)
+    assert {"/p2"} <= {p["url"] for p in skipped}
+
+    # Misma ejecución -> misma muestra
+    assert select_pages(pages, 0.4, 3, 2, seed="exec")[1] == audit
+
+
+def test_render_score_only_computed_for_triage(tmp_path):
+    cache = ExtractionCache(path=tmp_path / "extraction.db")
+
+    assert "render_score" not in extract_page_cached(SPA, cache=cache)
+    assert extract_page_cached(SPA, cache=cache, triage=True)["render_score"] == 1.0
+    assert cache.hits == 0
+    cache.close()
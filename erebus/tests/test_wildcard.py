@@ -0,0 +1,136 @@
+import copy
+from collections import Counter
+
+import core.orchestrator as orchestrator
+from collectors.passive.dns import DNSCollector
+from collectors.passive.wildcard import WildcardFilter, parent_zone, rank_key
+from core.config import APP_CONFIG
+from core.exec import Execution
+from storage.database import Database
+
+
+class FakeDNS:
+    """collect_many sin red: *.apps.example.com es un comodín."""
+
+    RECORDS = {
+        "example.com": ["192.0.2.1"],
+        "www.example.com": ["192.0.2.1"],
+        "api.example.com": ["192.0.2.2"],
+        "admin.apps.example.com": ["192.0.2.50"],  # host real bajo la zona comodín
+    }
+
+    def __init__(self):
+        self.batches = []
+
+    def collect_many(self, domains):
+        domains = list(domains)
+        self.batches.append(domains)
+
+        results = {}
+        for domain in domains:
+            ips = self.RECORDS.get(domain)
+            if ips is None and domain.endswith(".apps.example.com"):
+                ips = ["203.0.113.9"]
+            results[domain] = [{"domain": domain, "ip": ip, "source": "dns"} for ip in ips or []]
+
+        return results
+
+
+def test_wildcard_names_collapse_and_real_hosts_survive():
+    names = {"example.com", "www.example.com", "api.example.com", "admin.apps.example.com"}
+    names |= {f"tenant{i}.apps.example.com" for i in range(50)}
+
+    dns = FakeDNS()
+    distinct, collapsed, wildcards = WildcardFilter(dns, probes=2, seed=1).prune(names, "example.com")
+
+    assert wildcards == {"apps.example.com": frozenset({"203.0.113.9"})}
+    assert distinct[0] == "example.com"
+    assert set(distinct) == {"example.com", "www.example.com", "api.example.com",
+                             "admin.apps.example.com", "tenant0.apps.example.com"}
+    assert len(collapsed) == 49 and set(collapsed.values()) == {"tenant0.apps.example.com"}
+
+    # Sondas (2 por zona) en un lote; solo se resuelven los nombres bajo el comodín
+    assert len(dns.batches) == 2 and len(dns.batches[0]) == 4
+    assert len(dns.batches[1]) == 51
+
+
+def test_rank_prefers_target_interesting_and_shallow_names():
+    names = ["x.y.example.com", "cdn.example.com", "vpn.example.com", "example.com", "dev-api.eu.example.com"]
+    ranked = sorted(names, key=lambda d: rank_key(d, "example.com"))
+
+    assert ranked == ["example.com", "vpn.example.com", "dev-api.eu.example.com", "cdn.example.com", "x.y.example.com"]
+    assert parent_zone("example.com", "example.com") is None
+    assert parent_zone("a.b.example.com", "example.com") == "b.example.com"
+
+
+class FakeResolver(DNSCollector):
+    """DNSCollector sin red con los registros de FakeDNS."""
+
+    def resolve_many(self, domains, record_types=None):
+        profiles = {}
+        for domain, results in FakeDNS().collect_many(domains).items():
+            self.stats["resolved" if results else "nxdomain"] += 1
+            profiles[domain] = {"A": [r["ip"] for r in results]}
+        return profiles
+
+
+class FakeSubdomains:
+    def __init__(self, **kwargs):
+        self.stats = Counter()
+
+    def collect(self, target):
+        names = ["www.example.com", "api.example.com"] + [f"t{i}.apps.example.com" for i in range(20)]
+        return [{"value": name} for name in names]
+
+
+class MetricsDB:
+    def __init__(self):
+        self.metrics = {}
+
+    def insert_metric(self, execution_id, metric, value):
+        self.metrics[metric] = value
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: [] if name.startswith(("get_", "load_")) else None
+
+
+def dns_config():
+    cfg = copy.deepcopy(APP_CONFIG)
+    cfg["modules"] = {k: k in ("subdomains", "dns") for k in cfg["modules"]}
+    cfg["cache"]["enabled"] = False
+    cfg["extraction"].update(enabled=False, cache=False)
+    cfg["dns"]["cache"] = False
+    cfg["subdomains"]["cache"] = False
+    return cfg
+
+
+def test_dns_metrics_exclude_wildcard_probes(monkeypatch):
+    monkeypatch.setattr(orchestrator, "DNSCollector", FakeResolver)
+    monkeypatch.setattr(orchestrator, "SubdomainCollector", FakeSubdomains)
+
+    cfg = dns_config()
+    db = MetricsDB()
+    orchestrator.Orchestrator(db).run(Execution("example.com"), cfg)
+
+    # 3 hosts distintos + 1 representante de la zona comodín; sin las sondas
+    assert db.metrics["dns_wildcard_collapsed"] == 19
+    assert db.metrics["dns_queries"] == 4
+
+
+def test_resumed_run_does_not_repeat_dns_metrics(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "DNSCollector", FakeResolver)
+    monkeypatch.setattr(orchestrator, "SubdomainCollector", FakeSubdomains)
+
+    db = Database(tmp_path / "erebus.db")
+    execution = Execution("example.com")
+    orchestrator.Orchestrator(db).run(execution, dns_config())
+    orchestrator.Orchestrator(db).run(execution, dns_config(), resume=True)
+
+    rows = db.conn.execute(
+        "SELECT metric, COUNT(*), value FROM execution_metrics "
+        "WHERE execution_id = ? AND metric LIKE 'dns_%' GROUP BY metric", (execution.ID,)
+    ).fetchall()
+
+    assert {metric for metric, _, _ in rows} >= {"dns_queries", "dns_wildcard_zones", "dns_wildcard_collapsed"}
+    assert all(count == 1 for _, count, _ in rows)
+    assert dict((m, v) for m, _, v in rows)["dns_wildcard_collapsed"] == 19